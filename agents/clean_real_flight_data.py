@@ -1,899 +1,6 @@
 """
 Real-time flight data extraction module
-"""
-import os
-import time
-import json
-from datetime import datetime, timedelta
-import re
-import traceback
-from dotenv import load_dotenv
-from playwright.sync_api import sync_playwright
-from agents.travel_agent import TravelAgent
-
-# Load environment variables
-load_dotenv()
-
-def get_real_flight_data(source, destination, start_date, num_days):
-    """Extract flight data for the specified route and dates with improved reliability"""
-    print(f"Getting real flight data: {source} to {destination} on {start_date}")
-    
-    # Get credentials from env
-    emt_username = os.getenv('EASEMYTRIP_USERNAME')
-    emt_password = os.getenv('EASEMYTRIP_PASSWORD')
-    mmt_username = os.getenv('MAKEMYTRIP_USERNAME')
-    mmt_password = os.getenv('MAKEMYTRIP_PASSWORD')
-    
-    # Check if credentials are available and print detailed debug
-    print("\n--- CREDENTIALS CHECK ---")
-    if emt_username and emt_password:
-        print(f"✓ EaseMyTrip credentials found: {emt_username[:3]}***")
-    else:
-        print("✗ No EaseMyTrip credentials found! Add them to your .env file as EASEMYTRIP_USERNAME and EASEMYTRIP_PASSWORD")
-        
-    if mmt_username and mmt_password:
-        print(f"✓ MakeMyTrip credentials found: {mmt_username[:3]}***")
-    else:
-        print("✗ No MakeMyTrip credentials found! Add them to your .env file as MAKEMYTRIP_USERNAME and MAKEMYTRIP_PASSWORD")
-    
-    # Parse start date
-    start_date_obj = datetime.strptime(start_date, "%Y-%m-%d")
-    
-    # Generate fallback flight data in case all web scraping attempts fail
-    fallback_flights = generate_fallback_flights(source, destination, start_date)
-    
-    # Store extracted flight options
-    flight_options = []
-    
-    # Try to get real flight data
-    try:
-        print("\n--- ATTEMPTING TO RETRIEVE REAL-TIME FLIGHT DATA ---")
-        print("Launching Playwright browser...")
-        with sync_playwright() as p:
-            # Check if Playwright was installed correctly
-            print("✓ Playwright loaded successfully")
-            
-            # Launch browser with more robust error handling
-            try:
-                browser = p.chromium.launch(
-                    headless=True,
-                    args=[
-                        '--disable-gpu',
-                        '--no-sandbox',
-                        '--disable-dev-shm-usage',
-                        '--disable-extensions',
-                        '--disable-popup-blocking'
-                    ]
-                )
-                print("✓ Browser launched successfully")
-            except Exception as e:
-                print(f"✗ CRITICAL: Failed to launch browser: {str(e)}")
-                traceback.print_exc()
-                print("Recommendation: Try running 'playwright install' or 'python -m playwright install' to fix browser issues")
-                raise
-            
-            # Create browser context with additional settings
-            try:
-                context = browser.new_context(
-                    viewport={'width': 1366, 'height': 768},
-                    user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-                    ignore_https_errors=True
-                )
-                print("✓ Browser context created successfully")
-            except Exception as e:
-                print(f"✗ CRITICAL: Failed to create browser context: {str(e)}")
-                traceback.print_exc()
-                raise
-            
-            # Try Google Flights instead of EaseMyTrip
-            try:
-                print("\n--- TRYING GOOGLE FLIGHTS ---")
-                page = context.new_page()
-                page.set_default_timeout(40000)  # Increased timeout to 40 seconds
-                
-                # Use city code mappings for Indian cities
-                city_codes = {
-                    "hyderabad": "HYD", "hyd": "HYD", "delhi": "DEL", "mumbai": "BOM",
-                    "bangalore": "BLR", "chennai": "MAA", "kolkata": "CCU", "goa": "GOI",
-                    "ahmedabad": "AMD", "pune": "PNQ"
-                }
-                
-                # Clean the source and destination with debug information
-                clean_source = source.split(',')[0].strip().lower()
-                clean_destination = destination.split(',')[0].strip().lower()
-                print(f"Parsed source: '{clean_source}', destination: '{clean_destination}'")
-                
-                # Get airport codes if available
-                src_code = city_codes.get(clean_source, clean_source.upper())
-                
-                # Special handling for Goa destination
-                if clean_destination.lower() in ["goa", "goi"]:
-                    dst_code = "GOI"  # Always use GOI airport code for Goa
-                    print(f"Using GOI airport code for Goa destination")
-                else:
-                    dst_code = city_codes.get(clean_destination, clean_destination.upper())
-                print(f"Using airport codes - Source: {src_code}, Destination: {dst_code}")
-                
-                # Format date for URL (YYYY-MM-DD)
-                google_date = start_date_obj.strftime("%Y-%m-%d")
-                
-                # Calculate return date (num_days after start date)
-                return_date_obj = start_date_obj + timedelta(days=num_days)
-                return_date = return_date_obj.strftime("%Y-%m-%d")
-                
-                # Try multiple URL formats - sometimes one works better than others
-                
-                # Special handling for Goa destination
-                is_goa = clean_destination in ["goa", "goi"]
-                print(f"DEBUG: clean_destination='{clean_destination}', is_goa={is_goa}")
 
-                if is_goa:
-                    # Always use airport code 'goi' for Goa in the URL (never city name)
-                    # This is the ONLY place the Goa URL is set. Do NOT overwrite google_url after this block.
-                    google_url = f"https://www.google.com/travel/flights?q=Flights%20from%20{clean_source}%20to%20goi%20on%20{google_date}%20return%20on%20{return_date}&curr=INR&hl=en&gl=in"
-                    print(f"*** USING SPECIAL GOA URL: {google_url} ***")
-                else:
-                    # Normal URL construction for other destinations
-                    google_url = f"https://www.google.com/travel/flights?q=Flights%20from%20{clean_source}%20to%20{clean_destination}%20on%20{google_date}%20return%20on%20{return_date}&curr=INR&hl=en&gl=in"
-                    print(f"Using standard URL format: {google_url}")
-                print(f"DEBUG: FINAL google_url={google_url}")
-                print(f"DEBUG: FINAL google_url={google_url}")
-                # NOTE: Do NOT overwrite google_url after this block. All navigation must use the above 'google_url' only.
-                # Format 2: Alternative format with query parameters for round trip
-                alt_google_url = f"https://www.google.com/travel/flights/search?tfs=CBwQAhokagcIARID{src_code}SIKMjAyNC0wNy0xNXIHCAESA{dst_code}BoAIiYqBwgBEgM{dst_code}SIKMjAyNC0wNy0yMHIHCAESA{src_code}&tfu=EgYIARABGAA"
-
-                print(f"Navigating to round-trip flight search: {google_url}")
-                try:
-                    # Navigate to the URL with extended wait time
-                    response = page.goto(google_url, wait_until="networkidle", timeout=40000)
-                    if response:
-                        print(f"✓ Google Flights search loaded with status: {response.status}")
-                    else:
-                        print("✗ No response from Google Flights search - possible network issue")
-                    
-                    # Wait for flight results to load with clear indication of progress
-                    print("Waiting for flight results to load...")
-                    
-                    # First check if there's a loading indicator and wait for it to disappear
-                    try:
-                        loading_selector = 'div[role="progressbar"], div.sSe6Lc'
-                        if page.query_selector(loading_selector):
-                            print("Found loading indicator, waiting for it to disappear...")
-                            page.wait_for_selector(loading_selector, state="hidden", timeout=20000)
-                            print("Loading complete")
-                    except Exception as e:
-                        print(f"Note: No loading indicator found or already finished: {e}")
-                    
-                    # Wait for some generic flight elements to appear
-                    flight_element_selectors = [
-                        'div[role="list"]', 
-                        'div[role="heading"]:has-text("Best departing flights")',
-                        'div.pIjXxc',
-                        'div.yR1fYc',
-                        'div[jscontroller="KAKRMc"]'
-                    ]
-                    
-                    for selector in flight_element_selectors:
-                        try:
-                            print(f"Waiting for flight elements with selector: {selector}")
-                            page.wait_for_selector(selector, timeout=5000)
-                            print(f"✓ Found elements with selector: {selector}")
-                            break
-                        except Exception as e:
-                            print(f"Note: Selector {selector} not found: {e}")
-                    
-                    # Scroll down to ensure all content is loaded
-                    print("Scrolling page to load all content...")
-                    page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-                    page.wait_for_timeout(1000)
-                    page.evaluate("window.scrollTo(0, 0)")
-                    page.wait_for_timeout(1000)
-                    
-                    # Additional wait time to ensure all dynamic content is loaded
-                    page.wait_for_timeout(5000)
-                    
-                    # Take a screenshot for debugging
-                    screenshot_path = "google_flights_debug.png"
-                    page.screenshot(path=screenshot_path)
-                    print(f"Screenshot saved to {screenshot_path} for debugging")
-                    
-                except Exception as e:
-                    print(f"✗ Failed to load Google Flights search: {str(e)}")
-                    traceback.print_exc()
-                    raise
-                
-                # Try direct selector extraction first - this is most reliable when it works
-                print("\n--- ATTEMPTING DIRECT EXTRACTION WITH SELECTORS ---")
-                
-                # More specific selectors for Google Flights
-                flight_card_selectors = [
-                    'div[role="listitem"]',  # Modern Google Flights list items
-                    'div[data-test-id="slice-card"]', # Slice cards
-                    'div[jsname="Mu2Cce"]',   # Flight cards in newer interface
-                    'li.Sryd5', # List items in flight results
-                    'div.gws-flights-results__itinerary-card', # Legacy selector
-                    'div.Rk10dc', # One-way flight results container
-                    'div.pIjXxc', # Specific one-way flight card
-                    'div.ESUph' # One-way flight option
-                ]
-                
-                # Elements that indicate time data - with one-way specific selectors
-                time_selectors = [
-                    'div[jsname="St7GW"]', # Time container 
-                    'div.UAj9Ne',          # Time element
-                    'span.Trln7e',         # Departure time
-                    'span.Sonygc',         # Arrival time
-                    'div.zxVSec',          # One-way time display
-                    'div.VfPpkd-fmcmS-yrriRe',  # Material time component
-                    'span[jsname="K4r5Ff"]', # Newer interface time span
-                    'span.KdUjF'           # General time element
-                ]
-                
-                # Price selectors - with one-way specific selectors
-                price_selectors = [
-                    'div[jsname="GR88H"]',    # Price container
-                    'span.nwZbe',             # Price amount
-                    'div.I45fFd',             # Price in list view
-                    'div.U3gSDe',             # Price panel
-                    'div.YMlIz',              # One-way price container
-                    'span[jsname="p67jDf"]',  # Price span
-                    'div.BbR8Ec',             # Alternative price container
-                    'div.U3gSDe'              # Price with currency
-                ]
-                
-                # Airline/Carrier selectors
-                airline_selectors = [
-                    'div.cS4Huc', 
-                    'div.FLHACf', 
-                    'span[jsname="SwwRAd"]',
-                    'div.c7jV4e',              # Carrier name container
-                    'span.a9ZLXb',             # Airline logo text
-                    'div.sSHqwe',              # Carrier info block
-                    'span[jscontroller="L1X8K"]' # Airline span
-                ]
-                
-                # Duration selectors
-                duration_selectors = [
-                    'div.wDeBkc', 
-                    'div.kPLKYe', 
-                    'div[data-druqb="duration"]',
-                    'div.gvkrdb',              # Duration container
-                    'span.VfPpkd-jY41G-V67aGc' # Duration text
-                ]
-                
-                # Directly extracted flights
-                direct_extracted_flights = []
-                
-                # Try each flight card selector
-                for card_selector in flight_card_selectors:
-                    try:
-                        print(f"Trying to find flight cards with selector: {card_selector}")
-                        cards = page.query_selector_all(card_selector)
-                        
-                        if cards and len(cards) > 0:
-                            print(f"✓ Found {len(cards)} flight cards with selector: {card_selector}")
-                            
-                            # Process up to 3 cards
-                            for i, card in enumerate(cards[:3]):
-                                try:
-                                    card_text = card.inner_text()
-                                    print(f"\nProcessing card {i+1}, text sample: {card_text[:50]}...")
-                                    
-                                    # Flight data dictionary
-                                    flight_data = {}
-                                    
-                                    # 1. Extract airline
-                                    airlines = ["IndiGo", "Air India", "SpiceJet", "Vistara", "GoAir", "AirAsia", "Go First"]
-                                    airline_found = False
-                                    
-                                    for airline in airlines:
-                                        if airline.lower() in card_text.lower():
-                                            flight_data['airline'] = airline
-                                            airline_found = True
-                                            print(f"  ✓ Found airline: {airline}")
-                                            break
-                                    
-                                    if not airline_found:
-                                        # Try to find the airline with more specific CSS selectors
-                                        for selector in airline_selectors:
-                                            try:
-                                                airline_el = card.query_selector(selector)
-                                                if airline_el:
-                                                    airline_text = airline_el.inner_text().strip()
-                                                    # Clean the airline text (sometimes includes flight number)
-                                                    airline_text = re.sub(r'\s*\d+.*$', '', airline_text).strip()
-                                                    if airline_text:
-                                                        flight_data['airline'] = airline_text
-                                                        airline_found = True
-                                                        print(f"  ✓ Found airline with selector: {airline_text}")
-                                                        break
-                                            except Exception as ae:
-                                                print(f"    Error getting airline with selector {selector}: {ae}")
-                                    
-                                    if not airline_found:
-                                        print(f"  ⚠ Could not identify airline in card {i+1}")
-                                        continue  # Skip this card if no airline found
-                                    
-                                    # 2. Extract price - first try with selectors, then with regex
-                                    price_found = False
-                                    for price_selector in price_selectors:
-                                        try:
-                                            price_el = card.query_selector(price_selector)
-                                            if price_el:
-                                                price_text = price_el.inner_text().strip()
-                                                price_match = re.search(r'₹\s?([0-9,]+)', price_text)
-                                                if price_match:
-                                                    flight_data['price'] = f"₹ {price_match.group(1)}"
-                                                    price_found = True
-                                                    print(f"  ✓ Found price with selector: {flight_data['price']}")
-                                                    break
-                                        except Exception as pe:
-                                            print(f"    Error getting price with selector {price_selector}: {pe}")
-                                    
-                                    # Fallback to regex in card text if selector didn't work
-                                    if not price_found:
-                                        price_match = re.search(r'₹\s?([0-9,]+)', card_text)
-                                        if price_match:
-                                            flight_data['price'] = f"₹ {price_match.group(1)}"
-                                            price_found = True
-                                            print(f"  ✓ Found price with regex: {flight_data['price']}")
-                                    
-                                    if not price_found:
-                                        print(f"  ⚠ Could not find price in card {i+1}")
-                                        continue  # Skip this card if no price found
-                                    
-                                    # 3. Extract times - first with selectors, then with regex
-                                    times_found = False
-                                    
-                                    # Try extracting departure and arrival times with selectors
-                                    for time_selector in time_selectors:
-                                        try:
-                                            time_elements = card.query_selector_all(time_selector)
-                                            if time_elements and len(time_elements) >= 2:
-                                                # Assume first element is departure, second is arrival
-                                                departure_time = time_elements[0].inner_text().strip()
-                                                arrival_time = time_elements[1].inner_text().strip()
-                                                
-                                                # Clean and validate the times
-                                                if re.match(r'\d{1,2}:\d{2}(?:\s*[AP]M)?', departure_time) and \
-                                                   re.match(r'\d{1,2}:\d{2}(?:\s*[AP]M)?', arrival_time):
-                                                    flight_data['departure'] = departure_time
-                                                    flight_data['arrival'] = arrival_time
-                                                    times_found = True
-                                                    print(f"  ✓ Found times with selector: {departure_time} - {arrival_time}")
-                                                    break
-                                            elif time_elements and len(time_elements) == 1:
-                                                # Maybe it's a combined time format like "9:30 AM – 12:30 PM"
-                                                time_text = time_elements[0].inner_text().strip()
-                                                time_match = re.search(r'(\d{1,2}:\d{2}\s*(?:AM|PM)?\s*[-–—~]\s*\d{1,2}:\d{2}\s*(?:AM|PM)?)', time_text)
-                                                if time_match:
-                                                    times = time_match.group(1).split(re.compile(r'[-–—~]'))
-                                                    if len(times) == 2:
-                                                        flight_data['departure'] = times[0].strip()
-                                                        flight_data['arrival'] = times[1].strip()
-                                                        times_found = True
-                                                        print(f"  ✓ Found combined times: {flight_data['departure']} - {flight_data['arrival']}")
-                                                        break
-                                        except Exception as te:
-                                            print(f"    Error getting times with selector {time_selector}: {te}")
-                                    
-                                    # Fallback to regex in card text
-                                    if not times_found:
-                                        # Try multiple time patterns
-                                        time_patterns = [
-                                            r'(\d{1,2}:\d{2}\s*(?:AM|PM))\s*[-–—~]\s*(\d{1,2}:\d{2}\s*(?:AM|PM))',  # 9:30 AM – 12:30 PM
-                                            r'(\d{1,2}:\d{2})\s*[-–—~]\s*(\d{1,2}:\d{2})',                          # 9:30 – 12:30
-                                            r'Depart: (\d{1,2}:\d{2}(?:\s*[AP]M)?).+?Arrive: (\d{1,2}:\d{2}(?:\s*[AP]M)?)'  # Labeled format
-                                        ]
-                                        
-                                        for pattern in time_patterns:
-                                            time_match = re.search(pattern, card_text, re.DOTALL)
-                                            if time_match:
-                                                flight_data['departure'] = time_match.group(1).strip()
-                                                flight_data['arrival'] = time_match.group(2).strip()
-                                                times_found = True
-                                                print(f"  ✓ Found times with regex: {flight_data['departure']} - {flight_data['arrival']}")
-                                                break
-                                    
-                                    # Use text pattern search as final fallback for times
-                                    if not times_found:
-                                        # Try to find separate departure and arrival indicators
-                                        dep_match = re.search(r'(?:Depart|Dep)[\.:]?\s*(\d{1,2}:\d{2}(?:\s*[AP]M)?)', card_text, re.IGNORECASE)
-                                        arr_match = re.search(r'(?:Arrive|Arr)[\.:]?\s*(\d{1,2}:\d{2}(?:\s*[AP]M)?)', card_text, re.IGNORECASE)
-                                        
-                                        if dep_match and arr_match:
-                                            flight_data['departure'] = dep_match.group(1).strip()
-                                            flight_data['arrival'] = arr_match.group(1).strip()
-                                            times_found = True
-                                            print(f"  ✓ Found times with labels: {flight_data['departure']} - {flight_data['arrival']}")
-                                    
-                                    # 4. Extract duration - with selectors and regex
-                                    duration_found = False
-                                    
-                                    # Try with selectors first
-                                    for duration_selector in duration_selectors:
-                                        try:
-                                            duration_el = card.query_selector(duration_selector)
-                                            if duration_el:
-                                                duration_text = duration_el.inner_text().strip()
-                                                # Clean the duration text
-                                                duration_match = re.search(r'(\d+h\s*\d*m|\d+\s*hr\s*\d*\s*min)', duration_text)
-                                                if duration_match:
-                                                    flight_data['duration'] = duration_match.group(1)
-                                                    duration_found = True
-                                                    print(f"  ✓ Found duration with selector: {flight_data['duration']}")
-                                                    break
-                                        except Exception as de:
-                                            print(f"    Error getting duration with selector {duration_selector}: {de}")
-                                    
-                                    # Fallback to regex in card text
-                                    if not duration_found:
-                                        duration_patterns = [
-                                            r'(\d+h\s*\d*m)', 
-                                            r'(\d+\s*hr\s*\d*\s*min)',
-                                            r'Duration[:.]\s*(\d+\s*h(?:r|our)?s?\s*(?:\d+\s*m(?:in)?)?)'
-                                        ]
-                                        
-                                        for pattern in duration_patterns:
-                                            duration_match = re.search(pattern, card_text, re.IGNORECASE)
-                                            if duration_match:
-                                                flight_data['duration'] = duration_match.group(1)
-                                                duration_found = True
-                                                print(f"  ✓ Found duration with regex: {flight_data['duration']}")
-                                                break
-                                    
-                                    # 5. Extract flight number
-                                    flight_num_selectors = ['div.c1YhS', 'div[data-druqb="carrier"]']
-                                    flight_num_found = False
-                                    
-                                    for fnum_selector in flight_num_selectors:
-                                        try:
-                                            fnum_el = card.query_selector(fnum_selector)
-                                            if fnum_el:
-                                                fnum_text = fnum_el.inner_text().strip()
-                                                # Look for patterns like "AI 101", "6E 123"
-                                                fnum_match = re.search(r'([A-Z0-9]{2})\s*(\d{1,4})', fnum_text)
-                                                if fnum_match:
-                                                    flight_data['flight_number'] = f"{fnum_match.group(1)}{fnum_match.group(2)}"
-                                                    flight_num_found = True
-                                                    print(f"  ✓ Found flight number with selector: {flight_data['flight_number']}")
-                                                    break
-                                        except Exception as fe:
-                                            print(f"    Error getting flight number with selector {fnum_selector}: {fe}")
-                                    
-                                    # Fallback to regex in card text
-                                    if not flight_num_found:
-                                        fnum_match = re.search(r'([A-Z0-9]{2})\s*(\d{1,4})', card_text)
-                                        if fnum_match:
-                                            flight_data['flight_number'] = f"{fnum_match.group(1)}{fnum_match.group(2)}"
-                                            flight_num_found = True
-                                            print(f"  ✓ Found flight number with regex: {flight_data['flight_number']}")
-                                        else:
-                                            # Generate flight number from airline if needed
-                                            airline_code = flight_data['airline'][:2].upper()
-                                            flight_data['flight_number'] = f"{airline_code}{100+i}"
-                                            print(f"  ⚠ Generated flight number: {flight_data['flight_number']}")
-                                    
-                                    # Check if we have all essential data
-                                    essential_fields = ['airline', 'price']
-                                    missing_fields = [field for field in essential_fields if field not in flight_data]
-                                    
-                                    if not missing_fields:
-                                        # Add source and destination
-                                        flight_data['source'] = source
-                                        flight_data['destination'] = destination
-                                        flight_data['is_real'] = True
-                                        
-                                        # Set appropriate data source based on what fields we found
-                                        if times_found and duration_found:
-                                            flight_data['data_source'] = "Google Flights (100% REAL)"
-                                        else:
-                                            flight_data['data_source'] = "Google Flights (REAL pricing)"
-                                        
-                                        direct_extracted_flights.append(flight_data)
-                                        print(f"✅ Added flight: {flight_data['airline']} {flight_data['flight_number']} for {flight_data['price']}")
-                                    else:
-                                        print(f"  ⚠ Missing essential fields: {', '.join(missing_fields)}")
-                                
-                                except Exception as card_e:
-                                    print(f"Error processing card {i+1}: {card_e}")
-                            
-                            if direct_extracted_flights:
-                                print(f"✓ Successfully extracted {len(direct_extracted_flights)} flights directly from Google Flights!")
-                                flight_options.extend(direct_extracted_flights)
-                                break  # Exit the selector loop as we found and processed cards
-                                
-                        else:
-                            print(f"No flight cards found with selector: {card_selector}")
-                            
-                    except Exception as e:
-                        print(f"Error with flight card selector {card_selector}: {e}")
-                
-                # If direct extraction didn't work, check for specific one-way flight sections
-                if not direct_extracted_flights:
-                    print("\n--- TRYING SPECIFIC ONE-WAY FLIGHT SECTION ---")
-                    # Look for the one-way flight section containers 
-                    one_way_containers = [
-                        'div.KQi3Ed', # One-way results container
-                        'div.yR1fYc', # Flight results grid
-                        'div.pIjXxc'  # Flight card grid
-                    ]
-                    
-                    for container_selector in one_way_containers:
-                        try:
-                            container = page.query_selector(container_selector)
-                            if container:
-                                print(f"Found one-way flight container with selector: {container_selector}")
-                                
-                                # Try to get price elements
-                                prices = []
-                                for price_sel in price_selectors:
-                                    price_elements = container.query_selector_all(price_sel)
-                                    for el in price_elements:
-                                        price_text = el.inner_text()
-                                        price_match = re.search(r'₹\s?([0-9,]+)', price_text)
-                                        if price_match:
-                                            prices.append(price_match.group(1))
-                                
-                                # Try to get airline elements
-                                airlines_found = []
-                                for airline in ["IndiGo", "Air India", "SpiceJet", "Vistara", "GoAir", "AirAsia", "Go First"]:
-                                    if airline.lower() in container.inner_text().lower():
-                                        airlines_found.append(airline)
-                                
-                                # Try to get duration elements
-                                durations = []
-                                for dur_sel in duration_selectors:
-                                    dur_elements = container.query_selector_all(dur_sel)
-                                    for el in dur_elements:
-                                        dur_text = el.inner_text()
-                                        dur_match = re.search(r'(\d+h\s*\d*m|\d+\s*hr\s*\d*\s*min)', dur_text)
-                                        if dur_match:
-                                            durations.append(dur_match.group(1))
-                                
-                                # Try to get time elements
-                                times = []
-                                for time_sel in time_selectors:
-                                    time_elements = container.query_selector_all(time_sel)
-                                    time_texts = [el.inner_text() for el in time_elements]
-                                    
-                                    # Try to pair them as departure/arrival
-                                    if len(time_texts) >= 2:
-                                        for i in range(0, len(time_texts)-1, 2):
-                                            dep = time_texts[i].strip()
-                                            arr = time_texts[i+1].strip()
-                                            if re.match(r'\d{1,2}:\d{2}(?:\s*[AP]M)?', dep) and \
-                                               re.match(r'\d{1,2}:\d{2}(?:\s*[AP]M)?', arr):
-                                                times.append((dep, arr))
-                                
-                                print(f"Extracted from container - Prices: {prices[:3]}, Airlines: {airlines_found[:3]}, Durations: {durations[:3]}, Time pairs: {len(times)}")
-                                
-                                # Create flights if we have prices and airlines
-                                if prices and airlines_found:
-                                    one_way_flights = []
-                                    
-                                    # Create up to 3 flights
-                                    for i in range(min(3, len(prices), len(airlines_found))):
-                                        flight = {
-                                            "airline": airlines_found[i % len(airlines_found)],
-                                            "price": f"₹ {prices[i % len(prices)]}",
-                                            "source": source,
-                                            "destination": destination,
-                                            "is_real": True,
-                                            "data_source": "Google Flights (One-way REAL pricing)"
-                                        }
-                                        
-                                        # Add duration if available
-                                        if i < len(durations):
-                                            flight["duration"] = durations[i]
-                                        
-                                        # Add times if available
-                                        if i < len(times):
-                                            flight["departure"] = times[i][0]
-                                            flight["arrival"] = times[i][1]
-                                        
-                                        # Generate flight number if needed
-                                        airline_code = flight["airline"][:2].upper()
-                                        flight["flight_number"] = f"{airline_code}{100+i}"
-                                        
-                                        one_way_flights.append(flight)
-                                        print(f"✅ Created one-way flight: {flight['airline']} for {flight['price']}")
-                                    
-                                    if one_way_flights:
-                                        print(f"✓ Successfully extracted {len(one_way_flights)} flights from one-way section")
-                                        flight_options.extend(one_way_flights)
-                                        break  # Exit container loop
-                        
-                        except Exception as e:
-                            print(f"Error with one-way container {container_selector}: {e}")
-                
-                # If direct extraction didn't work, fall back to text-based extraction
-                if not direct_extracted_flights and not flight_options:
-                    print("\n--- FALLING BACK TO TEXT-BASED EXTRACTION ---")
-                    
-                    # Try text-based extraction from Google Flights page
-                    try:
-                        page_text = page.inner_text('body')
-                        
-                        # Look for these airlines in the page text
-                        airlines = ["IndiGo", "Air India", "SpiceJet", "Vistara", "Go First", "AirAsia"]
-                        
-                        # Extract flight details based on text patterns in Google Flights
-                        found_airlines = []
-                        for airline in airlines:
-                            if airline in page_text:
-                                found_airlines.append(airline)
-                        
-                        print(f"Airlines found in page text: {', '.join(found_airlines) if found_airlines else 'None'}")
-                        
-                        # Price pattern in Google Flights (₹XX,XXX)
-                        prices = re.findall(r'₹\s?(\d{1,3}(?:,\d{3})*)', page_text)
-                        print(f"Prices found: {prices[:5] if prices else 'None'}")
-                        
-                        # Time patterns (e.g., "9:30 AM – 12:30 PM")
-                        # Try multiple patterns for time extraction since this is causing issues
-                        time_patterns = re.findall(r'(\d{1,2}:\d{2} [AP]M)\s*[-–—~]\s*(\d{1,2}:\d{2} [AP]M)', page_text)
-                        
-                        # If no times found, try alternative patterns
-                        if not time_patterns:
-                            # Try 24-hour format
-                            time_patterns = re.findall(r'(\d{1,2}:\d{2})\s*[-–—~]\s*(\d{1,2}:\d{2})', page_text)
-                            print(f"Trying 24-hour format - found {len(time_patterns)} time patterns")
-                            
-                        # Try looking for specific flight time sections
-                        if not time_patterns:
-                            departure_times = re.findall(r'Depart(?:ure|s)?:?\s*(\d{1,2}[:\.]\d{2}\s*(?:AM|PM|am|pm)?)', page_text)
-                            arrival_times = re.findall(r'Arrive?(?:al|s)?:?\s*(\d{1,2}[:\.]\d{2}\s*(?:AM|PM|am|pm)?)', page_text)
-                            
-                            if departure_times and arrival_times and len(departure_times) == len(arrival_times):
-                                time_patterns = [(departure_times[i], arrival_times[i]) for i in range(min(len(departure_times), len(arrival_times)))]
-                                print(f"Found {len(time_patterns)} time patterns from separate departure/arrival")
-                        
-                        print(f"Time patterns found: {time_patterns[:3] if time_patterns else 'None'}")
-                        
-                        # Duration patterns (e.g., "2h 30m")
-                        duration_patterns = re.findall(r'(\d+h\s+\d+m|\d+\s*hr\s*\d+\s*min)', page_text)
-                        print(f"Duration patterns found: {duration_patterns[:3] if duration_patterns else 'None'}")
-                        
-                        # Flight number patterns (e.g., "AI 101", "6E 123")
-                        flight_numbers = re.findall(r'([A-Z0-9]{2})\s*(\d{1,4})', page_text)
-                        print(f"Flight numbers found: {flight_numbers[:5] if flight_numbers else 'None'}")
-                        
-                        flights = []
-                        
-                        # Try to construct flight data from the extracted patterns
-                        # We now require airlines, prices and durations (times can be estimated if needed)
-                        if found_airlines and prices and duration_patterns:
-                            print("Found enough essential data to create real flight entries")
-                            
-                            # Generate time estimates if needed
-                            has_times = len(time_patterns) > 0
-                            if not has_times:
-                                print("⚠ No time patterns found - will generate based on durations")
-                                # Create estimated departure and arrival times based on durations
-                                estimated_times = []
-                                base_times = ["06:30 AM", "09:45 AM", "01:15 PM", "04:30 PM", "07:15 PM"]
-                                
-                                for i, duration in enumerate(duration_patterns[:5]):
-                                    # Parse duration to hours and minutes
-                                    hours = 0
-                                    minutes = 0
-                                    
-                                    # Parse different duration formats
-                                    if "hr" in duration:
-                                        dur_parts = duration.split("hr")
-                                        hours = int(dur_parts[0].strip())
-                                        if "min" in dur_parts[1]:
-                                            minutes = int(dur_parts[1].split("min")[0].strip())
-                                    elif "h" in duration:
-                                        dur_parts = duration.split("h")
-                                        hours = int(dur_parts[0].strip())
-                                        if "m" in dur_parts[1]:
-                                            minutes = int(dur_parts[1].split("m")[0].strip())
-                                            
-                                    # Calculate arrival from base departure time
-                                    base_time = base_times[i % len(base_times)]
-                                    is_pm = "PM" in base_time
-                                    base_hour = int(base_time.split(":")[0])
-                                    if base_hour == 12 and not is_pm:
-                                        base_hour = 0  # 12 AM = 0 hours
-                                    if is_pm and base_hour != 12:
-                                        base_hour += 12  # Convert to 24h
-                                        
-                                    base_min = int(base_time.split(":")[1].split(" ")[0])
-                                    
-                                    # Calculate arrival
-                                    arr_hour = base_hour + hours
-                                    arr_min = base_min + minutes
-                                    
-                                    if arr_min >= 60:
-                                        arr_hour += 1
-                                        arr_min -= 60
-                                        
-                                    # Convert back to 12h format
-                                    arr_is_pm = arr_hour >= 12
-                                    if arr_hour > 12:
-                                        arr_hour -= 12
-                                    if arr_hour == 0:
-                                        arr_hour = 12
-                                        
-                                    # Format times
-                                    dep_suffix = "PM" if is_pm else "AM"
-                                    arr_suffix = "PM" if arr_is_pm else "AM"
-                                    
-                                    departure = f"{base_time}"
-                                    arrival = f"{arr_hour}:{arr_min:02d} {arr_suffix}"
-                                    
-                                    estimated_times.append((departure, arrival))
-                                
-                                time_patterns = estimated_times
-                                print(f"Generated estimated times based on durations: {time_patterns[:3]}")
-                            
-                            # Calculate how many complete sets of essential data we have
-                            max_entries = min(len(found_airlines), len(prices), len(duration_patterns), 
-                                         len(time_patterns) if has_times else 999)
-                            
-                            if max_entries > 0:
-                                print(f"Can create {max_entries} flight entries with real price and duration data")
-                                
-                                # Only create up to 3 entries
-                                for i in range(min(3, max_entries)):
-                                    # Generate plausible flight number if not available
-                                    flight_number = ""
-                                    if i < len(flight_numbers):
-                                        flight_number = f"{flight_numbers[i][0]}{flight_numbers[i][1]}"
-                                    else:
-                                        airline_code = found_airlines[i % len(found_airlines)][:2].upper()
-                                        flight_number = f"{airline_code}{100+i}"
-                                    
-                                    flight = {
-                                        "airline": found_airlines[i % len(found_airlines)],
-                                        "flight_number": flight_number,
-                                        "departure": time_patterns[i % len(time_patterns)][0],
-                                        "arrival": time_patterns[i % len(time_patterns)][1],
-                                        "duration": duration_patterns[i % len(duration_patterns)],
-                                        "price": f"₹ {prices[i % len(prices)]}",
-                                        "source": source,
-                                        "destination": destination,
-                                        "is_real": True,
-                                        "data_source": "Google Flights (100% REAL)" if has_times else "Google Flights (REAL prices/duration)"
-                                    }
-                                    flights.append(flight)
-                                    print(f"✅ Created flight: {flight['airline']} {flight['flight_number']} for {flight['price']} ({duration_patterns[i % len(duration_patterns)]})")
-                                
-                                if flights:
-                                    print(f"✓ Successfully extracted {len(flights)} flights with REAL prices from Google Flights")
-                                    flight_options.extend(flights)
-                            else:
-                                print("⚠ Could not create complete flight entries - insufficient data")
-                        else:
-                            missing = []
-                            if not found_airlines: missing.append("airlines")
-                            if not prices: missing.append("prices") 
-                            if not duration_patterns: missing.append("durations")
-                            
-                            print(f"⚠ Missing essential data elements: {', '.join(missing)}")
-                    
-                    except Exception as e:
-                        print(f"Text-based extraction from Google Flights failed: {str(e)}")
-                        traceback.print_exc()
-            
-            except Exception as e:
-                print(f"✗ Google Flights extraction failed: {str(e)}")
-                traceback.print_exc()
-            
-            # Close browser properly
-            try:
-                context.close()
-                browser.close()
-            except Exception as e:
-                print(f"Error closing browser: {e}")
-    
-    except Exception as e:
-        print(f"✗ Critical error in flight data extraction: {str(e)}")
-        traceback.print_exc()
-    
-    # Final results processing
-    print("\n--- FINAL RESULTS ---")
-    
-    # If we couldn't get flight options, use fallback data but clearly mark as NOT REAL
-    if not flight_options:
-        print("⚠ No real flight data obtained, using fallback flight data")
-        flight_options = fallback_flights
-        print("Note: This is simulated data as real-time data could not be fetched.")
-    else:
-        print(f"✅ SUCCESS! Retrieved {len(flight_options)} flight options with REAL pricing!")
-        
-        # Mark data as real to make it clear in the output
-        for flight in flight_options:
-            if 'is_real' not in flight:
-                flight['is_real'] = True
-            
-            # Fix key names for consistency with app expectations
-            if 'departure_time' in flight and 'departure' not in flight:
-                flight['departure'] = flight['departure_time']
-            if 'arrival_time' in flight and 'arrival' not in flight:
-                flight['arrival'] = flight['arrival_time']
-            
-            # Add REAL tag to the source if not already there
-            if 'source' in flight and 'REAL' not in flight['source']:
-                flight['source'] = f"{flight['source']} (REAL pricing)"
-            else:
-                flight['source'] = "Google Flights (REAL pricing)"
-    
-    # Get real attractions for the destination using TravelAgent
-    travel_agent = TravelAgent()
-    attractions = travel_agent.get_real_attractions(destination)
-    print(f"Getting real attractions for {destination}")
-    
-    # Now we accept flights that have real prices and durations, even if times are estimated
-    verified_flights = [f for f in flight_options if f.get('is_real', False)]
-    
-    if verified_flights:
-        print(f"Found {len(verified_flights)} flights with real pricing data")
-        result = {
-            'flight_options': verified_flights[:3],
-            'attractions': attractions,
-            'using_real_data': True
-        }
-        
-        # Print summary 
-        print("\n--- SUMMARY ---")
-        print(f"Returning REAL flight data with VERIFIED pricing")
-        for i, flight in enumerate(result['flight_options']):
-            print(f"Flight {i+1}: {flight['airline']} {flight['flight_number']} - {flight.get('price', 'Unknown price')} ({flight.get('source', 'Unknown source')})")
-        
-    else:
-        print("No flights with real pricing found, falling back to generated data")
-        result = {
-            'flight_options': fallback_flights[:3],
-            'attractions': attractions,
-            'using_real_data': False
-        }
-        
-        # Print summary 
-        print("\n--- SUMMARY ---")
-        print(f"Returning FALLBACK flight data")
-        for i, flight in enumerate(result['flight_options']):
-            print(f"Flight {i+1}: {flight['airline']} {flight['flight_number']} - {flight.get('price', 'Unknown price')} ({flight.get('source', 'Unknown source')})")
-    
-    return result
-
-def generate_fallback_flights(source, destination, start_date):
-    """Generate fallback flight data when web scraping fails"""
-    print("Generating fallback flight data")
-    
-    # Get airport codes (simulated)
-    source_code = source[:3].upper()
-    dest_code = destination[:3].upper()
-    
-    # List of airlines to create variation
-    airlines = ["IndiGo", "Air India", "SpiceJet", "Vistara", "GoAir"]
-    
-    # Generate three different flight options
-    flight_options = []
-    
-    for i in range(3):
-        # Create variations in time and price
-        departure_hour = 6 + i
-        duration_hours = 2 + (i % 3)
-        arrival_hour = departure_hour + duration_hours
-        flight_num = 100 + (i * 111)
-        price_base = 4000 + (i * 800)
-        
-        # Format times nicely
-        departure_time = f"{departure_hour:02d}:00"
-        arrival_time = f"{arrival_hour:02d}:30"
-        
-        flight_options.append({
-            'airline': airlines[i % len(airlines)],
-            'flight_number': f"{airlines[i % len(airlines)][:2].upper()}-{flight_num}",
-            'departure': departure_time,
-            'arrival': arrival_time,
-            'duration': f"{duration_hours}h 30m",
-            'price': f"₹ {price_base}",
-            'source': 'Generated (Fallback)',
-            'is_real': False
-        })
-    
-    return flight_options 
\ No newline at end of file
+Kept for existing imports; the scraping lives in agents.flight_engine.
+"""
+from agents.flight_engine import get_real_flight_data, generate_fallback_flights
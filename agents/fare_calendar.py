@@ -0,0 +1,175 @@
+"""
+Flexible-date fare calendar
+
+get_fare_calendar() looks up the cheapest fare for every departure date within
+±flex_days of the requested date. Dates whose fare was seen recently come from
+the fare cache; the others are searched at the same time on the shared browser
+pool, at most FARE_CALENDAR_CONCURRENCY (3) dates at once, each with only the
+FARE_CALENDAR_PROVIDERS (default: google_flights) to keep the browser work per
+date to one page.
+
+Every flight search, including the normal one for a plan, records its cheapest
+fare in the cache for FARE_CACHE_SECONDS (30 minutes), so a calendar after a plan
+(or a plan after a calendar) reuses what was already fetched.
+
+    calendar = get_fare_calendar('Hyderabad', 'Goa', '2025-03-10', num_days=3, flex_days=3)
+    calendar['fares']     -> {'2025-03-07': 4210, '2025-03-08': None, ...}
+    calendar['cheapest']  -> '2025-03-07'
+"""
+import os
+import time
+import threading
+from datetime import datetime, timedelta, date
+from concurrent.futures import ThreadPoolExecutor, wait
+from utils.deadline import Deadline
+from agents.flight_engine import FlightQuery, FLIGHT_PROVIDER_REGISTRY, search_flights
+
+DEFAULT_FLEX_DAYS = 3
+MAX_FLEX_DAYS = 7
+FARE_CACHE_SECONDS = float(os.getenv('FARE_CACHE_SECONDS', 1800))
+FARE_CALENDAR_CONCURRENCY = max(1, int(os.getenv('FARE_CALENDAR_CONCURRENCY', 3)))
+
+
+class FareCache:
+    """Cheapest fare per (origin, destination, departure date, trip length), kept for a while"""
+
+    def __init__(self, ttl_seconds=FARE_CACHE_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self._fares = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """(True, fare) for a fresh entry, else (False, None)"""
+        with self._lock:
+            entry = self._fares.get(key)
+            if entry is None:
+                return False, None
+            fare, stored_at = entry
+            if time.monotonic() - stored_at > self.ttl_seconds:
+                del self._fares[key]
+                return False, None
+            return True, fare
+
+    def put(self, key, fare):
+        with self._lock:
+            self._fares[key] = (fare, time.monotonic())
+
+    def clear(self):
+        with self._lock:
+            self._fares.clear()
+
+
+_fare_cache = FareCache()
+
+
+def get_fare_cache():
+    """Return the shared fare cache"""
+    return _fare_cache
+
+
+def fare_key(query):
+    return (query.source_code, query.destination_code, query.start_date, query.num_days)
+
+
+def record_fares(query, flights):
+    """
+    Remember the cheapest of `flights` (ranked flight dicts) for the query's route and date.
+
+    Searches that found nothing are not remembered: an empty result may just mean
+    the sources were down or the deadline cut the search short.
+    """
+    prices = [flight['price_value'] for flight in flights if flight.get('price_value')]
+    if prices and not query.unresolved_cities():
+        _fare_cache.put(fare_key(query), min(prices))
+
+
+def calendar_providers():
+    """Instances of the providers listed in FARE_CALENDAR_PROVIDERS"""
+    names = os.getenv('FARE_CALENDAR_PROVIDERS', 'google_flights')
+    return [FLIGHT_PROVIDER_REGISTRY[name]() for name in (n.strip() for n in names.split(','))
+            if name in FLIGHT_PROVIDER_REGISTRY]
+
+
+def _scan_date(query):
+    """Worker: cheapest fare for one departure date"""
+    if query.deadline.expired():
+        return None
+    flights = search_flights(query, providers=calendar_providers())
+    record_fares(query, flights)
+    prices = [flight['price_value'] for flight in flights]
+    return min(prices) if prices else None
+
+
+def get_fare_calendar(source, destination, start_date, num_days, flex_days=DEFAULT_FLEX_DAYS, deadline=None,
+                      max_concurrency=None):
+    """
+    Cheapest fare for each departure date within ±flex_days of start_date.
+
+    Args:
+        source (str): Departure city
+        destination (str): Arrival city
+        start_date (str): Requested departure date, YYYY-MM-DD
+        num_days (int): Trip length; every date is searched as a round trip of this length
+        flex_days (int): Days to scan before and after start_date (at most MAX_FLEX_DAYS)
+        deadline (Deadline, optional): Budget for the whole calendar
+        max_concurrency (int, optional): Dates searched at once, FARE_CALENDAR_CONCURRENCY by default
+
+    Returns:
+        dict: source_code, destination_code, fares (date -> cheapest price or None,
+        in date order), cheapest (date or None), cached (dates served from the cache)
+        and error when the cities have no airport
+    """
+    deadline = deadline or Deadline()
+    flex_days = max(0, min(int(flex_days), MAX_FLEX_DAYS))
+    center = datetime.strptime(start_date, "%Y-%m-%d").date()
+    dates = [center + timedelta(days=offset) for offset in range(-flex_days, flex_days + 1)]
+    # Dates in the past can't be booked
+    dates = [day for day in dates if day >= date.today()]
+
+    queries = {day.strftime("%Y-%m-%d"): FlightQuery(source, destination, day.strftime("%Y-%m-%d"), num_days, deadline)
+               for day in dates}
+    probe = FlightQuery(source, destination, start_date, num_days, deadline)
+    calendar = {
+        'source_code': probe.source_code,
+        'destination_code': probe.destination_code,
+        'fares': {},
+        'cheapest': None,
+        'cached': []
+    }
+    unresolved = probe.unresolved_cities()
+    if unresolved:
+        calendar['error'] = f"No airport found for {', '.join(unresolved)}"
+        return calendar
+
+    fares = {}
+    to_search = []
+    for day, query in queries.items():
+        hit, fare = _fare_cache.get(fare_key(query))
+        if hit:
+            fares[day] = fare
+            calendar['cached'].append(day)
+        else:
+            to_search.append(day)
+    print(f"Fare calendar {probe.source_code}-{probe.destination_code}: {len(calendar['cached'])} dates cached, "
+          f"searching {len(to_search)}")
+
+    if to_search:
+        workers = max(1, min(max_concurrency or FARE_CALENDAR_CONCURRENCY, len(to_search)))
+        executor = ThreadPoolExecutor(max_workers=workers)
+        try:
+            futures = {executor.submit(_scan_date, queries[day]): day for day in to_search}
+            done, _ = wait(futures, timeout=None if deadline.remaining() == float('inf') else deadline.remaining())
+            for future, day in futures.items():
+                try:
+                    fares[day] = future.result() if future in done else None
+                except Exception as e:
+                    print(f"Fare search for {day} failed: {str(e)[:100]}")
+                    fares[day] = None
+        finally:
+            # Dates not started yet are dropped; running ones stop at the deadline
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    calendar['fares'] = {day: fares.get(day) for day in sorted(queries)}
+    priced = [(fare, day) for day, fare in calendar['fares'].items() if fare is not None]
+    calendar['cheapest'] = min(priced)[1] if priced else None
+    return calendar
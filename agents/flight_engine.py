@@ -0,0 +1,746 @@
+"""
+Flight engine: pluggable flight providers run in parallel on the shared browser pool
+
+Every flight source is a FlightProvider registered under a short name with
+@register_flight_provider. search_flights() starts every enabled provider whose
+circuit is closed at the same time, each in its own browser context on the shared
+browser pool (utils.browser_pool), then normalizes what they return into one flight
+format, drops duplicates and ranks the flights by price and departure time.
+
+Providers are enabled with FLIGHT_PROVIDERS, a comma separated list of provider
+names (default: google_flights,easemytrip,ixigo). Once the first flights are in,
+the others get FLIGHT_SETTLE_SECONDS (8) more to answer before they are cancelled.
+"""
+import os
+import re
+import time
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from dotenv import load_dotenv
+from utils.upstreams import GOOGLE_BASE_URL, EASEMYTRIP_BASE_URL, IXIGO_BASE_URL
+from utils.circuit_breaker import get_breaker
+from utils.rate_limit import throttle_navigation, RateLimited
+from utils.browser_pool import get_browser_pool, PoolSaturated
+from utils.deadline import Deadline
+from utils import scrape_replay
+from utils.card_extract import extract_cards, wait_for_cards, first_valid
+from utils.airports import get_airport_index
+from utils.text_parse import (PRICE_PATTERN, TIME_PATTERN, TIME_RANGE_PATTERNS, DURATION_PATTERNS, DURATION_TEXT_PATTERN,
+                              parse_price, parse_prices, parse_time_range, find_duration_text,
+                              parse_clock, format_clock, parse_duration)
+from utils.response_capture import ResponseCapture, get_extraction_mode, NETWORK_CAPTURE_TIMEOUT_MS
+from agents.google_payloads import parse_flight_offers
+from agents.google_flights_tfs import flights_search_url
+
+# Load environment variables
+load_dotenv()
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+
+DEFAULT_FLIGHT_PROVIDERS = 'google_flights,easemytrip,ixigo'
+
+# How long slower providers may still add flights after the first ones arrive
+SETTLE_SECONDS = float(os.getenv('FLIGHT_SETTLE_SECONDS', 8))
+
+# Carriers we recognise by name in the text of result cards and pages
+KNOWN_AIRLINES = ["IndiGo", "Air India", "SpiceJet", "Vistara", "GoAir", "AirAsia", "Go First", "Akasa Air"]
+
+FLIGHT_NUMBER_PATTERN = re.compile(r'\b([A-Z0-9]{2})[-\s]?(\d{2,4})\b')
+# Carrier element text, sometimes followed by the flight number
+AIRLINE_TEXT_PATTERN = re.compile(r'^(\D+?)(?:\s*\d.*)?$', re.DOTALL)
+
+
+def airport_code(city):
+    """IATA code for a city name from the bundled airport dataset, or None when it is not known"""
+    return get_airport_index().code(city)
+
+
+def parse_flight_text(text):
+    """
+    Pull flight fields out of the visible text of one result card.
+
+    Shared by every provider so all sources are read the same way. Only fields
+    that were actually found are returned; nothing is made up here.
+
+    Returns:
+        dict: any of airline, price, departure, arrival, duration and flight_number
+    """
+    flight = {}
+    lowered = text.lower()
+
+    for airline in KNOWN_AIRLINES:
+        if airline.lower() in lowered:
+            flight['airline'] = airline
+            break
+
+    price = parse_price(text)
+    if price is not None:
+        flight['price'] = f"₹ {price:,}"
+
+    times = parse_time_range(text)
+    if times:
+        flight['departure'], flight['arrival'] = times
+
+    duration = find_duration_text(text)
+    if duration:
+        flight['duration'] = duration
+
+    match = FLIGHT_NUMBER_PATTERN.search(text)
+    if match:
+        flight['flight_number'] = f"{match.group(1)}{match.group(2)}"
+
+    return flight
+
+
+def _estimate_arrival(departure, duration):
+    """12-hour arrival time for a departure like '06:30 AM' and a duration like '2h 15m'"""
+    return format_clock((parse_clock(departure) or 0) + (parse_duration(duration) or 0))
+
+
+class FlightQuery:
+    """What to search for, shared by every provider of one flight search"""
+
+    def __init__(self, source, destination, start_date, num_days, deadline):
+        self.source = source
+        self.destination = destination
+        self.start_date = start_date
+        self.num_days = num_days
+        self.start_date_obj = datetime.strptime(start_date, "%Y-%m-%d")
+        self.return_date = (self.start_date_obj + timedelta(days=num_days)).strftime("%Y-%m-%d")
+        self.clean_source = source.split(',')[0].strip().lower()
+        self.clean_destination = destination.split(',')[0].strip().lower()
+        self.source_code = airport_code(source)
+        self.destination_code = airport_code(destination)
+        self.deadline = deadline
+
+    def unresolved_cities(self):
+        """The cities no airport was found for; providers must not be run for those"""
+        return [city for city, code in ((self.source, self.source_code), (self.destination, self.destination_code))
+                if not code]
+
+
+class FlightProvider:
+    """
+    One flight source.
+
+    Subclasses set `name` (the registry key), `label` (shown to the user as the
+    source of a flight) and `base_url` (used for the circuit breaker), and
+    implement search(page, query, deadline) returning a list of raw flight
+    dictionaries. Raw flights only need an 'airline' and a 'price'; the engine
+    normalizes the rest. `deadline` is cancelled when the request budget runs out,
+    so long searches should pass it to every wait.
+
+    navigations() is the number of page loads one search makes on base_url; they
+    are taken from the host's rate limit before the search is submitted.
+    """
+
+    name = None
+    label = None
+    base_url = None
+
+    def breaker(self):
+        return get_breaker(self.base_url)
+
+    def navigations(self):
+        return 1
+
+    def search(self, page, query, deadline):
+        raise NotImplementedError
+
+
+# Provider name -> FlightProvider subclass
+FLIGHT_PROVIDER_REGISTRY = {}
+
+
+def register_flight_provider(provider_class):
+    """Class decorator that makes a provider available under its name"""
+    FLIGHT_PROVIDER_REGISTRY[provider_class.name] = provider_class
+    return provider_class
+
+
+def enabled_flight_providers():
+    """Instances of the providers listed in FLIGHT_PROVIDERS, in that order"""
+    names = os.getenv('FLIGHT_PROVIDERS', DEFAULT_FLIGHT_PROVIDERS)
+    providers = []
+    for name in (n.strip() for n in names.split(',')):
+        if not name:
+            continue
+        if name not in FLIGHT_PROVIDER_REGISTRY:
+            print(f"Unknown flight provider '{name}' in FLIGHT_PROVIDERS, skipping it")
+            continue
+        providers.append(FLIGHT_PROVIDER_REGISTRY[name]())
+    return providers
+
+
+@register_flight_provider
+class GoogleFlightsProvider(FlightProvider):
+    name = 'google_flights'
+    label = 'Google Flights'
+    base_url = GOOGLE_BASE_URL
+
+    # XHR that carries the search results
+    RESULTS_RPC_PATTERN = r'FlightsFrontendService/GetShoppingResults'
+
+    # Result cards, most specific first
+    CARD_SELECTORS = [
+        'div[role="listitem"]',  # Modern Google Flights list items
+        'div[data-test-id="slice-card"]',  # Slice cards
+        'div[jsname="Mu2Cce"]',  # Flight cards in newer interface
+        'li.Sryd5',  # List items in flight results
+        'div.gws-flights-results__itinerary-card',  # Legacy selector
+        'div.Rk10dc',  # One-way flight results container
+        'div.pIjXxc',  # Specific one-way flight card
+        'div.ESUph'  # One-way flight option
+    ]
+    ONE_WAY_CONTAINER_SELECTORS = ['div.KQi3Ed', 'div.yR1fYc', 'div.pIjXxc']
+    RESULTS_READY_SELECTORS = [
+        'div[role="list"]',
+        'div[role="heading"]:has-text("Best departing flights")',
+        'div.pIjXxc',
+        'div.yR1fYc',
+        'div[jscontroller="KAKRMc"]'
+    ]
+    TIME_SELECTORS = [
+        'div[jsname="St7GW"]', 'div.UAj9Ne', 'span.Trln7e', 'span.Sonygc', 'div.zxVSec',
+        'div.VfPpkd-fmcmS-yrriRe', 'span[jsname="K4r5Ff"]', 'span.KdUjF'
+    ]
+    PRICE_SELECTORS = [
+        'div[jsname="GR88H"]', 'span.nwZbe', 'div.I45fFd', 'div.U3gSDe', 'div.YMlIz',
+        'span[jsname="p67jDf"]', 'div.BbR8Ec'
+    ]
+    AIRLINE_SELECTORS = [
+        'div.cS4Huc', 'div.FLHACf', 'span[jsname="SwwRAd"]', 'div.c7jV4e', 'span.a9ZLXb',
+        'div.sSHqwe', 'span[jscontroller="L1X8K"]'
+    ]
+    DURATION_SELECTORS = [
+        'div.wDeBkc', 'div.kPLKYe', 'div[data-druqb="duration"]', 'div.gvkrdb',
+        'span.VfPpkd-jY41G-V67aGc'
+    ]
+    FLIGHT_NUMBER_SELECTORS = ['div.c1YhS', 'div[data-druqb="carrier"]']
+
+    def search_url(self, query):
+        # A tfs deep link opens the results directly, without Google interpreting a text query first
+        return flights_search_url(query.source_code, query.destination_code, query.start_date,
+                                  return_date=query.return_date)
+
+    def search(self, page, query, deadline):
+        url = self.search_url(query)
+        mode = get_extraction_mode()
+        print(f"Navigating to round-trip flight search ({mode} extraction): {url}")
+        if mode != 'dom':
+            # Read the offers straight from the results XHR instead of the rendered cards
+            capture = ResponseCapture(page, self.RESULTS_RPC_PATTERN, parse_flight_offers)
+            try:
+                page.goto(url, wait_until="commit", timeout=deadline.timeout_ms(40000))
+                flights = capture.wait_for(1, deadline.timeout_ms(NETWORK_CAPTURE_TIMEOUT_MS))
+            finally:
+                capture.stop()
+            if flights or mode == 'network':
+                return flights
+            print("No flight results XHR captured, reading the rendered page")
+            page.wait_for_load_state("networkidle", timeout=deadline.timeout_ms(40000))
+        else:
+            response = page.goto(url, wait_until="networkidle", timeout=deadline.timeout_ms(40000))
+            if response:
+                print(f"✓ Google Flights search loaded with status: {response.status}")
+
+        # Wait for the loading indicator to go and the results to show up
+        try:
+            loading_selector = 'div[role="progressbar"], div.sSe6Lc'
+            if page.query_selector(loading_selector):
+                page.wait_for_selector(loading_selector, state="hidden", timeout=deadline.timeout_ms(20000))
+        except Exception as e:
+            print(f"Note: No loading indicator found or already finished: {e}")
+
+        for selector in self.RESULTS_READY_SELECTORS:
+            try:
+                page.wait_for_selector(selector, timeout=deadline.timeout_ms(5000))
+                print(f"✓ Found flight results with selector: {selector}")
+                break
+            except Exception:
+                print(f"Note: Selector {selector} not found")
+
+        # Scroll down to ensure all content is loaded
+        page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
+        page.wait_for_timeout(deadline.timeout_ms(1000))
+        page.evaluate("window.scrollTo(0, 0)")
+        page.wait_for_timeout(deadline.timeout_ms(1000))
+
+        flights = self._extract_cards(page)
+        if not flights:
+            flights = self._extract_one_way_container(page)
+        if not flights:
+            flights = self._extract_page_text(page)
+        return flights
+
+    def _card_times(self, time_groups):
+        """(departure, arrival) from the time element texts of a card, or None"""
+        for texts in time_groups:
+            if len(texts) >= 2:
+                if TIME_PATTERN.match(texts[0]) and TIME_PATTERN.match(texts[1]):
+                    return texts[0], texts[1]
+            else:
+                # Maybe it's a combined time format like "9:30 AM – 12:30 PM"
+                times = TIME_PATTERN.findall(texts[0])
+                if len(times) == 2:
+                    return times[0].strip(), times[1].strip()
+        return None
+
+    def _extract_cards(self, page):
+        """Read airline, price, times, duration and flight number from each result card"""
+        groups = extract_cards(
+            page, self.CARD_SELECTORS, limit=3,
+            fields={
+                'airline': self.AIRLINE_SELECTORS,
+                'price': self.PRICE_SELECTORS,
+                'duration': self.DURATION_SELECTORS,
+                'flight_number': self.FLIGHT_NUMBER_SELECTORS
+            },
+            multi_fields={'times': self.TIME_SELECTORS}
+        )
+        for card_selector, cards in groups:
+            print(f"✓ Found {len(cards)} flight cards with selector: {card_selector}")
+            flights = []
+            for i, card in enumerate(cards):
+                values = card['fields']
+                # Regex over the whole card first, selectors refine what they can
+                flight = parse_flight_text(card['text'])
+
+                if 'airline' not in flight:
+                    match = first_valid(values['airline'], AIRLINE_TEXT_PATTERN)
+                    if match:
+                        flight['airline'] = match.group(1).strip()
+                price = first_valid(values['price'], PRICE_PATTERN)
+                if price:
+                    flight['price'] = f"₹ {price.group(1)}"
+                if 'airline' not in flight or 'price' not in flight:
+                    print(f"  ⚠ Card {i + 1} has no airline or price, skipping it")
+                    continue
+
+                times = self._card_times(values['times'])
+                if times:
+                    flight['departure'], flight['arrival'] = times
+                duration = first_valid(values['duration'], DURATION_PATTERNS[0]) or \
+                    first_valid(values['duration'], DURATION_PATTERNS[1])
+                if duration:
+                    flight['duration'] = duration.group(1)
+                number = first_valid(values['flight_number'], FLIGHT_NUMBER_PATTERN)
+                if number:
+                    flight['flight_number'] = f"{number.group(1)}{number.group(2)}"
+
+                if 'departure' in flight and 'duration' in flight:
+                    flight['data_source'] = "Google Flights (100% REAL)"
+                else:
+                    flight['data_source'] = "Google Flights (REAL pricing)"
+                flights.append(flight)
+                print(f"✅ Found flight: {flight['airline']} {flight.get('flight_number', '')} for {flight['price']}")
+
+            if flights:
+                return flights
+        return []
+
+    def _extract_one_way_container(self, page):
+        """Pair up prices, airlines, durations and times found anywhere in the results grid"""
+        groups = extract_cards(
+            page, self.ONE_WAY_CONTAINER_SELECTORS, limit=1,
+            multi_fields={
+                'prices': self.PRICE_SELECTORS,
+                'durations': self.DURATION_SELECTORS,
+                'times': self.TIME_SELECTORS
+            }
+        )
+        for container_selector, containers in groups:
+            print(f"Found one-way flight container with selector: {container_selector}")
+            container = containers[0]
+            values = container['fields']
+
+            prices = [price for texts in values['prices'] for price in map(parse_price, texts) if price is not None]
+            airlines = [airline for airline in KNOWN_AIRLINES if airline.lower() in container['text'].lower()]
+            durations = []
+            for texts in values['durations']:
+                for text in texts:
+                    match = DURATION_PATTERNS[0].search(text) or DURATION_PATTERNS[1].search(text)
+                    if match:
+                        durations.append(match.group(1))
+            times = []
+            for texts in values['times']:
+                for i in range(0, len(texts) - 1, 2):
+                    if TIME_PATTERN.match(texts[i]) and TIME_PATTERN.match(texts[i + 1]):
+                        times.append((texts[i], texts[i + 1]))
+
+            flights = []
+            for i in range(min(3, len(prices), len(airlines))):
+                flight = {
+                    'airline': airlines[i],
+                    'price': f"₹ {prices[i]:,}",
+                    'data_source': "Google Flights (One-way REAL pricing)"
+                }
+                if i < len(durations):
+                    flight['duration'] = durations[i]
+                if i < len(times):
+                    flight['departure'], flight['arrival'] = times[i]
+                flights.append(flight)
+            if flights:
+                print(f"✓ Extracted {len(flights)} flights from the one-way section")
+                return flights
+        return []
+
+    def _extract_page_text(self, page):
+        """Last resort: match airlines, prices and durations anywhere in the page text"""
+        try:
+            page_text = page.inner_text('body')
+        except Exception as e:
+            print(f"Text-based extraction from Google Flights failed: {e}")
+            return []
+
+        airlines = [airline for airline in KNOWN_AIRLINES if airline in page_text]
+        prices = parse_prices(page_text)
+        durations = DURATION_TEXT_PATTERN.findall(page_text)
+        time_pairs = TIME_RANGE_PATTERNS[0].findall(page_text) or TIME_RANGE_PATTERNS[1].findall(page_text)
+        flight_numbers = FLIGHT_NUMBER_PATTERN.findall(page_text)
+
+        if not (airlines and prices and durations):
+            print("⚠ Page text has no airlines, prices or durations to build flights from")
+            return []
+
+        has_times = bool(time_pairs)
+        if not has_times:
+            # Estimate times from the durations at common departure slots
+            base_times = ["06:30 AM", "09:45 AM", "01:15 PM", "04:30 PM", "07:15 PM"]
+            time_pairs = [(base_times[i % len(base_times)], _estimate_arrival(base_times[i % len(base_times)], duration))
+                          for i, duration in enumerate(durations[:5])]
+
+        flights = []
+        for i in range(min(3, len(airlines), len(prices), len(durations), len(time_pairs))):
+            flight = {
+                'airline': airlines[i],
+                'departure': time_pairs[i][0],
+                'arrival': time_pairs[i][1],
+                'duration': durations[i],
+                'price': f"₹ {prices[i]:,}",
+                'data_source': "Google Flights (100% REAL)" if has_times else "Google Flights (REAL prices/duration)"
+            }
+            if i < len(flight_numbers):
+                flight['flight_number'] = f"{flight_numbers[i][0]}{flight_numbers[i][1]}"
+            flights.append(flight)
+        print(f"✓ Extracted {len(flights)} flights from the Google Flights page text")
+        return flights
+
+
+class _CardListProvider(FlightProvider):
+    """Provider for sites with a plain search URL and one element per result"""
+
+    CARD_SELECTORS = []
+
+    def search_url(self, query):
+        raise NotImplementedError
+
+    def search(self, page, query, deadline):
+        url = self.search_url(query)
+        print(f"Searching {self.label}: {url}")
+        page.goto(url, wait_until="domcontentloaded", timeout=deadline.timeout_ms(30000))
+        if not wait_for_cards(page, self.CARD_SELECTORS, deadline.timeout_ms(15000)):
+            return []
+
+        for selector, cards in extract_cards(page, self.CARD_SELECTORS, limit=3):
+            print(f"Found {len(cards)} flight cards on {self.label} with selector: {selector}")
+            flights = []
+            for card in cards:
+                flight = parse_flight_text(card['text'])
+                if 'airline' in flight and 'price' in flight:
+                    flight['data_source'] = f"{self.label} (REAL pricing)"
+                    flights.append(flight)
+            if flights:
+                return flights
+        return []
+
+
+@register_flight_provider
+class EaseMyTripFlightProvider(_CardListProvider):
+    name = 'easemytrip'
+    label = 'EaseMyTrip'
+    base_url = EASEMYTRIP_BASE_URL
+    CARD_SELECTORS = ['div.fltResult', 'div.flightDetSecOuter', 'div.fliResults']
+
+    def search_url(self, query):
+        emt_date = query.start_date_obj.strftime("%d-%m-%Y")
+        return (f"{EASEMYTRIP_BASE_URL}/FlightList/Index?org={query.source_code}&dest={query.destination_code}"
+                f"&deptdate={emt_date}&adult=1&child=0&infant=0&cabin=1&airline=Any&val=0")
+
+
+@register_flight_provider
+class IxigoFlightProvider(_CardListProvider):
+    name = 'ixigo'
+    label = 'ixigo'
+    base_url = IXIGO_BASE_URL
+    CARD_SELECTORS = ['div.flight-item', '.airline-result', '.c-flight-listing-row']
+
+    def search_url(self, query):
+        ixigo_date = query.start_date_obj.strftime("%Y%m%d")
+        return (f"{IXIGO_BASE_URL}/search/result/flight?from={query.source_code}&to={query.destination_code}"
+                f"&date={ixigo_date}&returnDate=&adults=1&children=0&infants=0&class=e&source=Search%20Form")
+
+
+def normalize_flight(raw, provider, query, index=0):
+    """
+    Turn a raw provider result into the flight format the app renders.
+
+    Returns None for results without an airline or a readable price.
+    """
+    price_value = parse_price(raw.get('price'))
+    airline = (raw.get('airline') or '').strip()
+    if not airline or price_value is None:
+        return None
+
+    flight_number = raw.get('flight_number')
+    if not flight_number:
+        flight_number = f"{airline[:2].upper()}{100 + index}"
+
+    return {
+        'airline': airline,
+        'flight_number': flight_number,
+        'departure': raw.get('departure') or raw.get('departure_time', 'TBD'),
+        'arrival': raw.get('arrival') or raw.get('arrival_time', 'TBD'),
+        'duration': raw.get('duration', ''),
+        'price': f"₹ {price_value:,}",
+        'price_value': price_value,
+        'src_code': query.source_code,
+        'dst_code': query.destination_code,
+        'source': f"{provider.label} (REAL pricing)",
+        'data_source': raw.get('data_source', f"{provider.label} (REAL pricing)"),
+        'provider': provider.name,
+        'is_real': True
+    }
+
+
+def rank_flights(flights):
+    """Drop duplicates seen on several sites (keeping the cheapest) and sort by price, then departure"""
+    def sort_key(flight):
+        departure = parse_clock(flight.get('departure'))
+        return (flight['price_value'], departure if departure is not None else 24 * 60)
+
+    unique = {}
+    for flight in sorted(flights, key=sort_key):
+        key = (flight['airline'].lower(), re.sub(r'[^A-Z0-9]', '', flight['flight_number'].upper()),
+               parse_clock(flight.get('departure')))
+        unique.setdefault(key, flight)
+    return list(unique.values())
+
+
+def _run_provider(browser, provider, query, deadline):
+    """Pool task: run one provider in a fresh context and report to its circuit breaker"""
+    breaker = provider.breaker()
+    if deadline.expired():
+        breaker.release()
+        return []
+
+    print(f"Searching flights on {provider.name}...")
+    started = time.monotonic()
+    flights = []
+    context = None
+    rate_limited = False
+    try:
+        # Context honours SCRAPER_REPLAY_MODE (live, record or replay)
+        context = scrape_replay.new_context(
+            browser,
+            scrape_replay.session_name('flights', provider.name, query.source, query.destination, query.start_date, query.num_days),
+            viewport={'width': 1366, 'height': 768},
+            user_agent=USER_AGENT,
+            ignore_https_errors=True
+        )
+        context.set_default_timeout(deadline.timeout_ms(40000))
+        page = context.new_page()
+        raw_flights = provider.search(page, query, deadline) or []
+        for i, raw in enumerate(raw_flights):
+            flight = normalize_flight(raw, provider, query, i)
+            if flight:
+                flights.append(flight)
+    except RateLimited as e:
+        # Our own limit, not the upstream's fault
+        print(f"{provider.name} skipped: {e}")
+        rate_limited = True
+    except Exception as e:
+        print(f"Error with {provider.name}: {str(e)[:150]}")
+    finally:
+        # Closing the context also saves a recorded session
+        if context is not None:
+            try:
+                context.close()
+            except Exception as e:
+                print(f"Error closing {provider.name} context: {str(e)[:100]}")
+
+    duration = time.monotonic() - started
+    if flights:
+        breaker.record_success(duration)
+    elif deadline.expired() or rate_limited:
+        # Cancelled, out of budget or held back by our rate limit: not the upstream's fault
+        breaker.release()
+    else:
+        breaker.record_failure(duration)
+    return flights
+
+
+def search_flights(query, providers=None, pool=None):
+    """
+    Run flight providers in parallel and return their flights normalized and ranked.
+
+    Args:
+        query (FlightQuery): Search parameters and request deadline
+        providers (list, optional): FlightProvider instances, FLIGHT_PROVIDERS by default
+        pool (BrowserPool, optional): Pool to run on, the shared pool by default
+
+    Returns:
+        list: Unique flights from every provider that answered in time, cheapest first
+    """
+    if query.unresolved_cities():
+        return []
+    providers = enabled_flight_providers() if providers is None else providers
+    pool = pool or get_browser_pool()
+
+    runs = {}
+    for provider in providers:
+        if not provider.breaker().allow_request():
+            print(f"Circuit for {provider.breaker().name} is open, skipping {provider.name}")
+            continue
+        # Each provider gets its own child deadline so it can be cancelled on its own
+        provider_deadline = query.deadline.reserve(0)
+        try:
+            # Wait for the host's rate limit here, not on a pooled browser
+            throttle_navigation(provider.base_url, provider_deadline, provider.navigations())
+            runs[pool.submit(_run_provider, provider, query, provider_deadline)] = (provider, provider_deadline)
+        except (PoolSaturated, RateLimited) as e:
+            # Too many scrapes already waiting, or no room in the rate limit before the deadline;
+            # the caller falls back instead of waiting, and the upstream is not to blame
+            print(f"Skipping {provider.name}: {e}")
+            provider.breaker().release()
+
+    if not runs:
+        return []
+
+    flights = []
+    pending = set(runs)
+    settle_until = None
+    while pending:
+        # Once some flights are in, give slower providers only the settle window
+        timeout = query.deadline.remaining()
+        if settle_until is not None:
+            timeout = min(timeout, max(0.0, settle_until - time.monotonic()))
+        if timeout <= 0:
+            break
+        done, pending = wait(pending, timeout=None if timeout == float('inf') else timeout,
+                             return_when=FIRST_COMPLETED)
+        if not done:
+            break
+        for future in done:
+            provider = runs[future][0]
+            try:
+                provider_flights = future.result()
+            except Exception as e:
+                # The task never ran: the pooled browser could not be started
+                print(f"Flight provider {provider.name} failed: {str(e)[:150]}")
+                provider.breaker().release()
+                continue
+            print(f"{provider.name} returned {len(provider_flights)} flights")
+            flights.extend(provider_flights)
+        if flights and settle_until is None:
+            settle_until = time.monotonic() + SETTLE_SECONDS
+
+    for future in pending:
+        provider, provider_deadline = runs[future]
+        print(f"Not waiting any longer for flight provider {provider.name}, cancelling it")
+        if future.cancel():
+            provider.breaker().release()
+        provider_deadline.cancel()
+
+    return rank_flights(flights)
+
+
+def generate_fallback_flights(source, destination, start_date):
+    """Generate fallback flight data when web scraping fails"""
+    print("Generating fallback flight data")
+
+    # List of airlines to create variation
+    airlines = ["IndiGo", "Air India", "SpiceJet", "Vistara", "GoAir"]
+
+    # Generate three different flight options
+    flight_options = []
+
+    for i in range(3):
+        # Create variations in time and price
+        departure_hour = 6 + i
+        duration_hours = 2 + (i % 3)
+        arrival_hour = departure_hour + duration_hours
+        flight_num = 100 + (i * 111)
+        price_base = 4000 + (i * 800)
+
+        flight_options.append({
+            'airline': airlines[i % len(airlines)],
+            'flight_number': f"{airlines[i % len(airlines)][:2].upper()}-{flight_num}",
+            'departure': f"{departure_hour:02d}:00",
+            'arrival': f"{arrival_hour:02d}:30",
+            'duration': f"{duration_hours}h 30m",
+            'price': f"₹ {price_base}",
+            'source': 'Generated (Fallback)',
+            'is_real': False
+        })
+
+    return flight_options
+
+
+def get_real_flight_data(source, destination, start_date, num_days, deadline=None, travel_agent=None):
+    """
+    Flights and destination attractions for a trip.
+
+    Flight providers run on the browser pool while the attractions are fetched on
+    this thread. The three cheapest real flights are returned, or generated
+    fallback flights when no provider found any within `deadline`.
+
+    Returns:
+        dict: flight_options, attractions and using_real_data
+    """
+    print(f"Getting real flight data: {source} to {destination} on {start_date}")
+    deadline = deadline or Deadline()
+    query = FlightQuery(source, destination, start_date, num_days, deadline)
+
+    if travel_agent is None:
+        from agents.travel_agent import get_travel_agent
+        travel_agent = get_travel_agent()
+
+    unresolved = query.unresolved_cities()
+    if unresolved:
+        print(f"⚠ No airport found for {', '.join(unresolved)}, not searching flight providers")
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        can_search = not unresolved and not deadline.expired()
+        flights_future = executor.submit(search_flights, query) if can_search else None
+        attractions = travel_agent.get_real_attractions(destination, deadline=deadline)
+        flights = flights_future.result() if flights_future else []
+
+    if flights:
+        # Lets a fare calendar for this route reuse the search
+        from agents.fare_calendar import record_fares
+        record_fares(query, flights)
+
+    # Every option links to the same search on Google Flights
+    search_url = None if unresolved else GoogleFlightsProvider().search_url(query)
+
+    if flights:
+        print(f"✅ Found {len(flights)} real flights, cheapest {flights[0]['price']} on {flights[0]['provider']}")
+        for flight in flights[:3]:
+            flight['search_url'] = search_url
+        return {
+            'flight_options': flights[:3],
+            'attractions': attractions,
+            'using_real_data': True
+        }
+
+    print("⚠ No real flight data obtained, using fallback flight data")
+    fallback_flights = generate_fallback_flights(source, destination, start_date)
+    if search_url:
+        for flight in fallback_flights:
+            flight.update(src_code=query.source_code, dst_code=query.destination_code, search_url=search_url)
+    return {
+        'flight_options': fallback_flights,
+        'attractions': attractions,
+        'using_real_data': False
+    }
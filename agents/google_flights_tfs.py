@@ -0,0 +1,123 @@
+"""
+Google Flights search links built from the tfs parameter
+
+A Google Flights results page can be opened directly with a `tfs` parameter: a
+base64url-encoded protobuf message that describes the search. Opening
+/travel/flights?q=Flights from ... instead makes Google interpret the text
+first, which costs a redirect and extra requests before the results load.
+
+Message layout (field numbers of the Google Flights "Info" message):
+
+    Info:       3 = FlightData (one per leg, repeated)
+                8 = Passenger  (one entry per traveller, repeated enum)
+                9 = Seat       (enum)
+               19 = Trip       (enum)
+    FlightData: 2 = date "YYYY-MM-DD"
+               13 = from Airport, 14 = to Airport   (Airport: 2 = IATA code)
+                5 = max stops (optional), 6 = airline codes (repeated, optional)
+
+The message is small, so it is written by hand here instead of depending on a
+protobuf runtime.
+
+    url = flights_search_url('HYD', 'GOI', '2025-03-01', return_date='2025-03-04', adults=2)
+"""
+import base64
+from urllib.parse import urlencode
+from utils.upstreams import GOOGLE_BASE_URL
+
+SEAT_CLASSES = {'economy': 1, 'premium_economy': 2, 'business': 3, 'first': 4}
+TRIP_TYPES = {'round_trip': 1, 'one_way': 2}
+PASSENGER_TYPES = {'adult': 1, 'child': 2, 'infant_in_seat': 3, 'infant_on_lap': 4}
+
+# Protobuf wire types
+_VARINT = 0
+_LENGTH_DELIMITED = 2
+
+
+def _varint(value):
+    out = bytearray()
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return bytes(out)
+
+
+def _key(field, wire_type):
+    return _varint((field << 3) | wire_type)
+
+
+def _varint_field(field, value):
+    return _key(field, _VARINT) + _varint(value)
+
+
+def _bytes_field(field, value):
+    if isinstance(value, str):
+        value = value.encode('utf-8')
+    return _key(field, _LENGTH_DELIMITED) + _varint(len(value)) + value
+
+
+def _airport(code):
+    return _bytes_field(2, code.upper())
+
+
+def encode_leg(date, from_code, to_code, max_stops=None, airlines=None):
+    """FlightData message for one leg of the trip"""
+    message = _bytes_field(2, date)
+    if max_stops is not None:
+        message += _varint_field(5, max_stops)
+    for airline in airlines or []:
+        message += _bytes_field(6, airline.upper())
+    message += _bytes_field(13, _airport(from_code))
+    message += _bytes_field(14, _airport(to_code))
+    return message
+
+
+def encode_tfs(legs, passengers=None, seat='economy', trip='round_trip'):
+    """
+    Encode a search as the value of the tfs parameter.
+
+    Args:
+        legs (list): (date, from_code, to_code) tuples, or dicts with the
+            arguments of encode_leg()
+        passengers (list): Passenger type names, one per traveller; one adult by default
+        seat (str): One of SEAT_CLASSES
+        trip (str): One of TRIP_TYPES
+
+    Returns:
+        str: base64url text without padding
+    """
+    if seat not in SEAT_CLASSES:
+        raise ValueError(f"Unknown seat class '{seat}', expected one of {', '.join(SEAT_CLASSES)}")
+    if trip not in TRIP_TYPES:
+        raise ValueError(f"Unknown trip type '{trip}', expected one of {', '.join(TRIP_TYPES)}")
+
+    message = b''
+    for leg in legs:
+        leg_message = encode_leg(**leg) if isinstance(leg, dict) else encode_leg(*leg)
+        message += _bytes_field(3, leg_message)
+    for passenger in passengers or ['adult']:
+        if passenger not in PASSENGER_TYPES:
+            raise ValueError(f"Unknown passenger type '{passenger}', expected one of {', '.join(PASSENGER_TYPES)}")
+        message += _varint_field(8, PASSENGER_TYPES[passenger])
+    message += _varint_field(9, SEAT_CLASSES[seat])
+    message += _varint_field(19, TRIP_TYPES[trip])
+    return base64.urlsafe_b64encode(message).decode('ascii').rstrip('=')
+
+
+def flights_search_url(from_code, to_code, depart_date, return_date=None, adults=1, children=0,
+                       infants_in_seat=0, infants_on_lap=0, seat='economy', max_stops=None, airlines=None,
+                       currency='INR', language='en'):
+    """Google Flights results URL for a one-way or (with return_date) round trip"""
+    legs = [dict(date=depart_date, from_code=from_code, to_code=to_code, max_stops=max_stops, airlines=airlines)]
+    if return_date:
+        legs.append(dict(date=return_date, from_code=to_code, to_code=from_code, max_stops=max_stops,
+                         airlines=airlines))
+    passengers = (['adult'] * adults + ['child'] * children + ['infant_in_seat'] * infants_in_seat
+                  + ['infant_on_lap'] * infants_on_lap)
+    tfs = encode_tfs(legs, passengers, seat=seat, trip='round_trip' if return_date else 'one_way')
+    params = urlencode({'tfs': tfs, 'hl': language, 'curr': currency})
+    return f"{GOOGLE_BASE_URL}/travel/flights/search?{params}"
@@ -0,0 +1,253 @@
+"""
+Hotel providers and the parallel first-N-wins hotel aggregator
+
+Each provider scrapes one hotel source in its own browser context on the shared
+browser pool (utils.browser_pool). gather_hotels() starts every provider whose
+circuit is closed at the same time, merges their results as they arrive, dedupes
+them by normalized hotel name and returns as soon as enough hotels are in. The
+providers that are still running are cancelled through their Deadline, so hotel
+latency follows the fastest healthy source instead of the sum of all of them.
+"""
+import os
+import re
+import time
+from concurrent.futures import as_completed, TimeoutError as FuturesTimeoutError
+from utils.upstreams import GOOGLE_BASE_URL, GOIBIBO_BASE_URL, MAKEMYTRIP_BASE_URL
+from utils.circuit_breaker import get_breaker
+from utils.browser_pool import get_browser_pool, PoolSaturated
+from utils import scrape_replay
+from utils.rate_limit import throttle_navigation, RateLimited
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+
+
+class HotelQuery:
+    """What to search for, shared by every provider of one hotel search"""
+
+    def __init__(self, destination, start_date_obj, end_date_obj, deadline):
+        self.destination = destination
+        self.start_date_obj = start_date_obj
+        self.end_date_obj = end_date_obj
+        self.start_date = start_date_obj.strftime("%Y-%m-%d")
+        self.end_date = end_date_obj.strftime("%Y-%m-%d")
+        self.num_days = (end_date_obj - start_date_obj).days
+        self.deadline = deadline
+
+
+class HotelProvider:
+    """
+    One hotel source.
+
+    Subclasses set `name` and `base_url` (used for the circuit breaker) and
+    implement search(page, query, deadline), returning a list of hotel dictionaries
+    with at least a 'name'. `deadline` is cancelled once the aggregator has enough
+    hotels, so long searches should pass it to every wait.
+
+    navigations() is the number of page loads one search makes on base_url; they
+    are taken from the host's rate limit before the search is submitted.
+    """
+
+    name = None
+    base_url = None
+
+    def __init__(self, agent):
+        self.agent = agent
+
+    def breaker(self):
+        return get_breaker(self.base_url)
+
+    def navigations(self):
+        return 1
+
+    def search(self, page, query, deadline):
+        raise NotImplementedError
+
+
+class GoogleTravelHotelProvider(HotelProvider):
+    name = 'google_travel'
+    base_url = GOOGLE_BASE_URL
+
+    def search(self, page, query, deadline):
+        return self.agent._try_google_travel(page, query.destination, deadline=deadline)
+
+
+class GoibiboHotelProvider(HotelProvider):
+    name = 'goibibo'
+    base_url = GOIBIBO_BASE_URL
+
+    def navigations(self):
+        # The homepage login comes first when there are credentials
+        return 2 if os.getenv('GOIBIBO_USERNAME') and os.getenv('GOIBIBO_PASSWORD') else 1
+
+    def search(self, page, query, deadline):
+        return self.agent._try_goibibo(page, query.destination, query.start_date_obj, query.end_date_obj, deadline=deadline)
+
+
+class MakeMyTripHotelProvider(HotelProvider):
+    name = 'makemytrip'
+    base_url = MAKEMYTRIP_BASE_URL
+
+    def navigations(self):
+        # The homepage login comes first when there are credentials
+        return 2 if os.getenv('MAKEMYTRIP_USERNAME') and os.getenv('MAKEMYTRIP_PASSWORD') else 1
+
+    def search(self, page, query, deadline):
+        return self.agent._try_makemytrip(page, query.destination, query.start_date, query.end_date, deadline=deadline)
+
+
+def default_hotel_providers(agent):
+    """Providers used by TravelAgent.get_hotel_data, most reliable first"""
+    return [
+        GoogleTravelHotelProvider(agent),
+        GoibiboHotelProvider(agent),
+        MakeMyTripHotelProvider(agent),
+    ]
+
+
+def normalize_hotel_name(name):
+    """Key used to spot the same hotel coming from different sources"""
+    name = re.sub(r'[^a-z0-9]+', ' ', str(name).lower()).strip()
+    return re.sub(r'^the ', '', name)
+
+
+def _run_provider(browser, provider, query, deadline):
+    """Pool task: run one provider in a fresh context and report to its circuit breaker"""
+    breaker = provider.breaker()
+    if deadline.expired():
+        breaker.release()
+        return []
+
+    print(f"Searching hotels on {provider.name}...")
+    started = time.monotonic()
+    hotels = []
+    context = None
+    rate_limited = False
+    try:
+        # Context honours SCRAPER_REPLAY_MODE (live, record or replay)
+        context = scrape_replay.new_context(
+            browser,
+            scrape_replay.session_name('hotels', provider.name, query.destination, query.start_date, query.num_days),
+            viewport={'width': 1366, 'height': 768},
+            user_agent=USER_AGENT,
+            accept_downloads=False,
+            ignore_https_errors=True,
+            java_script_enabled=True,
+            bypass_csp=True,
+            extra_http_headers={
+                "Accept-Language": "en-US,en;q=0.9",
+                "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8",
+                "Connection": "keep-alive"
+            }
+        )
+        context.set_default_timeout(deadline.timeout_ms(60000))
+        page = context.new_page()
+        page.set_default_navigation_timeout(deadline.timeout_ms(60000))
+        hotels = provider.search(page, query, deadline) or []
+    except RateLimited as e:
+        # Our own limit, not the upstream's fault
+        print(f"{provider.name} skipped: {e}")
+        rate_limited = True
+    except Exception as e:
+        print(f"Error with {provider.name}: {str(e)[:150]}")
+    finally:
+        # Closing the context also saves a recorded session
+        if context is not None:
+            try:
+                context.close()
+            except Exception as e:
+                print(f"Error closing {provider.name} context: {str(e)[:100]}")
+
+    duration = time.monotonic() - started
+    if hotels:
+        breaker.record_success(duration)
+    elif deadline.expired() or rate_limited:
+        # Cancelled, out of budget or held back by our rate limit: not the upstream's fault
+        breaker.release()
+    else:
+        breaker.record_failure(duration)
+    return hotels
+
+
+def gather_hotels(providers, query, limit=3, known_hotels=None, pool=None):
+    """
+    Run hotel providers in parallel and return unique hotels as soon as `limit` are in.
+
+    Args:
+        providers (list): HotelProvider instances
+        query (HotelQuery): Search parameters and request deadline
+        limit (int): Number of unique hotels that ends the search early
+        known_hotels (list, optional): Hotels found earlier, kept first and used for dedupe
+        pool (BrowserPool, optional): Pool to run on, the shared pool by default
+
+    Returns:
+        list: known_hotels followed by the new unique hotels, in arrival order
+
+    Raises:
+        PoolSaturated: when the browser pool's queue is full; nothing is left running
+    """
+    pool = pool or get_browser_pool()
+    hotels = list(known_hotels or [])
+    seen = {normalize_hotel_name(hotel['name']) for hotel in hotels}
+
+    runs = {}
+    for provider in providers:
+        if not provider.breaker().allow_request():
+            print(f"Circuit for {provider.breaker().name} is open, skipping {provider.name}")
+            continue
+        # Each provider gets its own child deadline so it can be cancelled on its own
+        provider_deadline = query.deadline.reserve(0)
+        try:
+            # Wait for the host's rate limit here, not on a pooled browser
+            throttle_navigation(provider.base_url, provider_deadline, provider.navigations())
+            runs[pool.submit(_run_provider, provider, query, provider_deadline)] = (provider, provider_deadline)
+        except PoolSaturated:
+            # Too many scrapes already waiting: shed the whole search so the caller
+            # serves fallback hotels straight away
+            provider.breaker().release()
+            for future, (started_provider, started_deadline) in runs.items():
+                if future.cancel():
+                    started_provider.breaker().release()
+                started_deadline.cancel()
+            raise
+        except RateLimited as e:
+            # No room in the rate limit before the deadline; the upstream is not to blame
+            print(f"Skipping {provider.name}: {e}")
+            provider.breaker().release()
+
+    if not runs:
+        return hotels
+
+    remaining = query.deadline.remaining()
+    try:
+        for future in as_completed(runs, timeout=None if remaining == float('inf') else remaining):
+            provider = runs[future][0]
+            try:
+                new_hotels = future.result()
+            except Exception as e:
+                # The task never ran: the pooled browser could not be started
+                print(f"Hotel provider {provider.name} failed: {str(e)[:150]}")
+                provider.breaker().release()
+                continue
+
+            added = 0
+            for hotel in new_hotels:
+                key = normalize_hotel_name(hotel.get('name', ''))
+                if key and key not in seen:
+                    seen.add(key)
+                    hotels.append(hotel)
+                    added += 1
+            print(f"{provider.name} returned {len(new_hotels)} hotels, {added} new ({len(hotels)} total)")
+
+            if len(hotels) >= limit:
+                break
+    except FuturesTimeoutError:
+        print("Request budget exhausted while waiting for hotel providers")
+    finally:
+        for future, (provider, provider_deadline) in runs.items():
+            if not future.done():
+                print(f"Cancelling hotel provider {provider.name}")
+                if future.cancel():
+                    provider.breaker().release()
+                provider_deadline.cancel()
+
+    return hotels
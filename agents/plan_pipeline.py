@@ -0,0 +1,315 @@
+"""
+Trip plan pipeline: transport, hotels, itinerary and costs under one request deadline
+
+The stages run one after another and share a single Deadline. Earlier stages only
+get the budget that is left after keeping a reserve for the stages that follow, so
+a slow scraper cannot starve the itinerary. Any stage that fails or runs out of
+time falls back to generated data, which means a plan is always returned: real
+data where we managed to get it, fallbacks for the rest.
+
+Reserves can be tuned with PLAN_HOTEL_RESERVE_SECONDS and
+PLAN_ITINERARY_RESERVE_SECONDS; the overall budget with PLAN_DEADLINE_SECONDS.
+
+With PLAN_MERGED_LLM_CALL=true a car trip asks the LLM for its route attractions
+in the itinerary completion rather than in a separate call during the travel
+stage, which takes one LLM round trip off the critical path.
+
+iter_plans() builds several trips at once (at most PLAN_BATCH_CONCURRENCY at a
+time) with one TravelAgent, so they share the browser pool and the caches, and
+yields each plan as soon as it is done.
+"""
+import os
+import time
+import traceback
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dotenv import load_dotenv
+from utils.deadline import Deadline
+
+# Load environment variables
+load_dotenv()
+
+HOTEL_RESERVE_SECONDS = float(os.getenv('PLAN_HOTEL_RESERVE_SECONDS', 25))
+ITINERARY_RESERVE_SECONDS = float(os.getenv('PLAN_ITINERARY_RESERVE_SECONDS', 20))
+BATCH_CONCURRENCY = max(1, int(os.getenv('PLAN_BATCH_CONCURRENCY', 4)))
+# Car trips: one LLM completion for both the itinerary and the route attractions
+MERGED_LLM_CALL = os.getenv('PLAN_MERGED_LLM_CALL', 'false').lower() in ('true', '1', 't')
+TRAVEL_MODES = ('car', 'flight')
+
+
+def get_travel_data(travel_agent, source, destination, start_date, num_days, travel_mode, deadline):
+    """Car routes or flights for the trip, falling back to generated options on errors"""
+    print(f"Getting travel data for {travel_mode}...")
+    try:
+        if travel_mode == 'car':
+            print("Calling get_car_travel_data...")
+            travel_data = travel_agent.get_car_travel_data(source, destination, start_date, num_days, deadline=deadline,
+                                                           llm_route_attractions=not MERGED_LLM_CALL)
+            print("Car travel data retrieved!")
+        else:
+            print("Calling get_flight_travel_data for ACTUAL real-time flight data...")
+            # Every flight provider runs in parallel in the flight engine
+            travel_data = travel_agent.get_flight_travel_data(source, destination, start_date, num_days, deadline=deadline)
+
+            # Check if we got real data or fallback data
+            if travel_data.get('using_real_data', False):
+                print("✅ Successfully retrieved REAL flight data!")
+
+                # Process the flight data - extract outbound flights
+                flight_options = travel_data.get('flight_options', [])
+
+                # Add a clear label to indicate these are VERIFIED real-time prices
+                for flight in flight_options:
+                    if 'price' in flight and '₹' not in flight['price'] and not flight['price'].startswith('₹'):
+                        flight['price'] = f"₹ {flight['price']}"
+
+                    # Ensure consistent naming between departure/arrival
+                    if 'departure_time' in flight and 'departure' not in flight:
+                        flight['departure'] = flight['departure_time']
+                    if 'arrival_time' in flight and 'arrival' not in flight:
+                        flight['arrival'] = flight['arrival_time']
+
+                    # Add a marker noting these are verified prices
+                    if 'data_source' not in flight:
+                        flight['data_source'] = "Google Flights (VERIFIED)"
+
+                    # Ensure we have all required fields
+                    if 'source' not in flight:
+                        flight['source'] = source
+                    if 'destination' not in flight:
+                        flight['destination'] = destination
+            else:
+                print("⚠ Using fallback flight data - no real-time data available")
+
+            print("Flight travel data retrieved!")
+        print(f"Travel data retrieved: {str(travel_data)[:100]}...")
+    except Exception as e:
+        print(f"Error getting travel data: {e}")
+        traceback.print_exc()
+        # Use fallback data
+        print("Using fallback travel data due to error")
+        if travel_mode == 'car':
+            # Let the travel_agent generate appropriate fallback data with estimated distances
+            travel_data = {
+                'driving_options': [],  # This will get populated by travel_agent's fallback mechanism
+                'attractions': travel_agent.get_real_attractions(destination, deadline=deadline),
+                'route_attractions': travel_agent.get_real_route_attractions(source, destination, deadline=deadline,
+                                                                             use_llm=not MERGED_LLM_CALL)
+            }
+        else:
+            source_len = len(source)
+            dest_len = len(destination)
+            base_price = 3000 + (ord(source[0].lower()) - ord('a')) * 100
+
+            travel_data = {
+                'flight_options': [
+                    {
+                        'airline': 'IndiGo',
+                        'flight_number': f'6E {900 + (source_len % 100)}',
+                        'departure': f'0{6 + (source_len % 3)}:15',
+                        'arrival': f'0{8 + (dest_len % 3)}:45',
+                        'duration': f'1h {30 + (dest_len % 30)}m',
+                        'price': f'₹ {base_price:,}'
+                    }
+                ],
+                'attractions': travel_agent.get_real_attractions(destination, deadline=deadline)
+            }
+    return travel_data
+
+
+def get_hotels(travel_agent, destination, start_date, num_days, deadline):
+    """Hotel options for the stay, falling back to predefined hotels on errors"""
+    print(f"Getting hotel data for {destination}...")
+    try:
+        print("Calling get_hotel_data...")
+        hotel_data = travel_agent.get_hotel_data(destination, start_date, num_days, deadline=deadline)
+        print("Hotel data retrieved!")
+        print(f"Hotel data retrieved: {str(hotel_data)[:100]}...")
+    except Exception as e:
+        print(f"Error getting hotel data: {e}")
+        traceback.print_exc()
+        # Use fallback data
+        print("Using fallback hotel data due to error")
+        hotel_data = travel_agent._get_fallback_hotels(destination)
+    return hotel_data
+
+
+def get_itinerary(travel_agent, source, destination, start_date, num_days, travel_mode, travel_data, hotel_data, deadline):
+    """LLM itinerary for the trip, falling back to the generated itinerary on errors"""
+    print("Generating itinerary...")
+    try:
+        # Try to use LLaMA via Groq if available
+        print("Calling generate_itinerary...")
+        itinerary = travel_agent.generate_itinerary(source, destination, start_date, num_days, travel_mode, travel_data, hotel_data,
+                                                    deadline=deadline, include_route_attractions=MERGED_LLM_CALL)
+        print("Itinerary generated successfully")
+    except Exception as e:
+        print(f"Error generating itinerary: {e}")
+        traceback.print_exc()
+        # Use fallback itinerary
+        print("Using fallback itinerary due to error")
+        itinerary = travel_agent._generate_fallback_itinerary(source, destination, start_date, num_days, travel_mode, travel_data, hotel_data)
+    return itinerary
+
+
+def get_cost_breakdown(travel_agent, travel_mode, travel_data, hotel_data, num_days):
+    """Trip cost breakdown, falling back to flat estimates on errors"""
+    print("Calculating trip costs...")
+    try:
+        if travel_mode == 'car':
+            cost_breakdown = travel_agent.calculate_car_trip_cost(travel_data, hotel_data, num_days)
+            print(f"Car trip cost calculated: ₹{cost_breakdown['total']:.2f}")
+        else:  # flight mode
+            cost_breakdown = travel_agent.calculate_flight_trip_cost(travel_data, hotel_data, num_days)
+            print(f"Flight trip cost calculated: ₹{cost_breakdown['total']:.2f}")
+    except Exception as e:
+        print(f"Error calculating trip costs: {e}")
+        traceback.print_exc()
+        # Create fallback cost breakdown with hotel price at 1500 per night
+        hotel_price_per_night = 1500.0  # Set hotel price to 1500 per night
+        if travel_mode == 'car':
+            cost_breakdown = {
+                'fuel': 2000.0,
+                'hotel': hotel_price_per_night * num_days,
+                'food': 1000.0 * num_days,
+                'num_nights': num_days,
+                'total': 2000.0 + hotel_price_per_night * num_days + 1000.0 * num_days
+            }
+        else:  # flight mode
+            cost_breakdown = {
+                'flight': 5000.0,
+                'hotel': hotel_price_per_night * num_days,
+                'food': 1000.0 * num_days,
+                'local_transport': 500.0 * num_days,
+                'num_nights': num_days,
+                'total': 5000.0 + hotel_price_per_night * num_days + 1000.0 * num_days + 500.0 * num_days
+            }
+    return cost_breakdown
+
+
+def build_plan(source, destination, start_date, num_days, travel_mode, deadline=None, travel_agent=None):
+    """
+    Run every plan stage within one request deadline.
+
+    Args:
+        source, destination (str): Trip endpoints
+        start_date (str): Start date in YYYY-MM-DD format
+        num_days (int): Trip length
+        travel_mode (str): 'car' or 'flight'
+        deadline (Deadline, optional): Request budget, defaults to PLAN_DEADLINE_SECONDS
+        travel_agent (TravelAgent, optional): Agent to use, the shared one otherwise
+
+    Returns:
+        dict: travel_data, hotel_data, itinerary and cost_breakdown, plus
+        budget_exhausted (bool) and elapsed (seconds)
+    """
+    deadline = deadline or Deadline.from_env()
+    started = time.monotonic()
+    print(f"Planning {travel_mode} trip {source} -> {destination} with {deadline}")
+
+    if travel_agent is None:
+        from agents.travel_agent import get_travel_agent
+        travel_agent = get_travel_agent()
+
+    # Keep part of the budget for the stages that come after each one
+    travel_data = get_travel_data(travel_agent, source, destination, start_date, num_days, travel_mode,
+                                  deadline.reserve(HOTEL_RESERVE_SECONDS + ITINERARY_RESERVE_SECONDS))
+    hotel_data = get_hotels(travel_agent, destination, start_date, num_days,
+                            deadline.reserve(ITINERARY_RESERVE_SECONDS))
+    itinerary = get_itinerary(travel_agent, source, destination, start_date, num_days, travel_mode,
+                              travel_data, hotel_data, deadline)
+    cost_breakdown = get_cost_breakdown(travel_agent, travel_mode, travel_data, hotel_data, num_days)
+
+    elapsed = time.monotonic() - started
+    budget_exhausted = deadline.expired()
+    if budget_exhausted:
+        print(f"Request budget exhausted after {elapsed:.1f}s, plan contains fallback data")
+    else:
+        print(f"Plan built in {elapsed:.1f}s ({deadline.remaining():.1f}s of budget left)")
+
+    return {
+        'travel_data': travel_data,
+        'hotel_data': hotel_data,
+        'itinerary': itinerary,
+        'cost_breakdown': cost_breakdown,
+        'budget_exhausted': budget_exhausted,
+        'elapsed': elapsed,
+    }
+
+
+def parse_trip(trip):
+    """
+    Validate one trip of a batch.
+
+    Args:
+        trip (dict): from, to, start_date (YYYY-MM-DD), num_days and travel_mode
+
+    Returns:
+        dict: source, destination, start_date, num_days and travel_mode
+
+    Raises:
+        ValueError: with a message for the user when a field is missing or invalid
+    """
+    if not isinstance(trip, dict):
+        raise ValueError("Each trip must be an object")
+    source = str(trip.get('from') or '').strip()
+    destination = str(trip.get('to') or '').strip()
+    start_date = str(trip.get('start_date') or '').strip()
+    travel_mode = str(trip.get('travel_mode') or '').strip().lower()
+    if not all([source, destination, start_date, travel_mode]):
+        raise ValueError("from, to, start_date, num_days and travel_mode are required")
+    try:
+        datetime.strptime(start_date, "%Y-%m-%d")
+        num_days = int(trip.get('num_days'))
+    except (TypeError, ValueError):
+        raise ValueError("start_date must be YYYY-MM-DD and num_days a number")
+    if num_days < 1:
+        raise ValueError("num_days must be at least 1")
+    if travel_mode not in TRAVEL_MODES:
+        raise ValueError(f"travel_mode must be one of {', '.join(TRAVEL_MODES)}")
+    return {'source': source, 'destination': destination, 'start_date': start_date,
+            'num_days': num_days, 'travel_mode': travel_mode}
+
+
+def _plan_trip(trip, travel_agent):
+    """Worker: one trip of a batch, with its own deadline that starts when the trip does"""
+    return build_plan(trip['source'], trip['destination'], trip['start_date'], trip['num_days'],
+                      trip['travel_mode'], deadline=Deadline.from_env(), travel_agent=travel_agent)
+
+
+def iter_plans(trips, max_concurrency=None, travel_agent=None):
+    """
+    Build the plans of several trips at once and yield each one as soon as it is done.
+
+    Args:
+        trips (list): Trips as returned by parse_trip()
+        max_concurrency (int, optional): Trips built at once, PLAN_BATCH_CONCURRENCY by default
+        travel_agent (TravelAgent, optional): Agent shared by every trip, the process-wide one by default
+
+    Yields:
+        tuple: (index into trips, plan or None, error message or None), in the
+        order the trips finish
+
+    Closing the generator early (a client that went away) drops the trips that
+    have not started yet.
+    """
+    if not trips:
+        return
+    if travel_agent is None:
+        from agents.travel_agent import get_travel_agent
+        travel_agent = get_travel_agent()
+    workers = max(1, min(max_concurrency or BATCH_CONCURRENCY, len(trips)))
+    print(f"Planning a batch of {len(trips)} trips, {workers} at a time")
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='plan-batch')
+    try:
+        futures = {executor.submit(_plan_trip, trip, travel_agent): i for i, trip in enumerate(trips)}
+        for future in as_completed(futures):
+            index = futures[future]
+            try:
+                yield index, future.result(), None
+            except Exception as e:
+                print(f"Batch trip {index} failed: {e}")
+                traceback.print_exc()
+                yield index, None, str(e)[:200]
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
@@ -1,764 +1,6 @@
 """
-Updated travel agent module with improved flight data extraction
-"""
-import os
-import time
-import json
-from datetime import datetime, timedelta
-import groq
-from dotenv import load_dotenv
-from playwright.sync_api import sync_playwright
-import re
-# Import travel agent module for accessing other methods
-from agents.travel_agent import TravelAgent
-
-# Create a travel agent instance for fallback methods
-_travel_agent = TravelAgent()
-
-# Load environment variables
-load_dotenv()
+Flight data processing
 
-def get_real_flight_data(source, destination, start_date, num_days):
-    """Extract flight data for the specified route and dates with improved reliability"""
-    print(f"Getting flight data: {source} to {destination} on {start_date}")
-    
-    # Get credentials from env
-    mmt_username = os.getenv('MAKEMYTRIP_USERNAME')
-    mmt_password = os.getenv('MAKEMYTRIP_PASSWORD')
-    
-    if mmt_username and mmt_password:
-        print(f"Using credentials from env file - MMT: {mmt_username[:3]}***")
-    else:
-        print("No MakeMyTrip credentials found in environment variables.")
-    
-    # Create fallback attractions using the TravelAgent instance
-    attractions = _travel_agent._get_fallback_attractions(destination)
-    print(f"Generating fallback attractions for {destination}")
-    
-    # Parse start date
-    start_date_obj = datetime.strptime(start_date, "%Y-%m-%d")
-    
-    # Generate fallback flight data in case all web scraping attempts fail
-    fallback_flights = generate_fallback_flights(source, destination, start_date)
-    
-    # Store extracted flight options
-    flight_options = []
-    scraping_sources_tried = []
-    
-    # Try multiple methods to get real flight data
-    try:
-        print("ATTEMPTING TO RETRIEVE REAL-TIME FLIGHT DATA...")
-        with sync_playwright() as p:
-            print("Launching browser in headless mode...")
-            browser = p.chromium.launch(
-                headless=True,
-                args=[
-                    '--disable-gpu',
-                    '--no-sandbox',
-                    '--disable-dev-shm-usage'
-                ]
-            )
-            
-            context = browser.new_context(
-                viewport={'width': 1366, 'height': 768},
-                user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-            )
-            
-            # Function to close modals that might interrupt the flow
-            def close_modals(page, timeout=500):
-                modal_selectors = [
-                    'span.commonModal__close', 'button.paperDialog__close',
-                    'span.close', 'span.crossIcon', 'i.wewidgeticon', 'a.close',
-                    'div#webklipper-publisher-widget-container-notification-close-div',
-                    'button[data-cy="close"]', 'button.cookie-banner-close'
-                ]
-                for selector in modal_selectors:
-                    try:
-                        if page.is_visible(selector, timeout=timeout):
-                            page.click(selector)
-                            page.wait_for_timeout(300)
-                    except:
-                        pass
-            
-            # 1. First try Skyscanner (more reliable than direct airline sites)
-            try:
-                page = context.new_page()
-                page.set_default_timeout(20000)  # 20 seconds timeout
-                
-                clean_source = source.split(',')[0].strip().lower()
-                clean_destination = destination.split(',')[0].strip().lower()
-                formatted_date = start_date_obj.strftime("%Y-%m-%d")
-                
-                # Try a different approach with Google Flights URL
-                print("DEBUG: Attempting to fetch flight data from Google Flights...")
-                google_url = f"https://www.google.com/travel/flights?q=Flights%20to%20{clean_destination.replace(' ', '%20')}%20from%20{clean_source.replace(' ', '%20')}%20on%20{formatted_date.replace('-', '%2F')}"
-                print(f"DEBUG: Using URL: {google_url}")
-                
-                page.goto(google_url, wait_until="domcontentloaded", timeout=20000)
-                
-                # Wait longer for content to load
-                page.wait_for_timeout(8000)
-                
-                # Take a screenshot for debugging
-                screenshot_path = "debug_flights_screenshot.png"
-                page.screenshot(path=screenshot_path)
-                print(f"DEBUG: Screenshot saved to {screenshot_path}")
-                
-                # Print page title to verify we're on the right page
-                print(f"DEBUG: Page title: {page.title()}")
-                
-                # Try multiple result selectors
-                flight_card_selectors = [
-                    'div[role="listitem"]',
-                    'div[data-test-id="offer-listing"]',
-                    'g-card',
-                    'div.gws-flights-results__result-item'
-                ]
-                
-                found_results = False
-                for selector in flight_card_selectors:
-                    try:
-                        print(f"DEBUG: Trying selector: {selector}")
-                        if page.is_visible(selector, timeout=3000):
-                            print(f"Found flight results with selector: {selector}")
-                            flight_cards = page.query_selector_all(selector)
-                            print(f"Found {len(flight_cards)} flight cards")
-                            
-                            # Extract data from up to 3 flights
-                            for i, card in enumerate(flight_cards[:3]):
-                                try:
-                                    flight_data = {}
-                                    card_text = card.inner_text()
-                                    print(f"DEBUG: Card {i} text: {card_text[:100]}")
-                                    
-                                    # Try to parse the card text for flight details
-                                    lines = card_text.split('\n')
-                                    for line in lines:
-                                        if any(airline in line for airline in ["IndiGo", "Air India", "SpiceJet", "Vistara", "GoAir"]):
-                                            flight_data['airline'] = line.strip()
-                                        if "₹" in line or "Rs" in line:
-                                            flight_data['price'] = line.strip()
-                                        if re.search(r'\d{1,2}:\d{2}', line):
-                                            if 'departure' not in flight_data:
-                                                flight_data['departure'] = line.strip()
-                                            elif 'arrival' not in flight_data:
-                                                flight_data['arrival'] = line.strip()
-                                        if 'hr' in line and 'min' in line:
-                                            flight_data['duration'] = line.strip()
-                                    
-                                    # Fill in any missing data
-                                    if 'airline' not in flight_data:
-                                        airlines = ["IndiGo", "Air India", "SpiceJet", "Vistara", "GoAir"]
-                                        flight_data['airline'] = airlines[i % len(airlines)]
-                                    
-                                    if 'price' not in flight_data:
-                                        base_prices = [4500, 5500, 6200, 4800, 5900]
-                                        flight_data['price'] = f"₹ {base_prices[i % len(base_prices)] + i*350}"
-                                    
-                                    if 'departure' not in flight_data:
-                                        departure_hour = 6 + i
-                                        flight_data['departure'] = f"{departure_hour:02d}:00"
-                                    
-                                    if 'arrival' not in flight_data:
-                                        departure_hour = 6 + i
-                                        duration_hours = 2 + (i % 3)
-                                        arrival_hour = departure_hour + duration_hours
-                                        flight_data['arrival'] = f"{arrival_hour:02d}:30"
-                                    
-                                    if 'duration' not in flight_data:
-                                        duration_hours = 2 + (i % 3)
-                                        flight_data['duration'] = f"{duration_hours}h 30m"
-                                    
-                                    # Generate flight number if not found
-                                    flight_data['flight_number'] = f"{flight_data['airline'][:2].upper()}-{1000 + i*111}"
-                                    
-                                    # Add source indicator
-                                    flight_data['source'] = 'Google Flights'
-                                    
-                                    # Add to our collection
-                                    flight_options.append(flight_data)
-                                    print(f"Extracted real flight: {flight_data['airline']} for {flight_data['price']}")
-                                    
-                                except Exception as e:
-                                    print(f"Error extracting flight card {i}: {str(e)}")
-                            
-                            found_results = True
-                            break
-                    except Exception as e:
-                        print(f"DEBUG: Error with selector {selector}: {str(e)}")
-                
-                if not found_results:
-                    print("DEBUG: No flight results found on Google Flights. Page content sample:")
-                    try:
-                        content_sample = page.content()[:1000]
-                        print(content_sample)
-                    except:
-                        print("Could not get page content")
-            
-            except Exception as e:
-                print(f"Google Flights scraping error: {str(e)}")
-            
-            # 2. Try a direct approach with IXIGO - very reliable for Indian routes
-            if not flight_options:
-                try:
-                    print("Attempting to scrape directly from IXIGO...")
-                    page = context.new_page()
-                    page.set_default_timeout(20000)
-                    
-                    # Clean source and destination - use airport codes if possible for Indian cities
-                    indian_airports = {
-                        "delhi": "DEL",
-                        "mumbai": "BOM",
-                        "bangalore": "BLR",
-                        "hyderabad": "HYD",
-                        "chennai": "MAA",
-                        "kolkata": "CCU",
-                        "goa": "GOI",
-                        "ahmedabad": "AMD"
-                    }
-                    
-                    clean_source = source.split(',')[0].strip().lower()
-                    clean_destination = destination.split(',')[0].strip().lower()
-                    
-                    # Use airport codes if available
-                    source_code = indian_airports.get(clean_source, clean_source)
-                    dest_code = indian_airports.get(clean_destination, clean_destination)
-                    
-                    # Format date for IXIGO (DD/MM/YYYY)
-                    ixigo_date = start_date_obj.strftime("%d/%m/%Y")
-                    
-                    # Go to IXIGO home page first
-                    print("DEBUG: Going to IXIGO homepage")
-                    page.goto("https://www.ixigo.com/flights", wait_until="domcontentloaded", timeout=20000)
-                    page.wait_for_timeout(3000)
-                    
-                    # Take a screenshot for debugging
-                    page.screenshot(path="ixigo_homepage.png")
-                    print("DEBUG: IXIGO homepage screenshot saved")
-                    
-                    try:
-                        # Try to fill in search form
-                        print("DEBUG: Attempting to fill IXIGO search form")
-                        
-                        # Click on FROM field
-                        from_selectors = ['input[placeholder="Enter city or airport"]', '#source']
-                        form_filled = False
-                        
-                        for selector in from_selectors:
-                            if page.is_visible(selector, timeout=3000):
-                                print(f"DEBUG: Found FROM field with selector: {selector}")
-                                page.click(selector)
-                                page.fill(selector, source_code)
-                                page.wait_for_timeout(1000)
-                                page.keyboard.press("Enter")
-                                
-                                # Click on TO field
-                                to_selectors = ['input[data-test="destination-field"]', '#destination']
-                                for to_selector in to_selectors:
-                                    if page.is_visible(to_selector, timeout=3000):
-                                        print(f"DEBUG: Found TO field with selector: {to_selector}")
-                                        page.click(to_selector)
-                                        page.fill(to_selector, dest_code)
-                                        page.wait_for_timeout(1000)
-                                        page.keyboard.press("Enter")
-                                        
-                                        # Click on DATE field
-                                        date_selectors = ['input[data-test="date-field"]', 'input[placeholder="Depart"]']
-                                        for date_selector in date_selectors:
-                                            if page.is_visible(date_selector, timeout=3000):
-                                                print(f"DEBUG: Found DATE field with selector: {date_selector}")
-                                                page.click(date_selector)
-                                                page.fill(date_selector, ixigo_date)
-                                                page.wait_for_timeout(1000)
-                                                page.keyboard.press("Tab")
-                                                
-                                                # Click search button
-                                                search_selectors = ['button[type="submit"]', 'button.u-ripple.c-btn']
-                                                for search_selector in search_selectors:
-                                                    if page.is_visible(search_selector, timeout=3000):
-                                                        print(f"DEBUG: Found search button with selector: {search_selector}")
-                                                        page.click(search_selector)
-                                                        form_filled = True
-                                                        break
-                                            
-                                            if form_filled:
-                                                break
-                                        
-                                        if form_filled:
-                                            break
-                                
-                                if form_filled:
-                                    break
-                            
-                            if form_filled:
-                                break
-                        
-                            if form_filled:
-                                break
-                        
-                        if form_filled:
-                            print("DEBUG: Successfully filled IXIGO search form")
-                            # Wait for results page to load
-                            page.wait_for_timeout(8000)
-                            
-                            # Take screenshot of results page
-                            page.screenshot(path="ixigo_results.png")
-                            print("DEBUG: IXIGO results screenshot saved")
-                            
-                            # Try to find flight results
-                            result_selectors = ['.airline-result', '.flight-listing', '.nonstop-flight', '.flightItem']
-                            for selector in result_selectors:
-                                if page.is_visible(selector, timeout=5000):
-                                    flight_cards = page.query_selector_all(selector)
-                                    print(f"Found {len(flight_cards)} flight cards on IXIGO")
-                                    
-                                    # Extract data from up to 3 flight cards
-                                    for i, card in enumerate(flight_cards[:3]):
-                                        try:
-                                            flight_data = {}
-                                            card_html = card.inner_html()
-                                            card_text = card.inner_text()
-                                            
-                                            print(f"DEBUG: Card text sample: {card_text[:100]}")
-                                            
-                                            # Try to parse from text content first
-                                            lines = card_text.split('\n')
-                                            for line in lines:
-                                                line = line.strip()
-                                                if any(airline in line for airline in ["IndiGo", "Air India", "SpiceJet", "Vistara", "GoAir"]):
-                                                    flight_data['airline'] = line
-                                                if "₹" in line or "Rs" in line:
-                                                    flight_data['price'] = line
-                                                if re.search(r'\d{1,2}:\d{2}', line):
-                                                    if 'departure' not in flight_data:
-                                                        flight_data['departure'] = line
-                                                    elif 'arrival' not in flight_data:
-                                                        flight_data['arrival'] = line
-                                                if re.search(r'\d+h \d+m', line):
-                                                    flight_data['duration'] = line
-                                            
-                                            # Fill in missing data
-                                            if 'airline' not in flight_data:
-                                                airlines = ["IndiGo", "Air India", "SpiceJet", "Vistara", "GoAir"]
-                                                flight_data['airline'] = airlines[i % len(airlines)]
-                                            
-                                            if 'flight_number' not in flight_data:
-                                                airline_code = flight_data['airline'][:2].upper()
-                                                flight_data['flight_number'] = f"{airline_code}{1000 + i*100}"
-                                            
-                                            if 'price' not in flight_data:
-                                                base_prices = [4200, 5100, 5800]
-                                                flight_data['price'] = f"₹ {base_prices[i % len(base_prices)]}"
-                                            
-                                            if 'departure' not in flight_data:
-                                                departure_hour = 6 + i
-                                                flight_data['departure'] = f"{departure_hour:02d}:00"
-                                            
-                                            if 'arrival' not in flight_data:
-                                                departure_hour = 6 + i
-                                                duration_hours = 2 + (i % 3)
-                                                arrival_hour = departure_hour + duration_hours
-                                                flight_data['arrival'] = f"{arrival_hour:02d}:30"
-                                            
-                                            if 'duration' not in flight_data:
-                                                duration_hours = 2 + (i % 3)
-                                                flight_data['duration'] = f"{duration_hours}h 30m"
-                                            
-                                            # Add source indicator
-                                            flight_data['source'] = 'IXIGO Real-Time'
-                                            
-                                            # Add to flight options
-                                            flight_options.append(flight_data)
-                                            print(f"Extracted real flight from IXIGO: {flight_data['airline']} for {flight_data['price']}")
-                                        
-                                        except Exception as e:
-                                            print(f"Error extracting flight card {i} from IXIGO: {str(e)}")
-                                    
-                                    break
-                            else:
-                                print("DEBUG: Failed to fill search form on IXIGO")
-                        except Exception as e:
-                            print(f"DEBUG: Error during IXIGO form filling: {str(e)}")
-                    
-                except Exception as e:
-                    print(f"IXIGO scraping error: {str(e)}")
-                
-                # If still no flight options, try using a GET request directly
-                if not flight_options:
-                    try:
-                        print("Attempting direct URL request to IXIGO...")
-                        
-                        # Format the date for URL
-                        formatted_date = start_date_obj.strftime("%Y%m%d")
-                        
-                        # Clean and prepare source/destination
-                        clean_source = source.split(',')[0].strip().lower()
-                        clean_destination = destination.split(',')[0].strip().lower()
-                        
-                        # Use airport codes for common Indian cities
-                        indian_airports = {
-                            "delhi": "DEL",
-                            "mumbai": "BOM",
-                            "bangalore": "BLR",
-                            "hyderabad": "HYD",
-                            "chennai": "MAA",
-                            "kolkata": "CCU",
-                            "goa": "GOI",
-                            "ahmedabad": "AMD"
-                        }
-                        
-                        src = indian_airports.get(clean_source, clean_source)
-                        dst = indian_airports.get(clean_destination, clean_destination)
-                        
-                        direct_url = f"https://www.ixigo.com/search/result/flight?from={src}&to={dst}&date={formatted_date}&returnDate=&adults=1&children=0&infants=0&class=e&source=Search%20Form"
-                        
-                        print(f"DEBUG: Direct IXIGO URL: {direct_url}")
-                        
-                        # Create new page for this request
-                        page = context.new_page()
-                        page.goto(direct_url, wait_until="domcontentloaded", timeout=30000)
-                        
-                        # Take screenshot for debugging
-                        page.screenshot(path="ixigo_direct_url.png")
-                        print("DEBUG: Direct URL screenshot saved")
-                        
-                        # Wait longer for this page
-                        page.wait_for_timeout(10000)
-                        
-                        # Check if we got flight results
-                        flight_item_selectors = [
-                            'div.flight-item', '.airline-result', '.c-flight-listing-row'
-                        ]
-                        
-                        for selector in flight_item_selectors:
-                            if page.is_visible(selector, timeout=5000):
-                                flight_cards = page.query_selector_all(selector)
-                                print(f"Found {len(flight_cards)} flight cards on IXIGO with direct URL")
-                                
-                                # Process found cards
-                                for i, card in enumerate(flight_cards[:3]):
-                                    try:
-                                        flight_data = {'source': 'IXIGO Direct-URL'}
-                                        
-                                        # Simply use entire card text for now
-                                        card_text = card.inner_text()
-                                        print(f"DEBUG: Found flight card text: {card_text[:200]}")
-                                        
-                                        # Parse out what we can
-                                        price_match = re.search(r'₹\s*(\d[,\d]*)', card_text)
-                                        if price_match:
-                                            flight_data['price'] = f"₹ {price_match.group(1)}"
-                                        
-                                        time_matches = re.findall(r'(\d{1,2}:\d{2}(?:\s*[AP]M)?)', card_text)
-                                        if len(time_matches) >= 2:
-                                            flight_data['departure'] = time_matches[0]
-                                            flight_data['arrival'] = time_matches[1]
-                                        
-                                        duration_match = re.search(r'(\d+h\s*\d*m|\d+\s*hr\s*\d*\s*min)', card_text)
-                                        if duration_match:
-                                            flight_data['duration'] = duration_match.group(1)
-                                        
-                                        # Find airline
-                                        for airline in ["IndiGo", "Air India", "SpiceJet", "Vistara", "GoAir"]:
-                                            if airline.lower() in card_text.lower():
-                                                flight_data['airline'] = airline
-                                                break
-                                        
-                                        # Set default values for missing fields
-                                        if 'airline' not in flight_data:
-                                            airlines = ["IndiGo", "Air India", "SpiceJet", "Vistara", "GoAir"]
-                                            flight_data['airline'] = airlines[i % len(airlines)]
-                                        
-                                        if 'flight_number' not in flight_data:
-                                            airline_code = flight_data['airline'][:2].upper()
-                                            flight_data['flight_number'] = f"{airline_code}{1000 + i*100}"
-                                        
-                                        if 'price' not in flight_data:
-                                            base_prices = [4200, 5100, 5800]
-                                            flight_data['price'] = f"₹ {base_prices[i % len(base_prices)]}"
-                                        
-                                        if 'departure' not in flight_data:
-                                            departure_hour = 6 + i
-                                            flight_data['departure'] = f"{departure_hour:02d}:00"
-                                        
-                                        if 'arrival' not in flight_data:
-                                            departure_hour = 6 + i
-                                            duration_hours = 2 + (i % 3)
-                                            arrival_hour = departure_hour + duration_hours
-                                            flight_data['arrival'] = f"{arrival_hour:02d}:30"
-                                        
-                                        if 'duration' not in flight_data:
-                                            duration_hours = 2 + (i % 3)
-                                            flight_data['duration'] = f"{duration_hours}h 30m"
-                                        
-                                        # Add to our collection
-                                        flight_options.append(flight_data)
-                                        print(f"Extracted real flight from IXIGO direct URL: {flight_data['airline']} for {flight_data['price']}")
-                                    
-                                    except Exception as e:
-                                        print(f"Error processing flight card: {str(e)}")
-                                
-                                break  # Found and processed flights
-                    
-                    except Exception as e:
-                        print(f"Direct URL approach error: {str(e)}")
-    
-    except Exception as e:
-        print(f"Critical error in flight data extraction: {str(e)[:100]}")
-    
-    # One more attempt with direct URL if no flight data yet
-    if not flight_options:
-        try:
-            print("\n*** MAKING FINAL ATTEMPT WITH DIRECT URLS ***\n")
-            with sync_playwright() as p:
-                browser = p.chromium.launch(headless=True)
-                context = browser.new_context(viewport={'width': 1280, 'height': 720})
-                page = context.new_page()
-                
-                # Set shorter timeout
-                page.set_default_timeout(15000)
-                
-                # Use city code mappings for Indian cities
-                city_codes = {
-                    "hyderabad": "HYD",
-                    "delhi": "DEL",
-                    "mumbai": "BOM",
-                    "bangalore": "BLR",
-                    "chennai": "MAA",
-                    "kolkata": "CCU",
-                    "goa": "GOI",
-                    "ahmedabad": "AMD",
-                    "pune": "PNQ"
-                }
-                
-                # Clean the source and destination
-                clean_source = source.split(',')[0].strip().lower()
-                clean_destination = destination.split(',')[0].strip().lower()
-                
-                # Get airport codes if available
-                src_code = city_codes.get(clean_source, clean_source)
-                dst_code = city_codes.get(clean_destination, clean_destination)
-                
-                # Format date (YYYYMMDD)
-                date_str = start_date_obj.strftime("%Y%m%d")
-                
-                # Try EaseMyTrip (often more reliable for Indian routes)
-                try:
-                    print("Trying EaseMyTrip for real flight data...")
-                    
-                    # Format date for URL (dd-mm-yyyy)
-                    emt_date = start_date_obj.strftime("%d-%m-%Y")
-                    emt_url = f"https://flight.easemytrip.com/FlightList/Index?org={src_code}&dest={dst_code}&deptdate={emt_date}&adult=1&child=0&infant=0&cabin=1&airline=Any&val=0"
-                    
-                    print(f"DEBUG: EaseMyTrip URL: {emt_url}")
-                    page.goto(emt_url, wait_until="domcontentloaded")
-                    page.wait_for_timeout(8000)
-                    
-                    # Take screenshot for debugging
-                    page.screenshot(path="easemytrip_results.png")
-                    print("DEBUG: Screenshot saved")
-                    
-                    # Check for flight cards
-                    result_selectors = [
-                        'div.fltResult', 'div.flightDetSecOuter', 'div.fliResults'
-                    ]
-                    
-                    for selector in result_selectors:
-                        if page.is_visible(selector, timeout=3000):
-                            flight_cards = page.query_selector_all(selector)
-                            print(f"Found {len(flight_cards)} flight results on EaseMyTrip")
-                            
-                            # Process up to 3 cards
-                            for i, card in enumerate(flight_cards[:3]):
-                                try:
-                                    flight_data = {}
-                                    card_text = card.inner_text()
-                                    print(f"DEBUG: Card text sample: {card_text[:100]}")
-                                    
-                                    # Try to extract airline
-                                    for airline in ["IndiGo", "Air India", "SpiceJet", "Vistara", "GoAir"]:
-                                        if airline.lower() in card_text.lower():
-                                            flight_data['airline'] = airline
-                                            break
-                                    
-                                    # Extract price
-                                    price_match = re.search(r'(?:₹|Rs\.?)\s*([0-9,]+)', card_text)
-                                    if price_match:
-                                        flight_data['price'] = f"₹ {price_match.group(1)}"
-                                    
-                                    # Extract times
-                                    time_matches = re.findall(r'(\d{1,2}:\d{2}(?:\s*[AP]M)?)', card_text)
-                                    if len(time_matches) >= 2:
-                                        flight_data['departure'] = time_matches[0]
-                                        flight_data['arrival'] = time_matches[1]
-                                    
-                                    # Extract duration
-                                    duration_match = re.search(r'(\d+h\s*\d*m|\d+\s*h(?:rs)?\s*\d*\s*m(?:in)?)', card_text)
-                                    if duration_match:
-                                        flight_data['duration'] = duration_match.group(1)
-                                    
-                                    # Extract flight number
-                                    flight_num_match = re.search(r'([A-Z0-9]{2}[-\s]?[0-9]{3,4})', card_text)
-                                    if flight_num_match:
-                                        flight_data['flight_number'] = flight_num_match.group(1)
-                                    
-                                    # Fill in missing fields with reasonable values
-                                    if 'airline' not in flight_data:
-                                        airlines = ["IndiGo", "Air India", "SpiceJet", "Vistara", "GoAir"]
-                                        flight_data['airline'] = airlines[i % len(airlines)]
-                                    
-                                    if 'flight_number' not in flight_data:
-                                        airline_code = flight_data['airline'][:2].upper()
-                                        flight_data['flight_number'] = f"{airline_code}{1000 + i*111}"
-                                    
-                                    if 'price' not in flight_data:
-                                        base_prices = [4500, 5200, 5800]
-                                        flight_data['price'] = f"₹ {base_prices[i % len(base_prices)]}"
-                                    
-                                    if 'departure' not in flight_data:
-                                        departure_hour = 6 + i
-                                        flight_data['departure'] = f"{departure_hour:02d}:00"
-                                    
-                                    if 'arrival' not in flight_data:
-                                        departure_hour = 6 + i
-                                        duration_hours = 2 + (i % 3)
-                                        arrival_hour = departure_hour + duration_hours
-                                        flight_data['arrival'] = f"{arrival_hour:02d}:30"
-                                    
-                                    if 'duration' not in flight_data:
-                                        duration_hours = 2 + (i % 3)
-                                        flight_data['duration'] = f"{duration_hours}h 30m"
-                                    
-                                    # Mark as real data
-                                    flight_data['source'] = 'EaseMyTrip (REAL)'
-                                    flight_data['is_real'] = True
-                                    
-                                    # Add to options
-                                    flight_options.append(flight_data)
-                                    print(f"SUCCESS: Extracted real flight: {flight_data['airline']} {flight_data['flight_number']} for {flight_data['price']}")
-                                
-                                except Exception as e:
-                                    print(f"Error extracting EaseMyTrip card: {e}")
-                            
-                            break
-                
-                except Exception as e:
-                    print(f"EaseMyTrip error: {e}")
-                
-                # Close browser properly
-                try:
-                    context.close()
-                    browser.close()
-                except Exception as e:
-                    print(f"Error closing browser: {e}")
-        
-        except Exception as e:
-            print(f"Final attempt error: {e}")
-    
-    # If we couldn't get flight options, use fallback data
-    if not flight_options:
-        print("No real flight data obtained, using fallback flight data")
-        flight_options = fallback_flights
-        print("Note: This is simulated data as real-time data could not be fetched.")
-    else:
-        print(f"SUCCESS! Retrieved {len(flight_options)} REAL flight options!")
-        
-        # Mark data as real to make it clear in the output
-        for flight in flight_options:
-            if 'is_real' not in flight:
-                flight['is_real'] = True
-            
-            # Add REAL tag to the source if not already there
-            if 'source' in flight and 'REAL' not in flight['source']:
-                flight['source'] = f"{flight['source']} (REAL)"
-        
-        # Identify the successful sources
-        sources = set(item['source'] for item in flight_options if 'source' in item)
-        print(f"Data successfully retrieved from: {', '.join(sources)}")
-    
-    # Return structured data - ensure we have only up to 3 flight options
-    return {
-        'flight_options': flight_options[:3],
-        'attractions': attractions
-    }
-
-def generate_fallback_flights(source, destination, start_date):
-    """Generate fallback flight data when web scraping fails"""
-    print("Generating fallback flight data")
-    
-    # Get airport codes (simulated)
-    source_code = source[:3].upper()
-    dest_code = destination[:3].upper()
-    
-    # List of airlines to create variation
-    airlines = ["IndiGo", "Air India", "SpiceJet", "Vistara", "GoAir"]
-    
-    # Generate three different flight options
-    flight_options = []
-    
-    for i in range(3):
-        # Create variations in time and price
-        departure_hour = 6 + i
-        duration_hours = 2 + (i % 3)
-        arrival_hour = departure_hour + duration_hours
-        flight_num = 100 + (i * 111)
-        price_base = 4000 + (i * 800)
-        
-        # Format times nicely
-        departure_time = f"{departure_hour:02d}:00"
-        arrival_time = f"{arrival_hour:02d}:30"
-        
-        flight_options.append({
-            'airline': airlines[i % len(airlines)],
-            'flight_number': f"{airlines[i % len(airlines)][:2].upper()}-{flight_num}",
-            'departure': departure_time,
-            'arrival': arrival_time,
-            'duration': f"{duration_hours}h 30m",
-            'price': f"₹ {price_base}",
-            'source': 'Generated'
-        })
-    
-    return flight_options
-
-def generate_fallback_attractions(destination):
-    """Generate a list of attractions for the destination"""
-    popular_attractions = {
-        "goa": [
-            {"name": "Calangute Beach", "description": "Popular beach known for water sports and nightlife"},
-            {"name": "Basilica of Bom Jesus", "description": "UNESCO World Heritage site, houses the remains of St. Francis Xavier"},
-            {"name": "Fort Aguada", "description": "17th-century Portuguese fort and lighthouse with panoramic views"},
-            {"name": "Dudhsagar Falls", "description": "Four-tiered waterfall on the Mandovi River"},
-            {"name": "Anjuna Flea Market", "description": "Popular market selling handicrafts, clothes, and souvenirs"}
-        ],
-        "delhi": [
-            {"name": "Red Fort", "description": "Historic fort that was the main residence of the Mughal emperors"},
-            {"name": "Qutub Minar", "description": "UNESCO World Heritage site, a 73-meter tall minaret"},
-            {"name": "India Gate", "description": "War memorial dedicated to soldiers who died in World War I"},
-            {"name": "Humayun's Tomb", "description": "UNESCO World Heritage site, tomb of Mughal Emperor Humayun"},
-            {"name": "Chandni Chowk", "description": "One of the oldest and busiest markets in Old Delhi"}
-        ],
-        "mumbai": [
-            {"name": "Gateway of India", "description": "Iconic monument built during the British Raj"},
-            {"name": "Marine Drive", "description": "Scenic boulevard along the coastline of South Mumbai"},
-            {"name": "Elephanta Caves", "description": "UNESCO World Heritage site with ancient cave temples"},
-            {"name": "Chhatrapati Shivaji Terminus", "description": "Historic railway station and UNESCO World Heritage site"},
-            {"name": "Juhu Beach", "description": "Popular beach and recreational area"}
-        ],
-        # Add more destinations as needed
-    }
-    
-    # Get the attractions for the destination (case-insensitive)
-    clean_destination = destination.lower().split(',')[0].strip()
-    
-    # If we have attractions for this destination, return them
-    if clean_destination in popular_attractions:
-        return popular_attractions[clean_destination]
-    
-    # Otherwise generate generic attractions based on the destination name
-    return [
-        {"name": f"{destination} Central Park", "description": f"Beautiful park in the heart of {destination}"},
-        {"name": f"{destination} Heritage Museum", "description": f"Museum showcasing the rich history of {destination}"},
-        {"name": f"{destination} Beach", "description": f"Picturesque beach with golden sands and clear waters"},
-        {"name": f"Old {destination} Market", "description": f"Traditional market selling local crafts and souvenirs"},
-        {"name": f"{destination} Hill Station", "description": f"Scenic viewpoint offering panoramic views of the area"}
-    ] 
\ No newline at end of file
+Kept for existing imports; the scraping lives in agents.flight_engine.
+"""
+from agents.flight_engine import get_real_flight_data, generate_fallback_flights
@@ -1,17 +1,70 @@
 import os
 import time
 import json
+import threading
 from datetime import datetime, timedelta
-import groq
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
-from playwright.sync_api import sync_playwright
 import re
 import requests
 import random
+from utils.upstreams import GOOGLE_BASE_URL, GOIBIBO_BASE_URL, MAKEMYTRIP_BASE_URL, PLACES_API_URL, PLACES_API_HOST
+from utils import scrape_replay
+from utils.circuit_breaker import get_breaker
+from utils.rate_limit import throttle, throttle_navigation, RateLimited
+from utils.deadline import Deadline
+from utils.browser_pool import get_browser_pool, PoolSaturated
+from utils.card_extract import extract_cards, wait_for_cards, first_valid
+from utils.text_parse import (RATING_PATTERN, parse_amount, parse_duration, format_duration,
+                              parse_distance_km, parse_distances_km, parse_via)
+from utils.response_capture import ResponseCapture, get_extraction_mode, NETWORK_CAPTURE_TIMEOUT_MS
+from agents.google_payloads import parse_driving_routes, parse_hotel_cards
+from agents.hotel_providers import HotelQuery, default_hotel_providers, gather_hotels
+from agents.flight_engine import get_real_flight_data
 
 # Load environment variables
 load_dotenv()
 
+# Completion budget of an itinerary: summary, travel, accommodation and tips,
+# plus a per-day allowance that shrinks as trips get longer; llama3-70b-8192
+# shares its 8192-token context between the prompt and the completion
+ITINERARY_BASE_TOKENS = 700
+ITINERARY_ROUTE_ATTRACTIONS_TOKENS = 450
+ITINERARY_MAX_TOKENS = int(os.getenv('ITINERARY_MAX_TOKENS', 6500))
+# (longest trip in days, tokens per day, detail asked for each morning/afternoon/evening)
+ITINERARY_DETAIL_LEVELS = [
+    (3, 380, "3-4 sentences naming specific places, restaurants, dishes and timings"),
+    (7, 240, "2 sentences naming specific places and restaurants"),
+    (None, 150, "1 sentence naming the main place or restaurant"),
+]
+
+# Completion budget of a standalone route-attractions answer
+ROUTE_ATTRACTIONS_MAX_TOKENS = 1500
+
+
+def itinerary_token_budget(num_days, include_route_attractions=False):
+    """(max_tokens, per-slot detail instruction) for an itinerary of num_days days"""
+    for longest, day_tokens, detail in ITINERARY_DETAIL_LEVELS:
+        if longest is None or num_days <= longest:
+            break
+    max_tokens = ITINERARY_BASE_TOKENS + day_tokens * max(1, num_days)
+    if include_route_attractions:
+        max_tokens += ITINERARY_ROUTE_ATTRACTIONS_TOKENS
+    return min(max_tokens, ITINERARY_MAX_TOKENS), detail
+
+
+def log_llm_usage(label, response, max_tokens, started):
+    """Print the prompt and completion token counts of a Groq completion and how long it took"""
+    usage = getattr(response, 'usage', None)
+    prompt_tokens = getattr(usage, 'prompt_tokens', None)
+    completion_tokens = getattr(usage, 'completion_tokens', None)
+    finish_reason = getattr(response.choices[0], 'finish_reason', None) if response.choices else None
+    print(f"{label} LLM usage: {prompt_tokens} prompt + {completion_tokens} completion tokens "
+          f"(max {max_tokens}) in {time.monotonic() - started:.1f}s")
+    if finish_reason == 'length':
+        print(f"{label} completion hit max_tokens={max_tokens} and was cut short")
+
+
 class TravelAgent:
     """Class to handle travel data extraction and itinerary generation"""
     
@@ -22,6 +75,8 @@ class TravelAgent:
         self.groq_client = None
         if groq_api_key and groq_api_key.strip() != '':
             try:
+                # The Groq SDK (httpx, pydantic models) is only loaded when there is a key to use
+                import groq
                 self.groq_client = groq.Client(api_key=groq_api_key)
                 print("Groq client initialized successfully")
             except Exception as e:
@@ -30,17 +85,50 @@ class TravelAgent:
         else:
             print("GROQ_API_KEY not found or empty, will use fallback itinerary generation")
     
-    def get_car_travel_data(self, source, destination, start_date, num_days):
-        """Extract car travel data for the specified route and dates with enhanced reliability"""
-        print(f"Getting real-time car travel data: {source} to {destination}")
+    def __getstate__(self):
+        # Scraper worker processes get a copy of the agent with each job; the
+        # Groq client can't be pickled and only the web process calls the LLM
+        state = dict(self.__dict__)
+        state['groq_client'] = None
+        return state
+    
+    def warm(self, timeout=10):
+        """
+        Open the Groq client's connection with a cheap models.list() call so the
+        first itinerary doesn't pay for DNS, TLS and the connection pool.
+        Returns True when the API answered, False when there is no client or it failed.
+        """
+        if self.groq_client is None:
+            return False
+        try:
+            self.groq_client.with_options(timeout=timeout, max_retries=0).models.list()
+            print("Groq client connection warmed")
+            return True
+        except Exception as e:
+            print(f"Groq warm-up failed: {str(e)[:200]}")
+            return False
+    
+    def get_car_travel_data(self, source, destination, start_date, num_days, deadline=None, llm_route_attractions=True):
+        """
+        Extract car travel data for the specified route and dates with enhanced reliability.
         
-        driving_routes = []
+        The destination attractions and route attractions lookups run on background
+        threads while the Google Maps directions and route-attractions tabs are
+        scraped on the browser pool, so the stage takes as long as the slowest of
+        them rather than their sum.
         
-        # Get attractions at the destination
-        destination_attractions = self.get_real_attractions(destination)
+        Every browser wait is capped by the remaining request budget in `deadline`
+        (utils.deadline.Deadline); once it runs out the fallback routes are used.
         
-        # Get attractions along the route using our API-based method
-        route_attractions = self.get_real_route_attractions(source, destination)
+        With llm_route_attractions=False the route attractions lookup skips its own
+        LLM call, for callers that get them from the itinerary completion instead
+        (generate_itinerary(include_route_attractions=True)).
+        """
+        print(f"Getting real-time car travel data: {source} to {destination}")
+        deadline = deadline or Deadline()
+        
+        driving_routes = []
+        scraped_route_attractions = []
         
         # Check if this is a known long-distance route for which we have reference distances
         source_norm = source.lower().split(',')[0].strip()
@@ -63,344 +151,336 @@ class TravelAgent:
             fallback_distance = known_long_distances[(dest_norm, source_norm)]
             print(f"Found predefined distance for reverse route: {fallback_distance} km")
         
-        max_attempts = 3
-        
-        for attempt in range(1, max_attempts + 1):
-            print(f"Car data extraction attempt {attempt} of {max_attempts}")
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            # Start the API lookups first so they run while the browser works
+            destination_attractions_future = executor.submit(self.get_real_attractions, destination, deadline=deadline)
+            route_attractions_future = executor.submit(self.get_real_route_attractions, source, destination,
+                                                       deadline=deadline, use_llm=llm_route_attractions)
             
-            try:
-                with sync_playwright() as p:
-                    print(f"Launching browser in headless mode for car data (attempt {attempt})...")
-                    # Launch browser with enhanced stability configurations
-                    browser = p.chromium.launch(
-                        headless=True,
-                        args=[
-                            '--disable-gpu',
-                            '--no-sandbox',
-                            '--disable-dev-shm-usage',
-                            '--disable-web-security'
-                        ]
-                    )
-                    
-                    context = browser.new_context(
-                        viewport={'width': 1366, 'height': 768},
-                        user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/96.0.4664.110 Safari/537.36'
+            max_attempts = 3
+            maps_breaker = get_breaker(GOOGLE_BASE_URL)
+            
+            for attempt in range(1, max_attempts + 1):
+                if deadline.expired():
+                    print("Request budget exhausted, skipping Google Maps scraping")
+                    break
+                
+                # Fail fast to the fallback routes while Google Maps is blocking us
+                if not maps_breaker.allow_request():
+                    print(f"Circuit for {maps_breaker.name} is open, skipping Google Maps scraping")
+                    break
+                
+                print(f"Car data extraction attempt {attempt} of {max_attempts}")
+                attempt_started = time.monotonic()
+                
+                try:
+                    # The directions page and the route search are two Google navigations
+                    throttle_navigation(GOOGLE_BASE_URL, deadline, tokens=2)
+                    route_future = get_browser_pool().submit(
+                        self._scrape_car_routes, source, destination, fallback_distance, deadline
                     )
-                    page = context.new_page()
-                    page.set_default_timeout(30000)  # Longer timeout for reliability
-                    
-                    # Clean source and destination for URL
-                    clean_source = source.split(',')[0].strip().replace(' ', '+')
-                    clean_destination = destination.split(',')[0].strip().replace(' ', '+')
-                    
-                    # Use Google Maps for reliable directions
-                    maps_url = f"https://www.google.com/maps/dir/{clean_source}/{clean_destination}/"
-                    print(f"Accessing Google Maps: {maps_url}")
-                    
-                    # Navigate to Google Maps
-                    page.goto(maps_url, wait_until="domcontentloaded", timeout=30000)
-                    
-                    # Wait for directions to load
-                    page.wait_for_timeout(8000)  # Give plenty of time for routes to calculate
-                    
-                    # Handle any consent dialogs
-                    consent_selectors = [
-                        'button#introAgreeButton', 
-                        'button.VfPpkd-LgbsSe'
-                    ]
-                    
-                    for selector in consent_selectors:
-                        if page.is_visible(selector, timeout=3000):
-                            page.click(selector)
-                            print("Handled consent dialog")
-                            page.wait_for_timeout(2000)
-                            break
-                    
-                    # Look for route options
-                    route_selectors = [
-                        'div[role="radio"]',
-                        'div.XdKEzd',
-                        'div.MespJc'
-                    ]
-                    
-                    found_routes = False
-                    for selector in route_selectors:
-                        route_elements = page.query_selector_all(selector)
-                        if route_elements and len(route_elements) > 0:
-                            print(f"Found {len(route_elements)} route options using selector: {selector}")
-                            
-                            # Process routes
-                            for i, route in enumerate(route_elements[:3]):  # Get up to 3 routes
-                                try:
-                                    route_data = {}
-                                    route_data['source'] = source_norm
-                                    route_data['destination'] = dest_norm
-                                    
-                                    # Extract route info
-                                    route_text = route.inner_text()
-                                    
-                                    # ENHANCED DISTANCE EXTRACTION STRATEGY
-                                    
-                                    # 1. Check if this is a known route with a predefined distance
-                                    if fallback_distance:
-                                        print(f"Using predefined distance for {source_norm} to {dest_norm}: {fallback_distance} km")
-                                        route_data['distance'] = f"{fallback_distance} km"
-                                        route_data['distance_km'] = float(fallback_distance)
-                                        # Don't continue with pattern matching for known routes
-                                    else:
-                                        # 2. Try to extract distance using multiple patterns
-                                        try:
-                                            # Get the entire page content
-                                            page_content = page.content()
-                                            print("Scanning entire page content for accurate distances...")
-                                            
-                                            # First, try to extract using the exact pattern shown in Google Maps interface
-                                            # Pattern like: "1,339 km" or "1,285 km" with 4-digit distances including commas
-                                            # Improved pattern to match "1,339 km" format with optional comma
-                                            large_distances_pattern = re.findall(r'([\d\,]{4,})\s*km', page_content)
-                                            
-                                            if large_distances_pattern:
-                                                # Process the matches, removing commas
-                                                large_distances = []
-                                                for dist in large_distances_pattern:
-                                                    dist_clean = dist.replace(',', '')
-                                                    if dist_clean.isdigit() and int(dist_clean) > 200:  # Must be substantial distance
-                                                        large_distances.append(int(dist_clean))
-                                                
-                                                if large_distances:
-                                                    print(f"Found large distances in page content: {large_distances}")
-                                                    # Sort distances descending for more reliable results
-                                                    large_distances.sort(reverse=True)
-                                                    # Use first one for fastest route
-                                                    if i == 0:  # For the first/fastest route
-                                                        route_data['distance'] = f"{large_distances[0]} km"
-                                                        route_data['distance_km'] = float(large_distances[0])
-                                                        print(f"🟢 Set REAL distance for fastest route: {large_distances[0]} km")
-                                                    elif i < len(large_distances):
-                                                        route_data['distance'] = f"{large_distances[i]} km"
-                                                        route_data['distance_km'] = float(large_distances[i])
-                                                        print(f"🟢 Set REAL distance for route {i+1}: {large_distances[i]} km")
-                                            
-                                            # If not found yet, try another pattern format
-                                            if 'distance' not in route_data:
-                                                # Try looking for patterns like: distance is 1,339 km
-                                                distance_text_pattern = re.findall(r'distance\s+(?:is|of)\s+([\d\,]{4,})\s*km', page_content, re.IGNORECASE)
-                                                if distance_text_pattern:
-                                                    large_distances = []
-                                                    for dist in distance_text_pattern:
-                                                        dist_clean = dist.replace(',', '')
-                                                        if dist_clean.isdigit() and int(dist_clean) > 200:
-                                                            large_distances.append(int(dist_clean))
-                                                    
-                                                    if large_distances:
-                                                        # Sort to get largest distance first
-                                                        large_distances.sort(reverse=True)
-                                                        route_data['distance'] = f"{large_distances[0]} km"
-                                                        route_data['distance_km'] = float(large_distances[0])
-                                                        print(f"🟢 Found distance in descriptive text: {large_distances[0]} km")
-                                            
-                                            # If still not found, try a more general pattern for 3+ digit numbers near "km"
-                                            if 'distance' not in route_data:
-                                                # Look for any 3+ digit number followed by "km"
-                                                general_distance = re.findall(r'(\d{3,})\s*(?:km|kilometers)', page_content, re.IGNORECASE)
-                                                if general_distance:
-                                                    distances = [int(d) for d in general_distance if int(d) > 200]
-                                                    if distances:
-                                                        # Sort by largest first
-                                                        distances.sort(reverse=True)
-                                                        route_data['distance'] = f"{distances[0]} km"
-                                                        route_data['distance_km'] = float(distances[0])
-                                                        print(f"🟢 Found distance with general pattern: {distances[0]} km")
-                                            
-                                            # If still not found, check for inline text about journey time and distance
-                                            if 'distance' not in route_data:
-                                                # Pattern looking for "X hr Y min (Z km)" format
-                                                time_dist_pattern = re.findall(r'(\d+)\s*hr\s*(\d+)\s*min\s*\(\s*([\d,]+)\s*km\)', page_content)
-                                                if time_dist_pattern:
-                                                    for hrs, mins, dist in time_dist_pattern:
-                                                        dist_clean = dist.replace(',', '')
-                                                        if dist_clean.isdigit() and int(dist_clean) > 200:
-                                                            route_data['distance'] = f"{dist_clean} km"
-                                                            route_data['distance_km'] = float(dist_clean)
-                                                            route_data['duration'] = f"{hrs} hr {mins} min"
-                                                            print(f"🟢 Found distance with time pattern: {dist_clean} km ({hrs}h {mins}m)")
-                                                            break
-                                            
-                                        except Exception as e:
-                                            print(f"Error in advanced distance extraction: {e}")
-                                    
-                                    # If we still haven't found a distance and don't have a fallback
-                                    if 'distance' not in route_data and not fallback_distance:
-                                        # Extract from route card text directly
-                                        route_card_match = re.search(r'(\d+)\s*(?:hr|hour).*?(\d+)\s*km', route_text, re.IGNORECASE)
-                                        if route_card_match:
-                                            # Found a pattern like "15 hr 5 min 847 km"
-                                            km_val = route_card_match.group(2)
-                                            route_data['distance'] = f"{km_val} km"
-                                            route_data['distance_km'] = float(km_val)
-                                            print(f"Extracted distance from route card: {km_val} km")
-                                    
-                                    # If still no distance found, use our provided fallback
-                                    if 'distance' not in route_data:
-                                        if fallback_distance:
-                                            route_data['distance'] = f"{fallback_distance} km"
-                                            route_data['distance_km'] = float(fallback_distance)
-                                            print(f"Using fallback distance for {source_norm} to {dest_norm}: {fallback_distance} km")
-                                    
-                                    # Extract duration using regex
-                                    duration_match = re.search(r'(\d+)\s*hr\s*(\d*)|(\d+)\s*min', route_text)
-                                    if duration_match:
-                                        if duration_match.group(1):  # Hours and possibly minutes
-                                            hours = duration_match.group(1)
-                                            minutes = duration_match.group(2) if duration_match.group(2) else "0"
-                                            route_data['duration'] = f"{hours} hr {minutes} min"
-                                        else:  # Just minutes
-                                            minutes = duration_match.group(3)
-                                            route_data['duration'] = f"{minutes} min"
-                                    
-                                    # Extract via information
-                                    via_match = re.search(r'via\s+([^\.]+)', route_text)
-                                    if via_match:
-                                        route_data['via'] = f"Via {via_match.group(1).strip()}"
-                                    
-                                    # Set route name based on extracted info
-                                    if i == 0:
-                                        route_data['route_name'] = "Fastest Route"
-                                        route_data['description'] = route_data.get('via', 'Main Highway')
-                                    elif i == 1:
-                                        route_data['route_name'] = "Alternative Route"
-                                        route_data['description'] = route_data.get('via', 'Secondary Road')
-                                    else:
-                                        route_data['route_name'] = "Scenic Route"
-                                        route_data['description'] = route_data.get('via', 'Local Road')
-                                    
-                                    # If still missing duration, estimate it from distance
-                                    if 'duration' not in route_data and 'distance_km' in route_data:
-                                        route_data['duration'] = self._estimate_duration(route_data['distance_km'])
-                                    
-                                    # Fill in any missing fields
-                                    if 'distance' not in route_data:
-                                        print("WARNING: No distance extracted and no fallback available!")
-                                        # Use a default estimate based on city names
-                                        source_len = len(source)
-                                        dest_len = len(destination)
-                                        base_distance = 50 + ((source_len + dest_len) % 300)
-                                        route_data['distance'] = f"{base_distance} km"
-                                        route_data['distance_km'] = float(base_distance)
-                                    
-                                    if 'via' not in route_data:
-                                        route_data['via'] = f"Via Highway"
-                                    
-                                    driving_routes.append(route_data)
-                                    print(f"Added route: {route_data['route_name']} with distance {route_data.get('distance', 'unknown')}")
-                                    
-                                except Exception as e:
-                                    print(f"Error extracting route {i}: {str(e)[:100]}")
-                            
-                            found_routes = True
-                            break
-                    
-                    # NEW: Try to find attractions along the route
-                    try:
-                        # Extract midpoint location between source and destination
-                        source_parts = source.split(',')[0].strip().lower()
-                        dest_parts = destination.split(',')[0].strip().lower()
-                        
-                        # Run a search for attractions between the two cities
-                        search_query = f"tourist attractions between {source_parts} and {dest_parts} india"
-                        search_url = f"https://www.google.com/search?q={search_query.replace(' ', '+')}"
-                        
-                        # Open in a new tab
-                        page2 = context.new_page()
-                        page2.goto(search_url, wait_until="domcontentloaded", timeout=30000)
-                        page2.wait_for_timeout(3000)
-                        
-                        # Look for place cards
-                        place_selectors = [
-                            'div.SPZz6b',
-                            'div.kno-vrt-t',
-                            'div.dbg0pd',
-                            'g-scrolling-carousel div'
-                        ]
-                        
-                        route_places = []
-                        for place_selector in place_selectors:
-                            place_elements = page2.query_selector_all(place_selector)
-                            if place_elements and len(place_elements) > 0:
-                                print(f"Found {len(place_elements)} potential attractions along route")
-                                
-                                for place_elem in place_elements[:5]:  # Get up to 5 attractions
-                                    try:
-                                        place_text = place_elem.inner_text().strip()
-                                        if len(place_text) > 3 and place_text not in ['', 'Map', 'Images']:
-                                            # Clean up place name
-                                            place_name = re.sub(r'\s+', ' ', place_text.split('\n')[0].strip())
-                                            
-                                            if place_name and len(place_name) > 3:
-                                                # Generate a rating between 4.1 and 4.8
-                                                import random
-                                                rating = f"{random.uniform(4.1, 4.8):.1f}"
-                                                
-                                                route_places.append({
-                                                    'name': place_name,
-                                                    'rating': rating,
-                                                    'description': f"Attraction along the route from {source_parts} to {dest_parts}."
-                                                })
-                                                print(f"Added route attraction: {place_name}")
-                                    except Exception as place_err:
-                                        continue
-                                
-                                if route_places:
-                                    break
-                        
-                        if route_places:
-                            route_attractions = route_places[:3]  # Limit to 3 attractions
-                        
-                        # Close the second tab
-                        page2.close()
-                        
-                    except Exception as attraction_err:
-                        print(f"Error finding route attractions: {str(attraction_err)[:100]}")
-                    
-                    # If we got the routes, no need for further attempts
-                    if found_routes and driving_routes:
-                        break
-                    
-                    # Close browser properly
-                    try:
-                        context.close()
-                        browser.close()
-                    except Exception as e:
-                        print(f"Error closing browser: {e}")
+                except (PoolSaturated, RateLimited) as e:
+                    # Every browser is busy with a full queue behind it, or Google's rate limit has
+                    # no room before the deadline; use the fallback routes now
+                    print(f"Skipping Google Maps scraping: {e}")
+                    maps_breaker.release()
+                    break
+                
+                try:
+                    driving_routes, scraped_route_attractions = route_future.result()
+                except Exception as e:
+                    print(f"Error in car data extraction attempt {attempt}: {str(e)[:150]}")
+                finally:
+                    # Feed the outcome and latency of this attempt to the Google circuit breaker;
+                    # running out of our own budget is not the upstream's fault
+                    if driving_routes:
+                        maps_breaker.record_success(time.monotonic() - attempt_started)
+                    elif not deadline.expired():
+                        maps_breaker.record_failure(time.monotonic() - attempt_started)
+                    else:
+                        # Hand back a half-open probe slot, or the circuit would never close again
+                        maps_breaker.release()
                 
                 # If we found routes, we can break out of the retry loop
                 if driving_routes:
                     break
-                    
-            except Exception as e:
-                print(f"Error in car data extraction attempt {attempt}: {str(e)[:150]}")
                 
-            # If we need another attempt, add a short delay
-            if attempt < max_attempts:
-                delay = 2 * attempt  # Progressive backoff
-                print(f"Waiting {delay} seconds before next attempt...")
-                time.sleep(delay)
+                # If we need another attempt, add a short delay (unless the circuit just opened)
+                if attempt < max_attempts and not maps_breaker.is_open():
+                    delay = 2 * attempt  # Progressive backoff
+                    if not deadline.has_time_for(delay):
+                        print("Not enough request budget left for another attempt")
+                        break
+                    print(f"Waiting {delay} seconds before next attempt...")
+                    time.sleep(delay)
+            
+            # Gather the API lookups
+            destination_attractions = destination_attractions_future.result()
+            route_attractions = route_attractions_future.result()
+        
+        # Places scraped from the route search take priority over the API lookup
+        route_attractions_source = 'lookup'
+        if scraped_route_attractions:
+            route_attractions = scraped_route_attractions[:3]  # Limit to 3 attractions
+            route_attractions_source = 'scraped'
         
         # After all attempts, if we still don't have any routes, create fallback routes
         if not driving_routes:
             print(f"No routes found after {max_attempts} attempts. Creating fallback routes.")
             
-            # Create fallback routes using our helper method
-            driving_routes = self._generate_fallback_route_data(source, destination, approx_distance)
-            print(f"Using fallback routes with approximate distance: {approx_distance} km")
+            # Create fallback routes using our helper method (known distance if we have one)
+            driving_routes = self._generate_fallback_route_data(source, destination, fallback_distance)
+            print(f"Using fallback routes for {source_norm} to {dest_norm}")
         
         # Return structured data including both route info and attractions
         return {
             'driving_options': driving_routes[:3],  # Ensure we return at most 3 routes
             'attractions': destination_attractions,
-            'route_attractions': route_attractions  # NEW: Attractions along the route
+            'route_attractions': route_attractions,  # NEW: Attractions along the route
+            'route_attractions_source': route_attractions_source
         }
     
+    def _scrape_car_routes(self, browser, source, destination, fallback_distance, deadline):
+        """
+        Browser pool task: scrape Google Maps directions and the route-attractions search.
+        
+        Both tabs share one context and start loading before either is waited on, so the
+        wait for the directions to calculate also covers the search results page.
+        
+        Returns:
+            tuple: (driving_routes, route_places)
+        """
+        source_norm = source.lower().split(',')[0].strip()
+        dest_norm = destination.lower().split(',')[0].strip()
+        driving_routes = []
+        route_places = []
+        
+        # Context honours SCRAPER_REPLAY_MODE (live, record or replay)
+        context = scrape_replay.new_context(
+            browser,
+            scrape_replay.session_name('car', source, destination),
+            viewport={'width': 1366, 'height': 768},
+            user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/96.0.4664.110 Safari/537.36'
+        )
+        try:
+            page = context.new_page()
+            page.set_default_timeout(deadline.timeout_ms(30000))  # Longer timeout for reliability
+            page2 = context.new_page()
+            
+            # Clean source and destination for URL
+            clean_source = source.split(',')[0].strip().replace(' ', '+')
+            clean_destination = destination.split(',')[0].strip().replace(' ', '+')
+            
+            # Use Google Maps for reliable directions
+            maps_url = f"{GOOGLE_BASE_URL}/maps/dir/{clean_source}/{clean_destination}/"
+            
+            # Run a search for attractions between the two cities
+            source_parts = source.split(',')[0].strip().lower()
+            dest_parts = destination.split(',')[0].strip().lower()
+            search_query = f"tourist attractions between {source_parts} and {dest_parts} india"
+            search_url = f"{GOOGLE_BASE_URL}/search?q={search_query.replace(' ', '+')}"
+            
+            mode = get_extraction_mode()
+            capture = None
+            if mode != 'dom':
+                capture = ResponseCapture(page, r'/maps/preview/directions', parse_driving_routes)
+            
+            # Start both navigations, then wait on the directions page while the search loads
+            print(f"Accessing Google Maps ({mode} extraction): {maps_url}")
+            page.goto(maps_url, wait_until="commit", timeout=deadline.timeout_ms(30000))
+            try:
+                page2.goto(search_url, wait_until="commit", timeout=deadline.timeout_ms(30000))
+            except Exception as e:
+                print(f"Error opening route attractions search: {str(e)[:100]}")
+            
+            # Routes straight from the directions XHR when it arrives, else from the rendered page
+            network_routes = []
+            capture_started = time.monotonic()
+            if capture is not None:
+                try:
+                    network_routes = capture.wait_for(1, deadline.timeout_ms(NETWORK_CAPTURE_TIMEOUT_MS))
+                finally:
+                    capture.stop()
+            captured_ms = int((time.monotonic() - capture_started) * 1000)
+            
+            if network_routes:
+                for i, route in enumerate(network_routes[:3]):
+                    route_data = dict(route, source=source_norm, destination=dest_norm)
+                    route_data.setdefault('via', "Via Highway")
+                    self._name_route(route_data, i)
+                    driving_routes.append(route_data)
+                    print(f"Added route from directions data: {route_data['route_name']} with distance {route_data['distance']}")
+            elif mode != 'network':
+                page.wait_for_load_state("domcontentloaded", timeout=deadline.timeout_ms(30000))
+            
+                # Wait for directions to load, counting the time already spent waiting for the XHR
+                page.wait_for_timeout(deadline.timeout_ms(max(1, 8000 - captured_ms)))  # Give plenty of time for routes to calculate
+            
+                # Handle any consent dialogs
+                consent_selectors = [
+                    'button#introAgreeButton', 
+                    'button.VfPpkd-LgbsSe'
+                ]
+            
+                for selector in consent_selectors:
+                    if page.is_visible(selector, timeout=deadline.timeout_ms(3000)):
+                        page.click(selector)
+                        print("Handled consent dialog")
+                        page.wait_for_timeout(deadline.timeout_ms(2000))
+                        break
+            
+                # Look for route options
+                route_selectors = [
+                    'div[role="radio"]',
+                    'div.XdKEzd',
+                    'div.MespJc'
+                ]
+            
+                for selector in route_selectors:
+                    route_elements = page.query_selector_all(selector)
+                    if route_elements and len(route_elements) > 0:
+                        print(f"Found {len(route_elements)} route options using selector: {selector}")
+                    
+                        # Read the page once for every route: distances shown anywhere on it, largest first
+                        page_distances = []
+                        if not fallback_distance:
+                            try:
+                                print("Scanning entire page content for accurate distances...")
+                                page_distances = sorted(parse_distances_km(page.content(), minimum=200), reverse=True)
+                                if page_distances:
+                                    print(f"Found large distances in page content: {page_distances}")
+                            except Exception as e:
+                                print(f"Error in advanced distance extraction: {e}")
+                    
+                        # Process routes
+                        for i, route in enumerate(route_elements[:3]):  # Get up to 3 routes
+                            try:
+                                route_data = {}
+                                route_data['source'] = source_norm
+                                route_data['destination'] = dest_norm
+                            
+                                # Extract route info
+                                route_text = route.inner_text()
+                            
+                                # 1. Known routes use their predefined distance
+                                if fallback_distance:
+                                    print(f"Using predefined distance for {source_norm} to {dest_norm}: {fallback_distance} km")
+                                    route_data['distance'] = f"{fallback_distance} km"
+                                    route_data['distance_km'] = float(fallback_distance)
+                                # 2. Else the distances found on the page, largest first for the fastest route
+                                elif page_distances:
+                                    km = page_distances[i] if i < len(page_distances) else page_distances[0]
+                                    route_data['distance'] = f"{int(km)} km"
+                                    route_data['distance_km'] = float(km)
+                                    print(f"🟢 Set REAL distance for route {i+1}: {int(km)} km")
+                                # 3. Else whatever the route card itself says
+                                else:
+                                    km = parse_distance_km(route_text)
+                                    if km:
+                                        route_data['distance'] = f"{int(km)} km"
+                                        route_data['distance_km'] = km
+                                        print(f"Extracted distance from route card: {int(km)} km")
+                            
+                                duration_minutes = parse_duration(route_text)
+                                if duration_minutes:
+                                    route_data['duration'] = format_duration(duration_minutes)
+                            
+                                via = parse_via(route_text)
+                                if via:
+                                    route_data['via'] = via
+                            
+                                # Set route name based on extracted info
+                                self._name_route(route_data, i)
+                            
+                                # If still missing duration, estimate it from distance
+                                if 'duration' not in route_data and 'distance_km' in route_data:
+                                    route_data['duration'] = self._estimate_duration(route_data['distance_km'])
+                            
+                                # Fill in any missing fields
+                                if 'distance' not in route_data:
+                                    print("WARNING: No distance extracted and no fallback available!")
+                                    # Use a default estimate based on city names
+                                    source_len = len(source)
+                                    dest_len = len(destination)
+                                    base_distance = 50 + ((source_len + dest_len) % 300)
+                                    route_data['distance'] = f"{base_distance} km"
+                                    route_data['distance_km'] = float(base_distance)
+                            
+                                if 'via' not in route_data:
+                                    route_data['via'] = f"Via Highway"
+                            
+                                driving_routes.append(route_data)
+                                print(f"Added route: {route_data['route_name']} with distance {route_data.get('distance', 'unknown')}")
+                            
+                            except Exception as e:
+                                print(f"Error extracting route {i}: {str(e)[:100]}")
+                    
+                        break
+            
+            # Attractions along the route, loaded in the second tab in the meantime
+            try:
+                page2.wait_for_load_state("domcontentloaded", timeout=deadline.timeout_ms(10000))
+                
+                # Look for place cards
+                place_selectors = [
+                    'div.SPZz6b',
+                    'div.kno-vrt-t',
+                    'div.dbg0pd',
+                    'g-scrolling-carousel div'
+                ]
+                
+                route_places = []
+                for place_selector in place_selectors:
+                    place_elements = page2.query_selector_all(place_selector)
+                    if place_elements and len(place_elements) > 0:
+                        print(f"Found {len(place_elements)} potential attractions along route")
+                        
+                        for place_elem in place_elements[:5]:  # Get up to 5 attractions
+                            try:
+                                place_text = place_elem.inner_text().strip()
+                                if len(place_text) > 3 and place_text not in ['', 'Map', 'Images']:
+                                    # Clean up place name
+                                    place_name = re.sub(r'\s+', ' ', place_text.split('\n')[0].strip())
+                                    
+                                    if place_name and len(place_name) > 3:
+                                        # Generate a rating between 4.1 and 4.8
+                                        import random
+                                        rating = f"{random.uniform(4.1, 4.8):.1f}"
+                                        
+                                        route_places.append({
+                                            'name': place_name,
+                                            'rating': rating,
+                                            'description': f"Attraction along the route from {source_parts} to {dest_parts}."
+                                        })
+                                        print(f"Added route attraction: {place_name}")
+                            except Exception as place_err:
+                                continue
+                        
+                        if route_places:
+                            break
+            except Exception as attraction_err:
+                print(f"Error finding route attractions: {str(attraction_err)[:100]}")
+        finally:
+            # Closing the context also saves a recorded session
+            try:
+                context.close()
+            except Exception as e:
+                print(f"Error closing browser context: {e}")
+        
+        return driving_routes, route_places
+    
+    def _name_route(self, route_data, index):
+        """Name a driving route by its position in the Maps results"""
+        if index == 0:
+            route_data['route_name'] = "Fastest Route"
+            route_data['description'] = route_data.get('via', 'Main Highway')
+        elif index == 1:
+            route_data['route_name'] = "Alternative Route"
+            route_data['description'] = route_data.get('via', 'Secondary Road')
+        else:
+            route_data['route_name'] = "Scenic Route"
+            route_data['description'] = route_data.get('via', 'Local Road')
+    
     def _estimate_duration(self, distance_km):
         """Estimate travel duration based on distance in kilometers"""
         # Assume average speed of 60 km/h
@@ -414,557 +494,65 @@ class TravelAgent:
         else:
             return f"{minutes} min"
     
-    def get_flight_travel_data(self, source, destination, start_date, num_days):
-        """Extract flight data for the specified route and dates with improved reliability"""
-        print(f"Getting flight data: {source} to {destination} on {start_date}")
-        
-        # Get credentials from env
-        mmt_username = os.getenv('MAKEMYTRIP_USERNAME')
-        mmt_password = os.getenv('MAKEMYTRIP_PASSWORD')
-        
-        print(f"Using credentials from env file - MMT: {mmt_username[:3] if mmt_username else 'Not'}")
-        
-        # Get real attractions instead of fallback
-        attractions = self.get_real_attractions(destination)
-        print(f"Getting real attractions for {destination}")
-        
-        # Parse start date
-        start_date_obj = datetime.strptime(start_date, "%Y-%m-%d")
-        
-        # Generate fallback flight data
-        fallback_flights = self._generate_fallback_flights(source, destination, start_date)
-        
-        flight_options = []
-        
-        try:
-            with sync_playwright() as p:
-                print("Launching browser in strictly headless mode...")
-                browser = p.chromium.launch(
-                    headless=True,
-                    args=[
-                        '--disable-gpu',
-                        '--no-sandbox',
-                        '--disable-dev-shm-usage'
-                    ]
-                )
-                
-                context = browser.new_context(
-                    viewport={'width': 1280, 'height': 720},
-                    user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-                )
-                page = context.new_page()
-                
-                # Use much shorter timeouts
-                page.set_default_timeout(15000)  # 15 seconds
-                
-                # Try Google Flight search as a simpler approach
-                try:
-                    clean_source = source.split(',')[0].strip().lower()
-                    clean_destination = destination.split(',')[0].strip().lower()
-                    formatted_date = start_date_obj.strftime("%Y-%m-%d")
-                    
-                    search_url = f"https://www.google.com/search?q=flights+from+{clean_source}+to+{clean_destination}+on+{formatted_date}"
-                    print(f"Searching for flights via Google: {search_url}")
-                    
-                    page.goto(search_url, wait_until="domcontentloaded", timeout=15000)
-                    page.wait_for_timeout(3000)
-                    
-                    # Extract airlines and prices if available
-                    airlines = ["IndiGo", "Air India", "SpiceJet", "Vistara", "GoAir"]
-                    price_ranges = [4500, 5200, 6000, 5500, 4800]
-                    
-                    # Create flight options based on common patterns
-                    for i in range(3):
-                        flight_time_base = 6 + i
-                        duration_base = 2 + (i % 2)
-                        price_base = price_ranges[i % len(price_ranges)] + (i * 300)
-                        
-                        flight_options.append({
-                            'airline': airlines[i % len(airlines)],
-                            'flight_number': f"{airlines[i % len(airlines)][:2].upper()} {1000 + i*111}",
-                            'departure': f"{flight_time_base:02d}:00",
-                            'arrival': f"{(flight_time_base + duration_base):02d}:30",
-                            'duration': f"{duration_base}h 30m",
-                            'price': f"₹ {price_base}",
-                            'source': 'Search Results'
-                        })
-                    
-                    print(f"Generated {len(flight_options)} flight options from search")
-                    
-                except Exception as e:
-                    print(f"Error in Google flight search: {str(e)[:100]}")
-                
-                # Close browser properly
-                try:
-                    context.close()
-                    browser.close()
-                except Exception as e:
-                    print(f"Error closing browser: {e}")
-        
-        except Exception as e:
-            print(f"Critical error in flight data extraction: {str(e)[:100]}")
-        
-        # If we couldn't get flight options, use fallback data
-        if not flight_options:
-            print("Using fallback flight data")
-            flight_options = fallback_flights
-        
-        # Return structured data - ensure we have only up to 3 flight options
-        return {
-            'flight_options': flight_options[:3],
-            'attractions': attractions
-        }
+    def get_flight_travel_data(self, source, destination, start_date, num_days, deadline=None):
+        """
+        Flights and attractions for the trip, from the flight engine.
+
+        See agents.flight_engine.get_real_flight_data.
+        """
+        return get_real_flight_data(source, destination, start_date, num_days, deadline=deadline, travel_agent=self)
     
-    def _generate_fallback_flights(self, source, destination, start_date):
-        """Generate fallback flight data when web scraping fails"""
-        print("Generating fallback flight data")
-        
-        # Get airport codes (simulated)
-        source_code = source[:3].upper()
-        dest_code = destination[:3].upper()
-        
-        # List of airlines to create variation
-        airlines = ["IndiGo", "Air India", "SpiceJet", "Vistara", "GoAir"]
-        
-        # Generate three different flight options
-        flight_options = []
-        
-        for i in range(3):
-            # Create variations in time and price
-            departure_hour = 6 + i
-            duration_hours = 2 + (i % 3)
-            arrival_hour = departure_hour + duration_hours
-            flight_num = 100 + (i * 111)
-            price_base = 4000 + (i * 800)
-            
-            # Format times nicely
-            departure_time = f"{departure_hour:02d}:00"
-            arrival_time = f"{arrival_hour:02d}:30"
-            
-            flight_options.append({
-                'airline': airlines[i % len(airlines)],
-                'flight_number': f"{airlines[i % len(airlines)][:2].upper()}-{flight_num}",
-                'departure': departure_time,
-                'arrival': arrival_time,
-                'duration': f"{duration_hours}h 30m",
-                'price': f"₹ {price_base}",
-                'source': 'Generated'
-            })
+    def get_hotel_data(self, destination, start_date, num_days, deadline=None):
+        """
+        Extract real hotel options for the destination with enhanced reliability.
         
-        return flight_options
-    
-    def get_hotel_data(self, destination, start_date, num_days):
-        """Extract real hotel options for the destination with enhanced reliability and no fallbacks"""
+        Google Travel, Goibibo and MakeMyTrip are searched at the same time in separate
+        browser contexts (agents.hotel_providers), and the search stops as soon as three
+        unique hotels are in. Browser waits are capped by the remaining budget in
+        `deadline`. If it runs out before three hotels were found, the real ones are
+        topped up with fallback hotels.
+        """
         print(f"Getting hotel data for {destination} from {start_date} for {num_days} days")
+        deadline = deadline or Deadline()
         
         # Parse dates
         start_date_obj = datetime.strptime(start_date, "%Y-%m-%d")
         end_date_obj = start_date_obj + timedelta(days=num_days)
-        end_date = end_date_obj.strftime("%Y-%m-%d")
+        
+        query = HotelQuery(destination, start_date_obj, end_date_obj, deadline)
+        providers = default_hotel_providers(self)
         
         hotel_options = []
         max_attempts = 3
-        attempt = 0
         
-        while attempt < max_attempts and len(hotel_options) < 3:
-            attempt += 1
-            print(f"Hotel data extraction attempt {attempt} of {max_attempts}")
+        for attempt in range(1, max_attempts + 1):
+            if deadline.expired():
+                print("Request budget exhausted, stopping hotel data extraction")
+                break
             
+            # Don't launch a browser at all when every hotel upstream is failing
+            if all(provider.breaker().is_open() for provider in providers):
+                print("All hotel upstream circuits are open, skipping hotel scraping")
+                break
+            
+            print(f"Hotel data extraction attempt {attempt} of {max_attempts}")
             try:
-                with sync_playwright() as p:
-                    print(f"Launching browser in headless mode (attempt {attempt})...")
-                    # Launch browser with enhanced stability configurations and forcing HTTP/1.1
-                    browser = p.chromium.launch(
-                        headless=True,
-                        args=[
-                            '--disable-gpu',
-                            '--no-sandbox',
-                            '--disable-dev-shm-usage',
-                            '--disable-web-security',
-                            '--disable-features=IsolateOrigins,site-per-process',
-                            '--disable-site-isolation-trials',
-                            '--disable-http2',  # Force HTTP/1.1
-                            '--disable-background-networking',
-                            '--disable-breakpad',
-                            '--disable-client-side-phishing-detection',
-                            '--disable-default-apps',
-                            '--disable-extensions',
-                            '--disable-hang-monitor',
-                            '--disable-popup-blocking',
-                            '--disable-prompt-on-repost',
-                            '--disable-sync',
-                            '--disable-translate',
-                            '--metrics-recording-only',
-                            '--no-first-run',
-                            '--safebrowsing-disable-auto-update'
-                        ]
-                    )
-                    
-                    context = browser.new_context(
-                        viewport={'width': 1366, 'height': 768},
-                        user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-                        accept_downloads=False,
-                        ignore_https_errors=True,
-                        java_script_enabled=True,
-                        bypass_csp=True,
-                        extra_http_headers={
-                            "Accept-Language": "en-US,en;q=0.9",
-                            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8",
-                            "Connection": "keep-alive"
-                        }
-                    )
-                    
-                    # Set default timeout to be more lenient
-                    context.set_default_timeout(60000)  # 60 seconds
-                    page = context.new_page()
-                    
-                    # Don't block resources as it can cause issues with dynamic sites
-                    # Instead, setup slower but more reliable navigation
-                    page.set_default_navigation_timeout(60000)  # 60 seconds
-                    
-                    # Try Google first as it's the most reliable source
-                    try:
-                        print("Trying Google Travel for hotel data...")
-                        # Clean destination for URL
-                        clean_destination = destination.split(',')[0].strip()
-                        
-                        # Special handling for Goa destination
-                        if clean_destination.lower() in ["goa", "goi"]:
-                            google_url = "https://www.google.com/travel/hotels/Goa"
-                            print(f"Using hardcoded URL for Goa hotels: {google_url}")
-                        else:
-                            google_url = f"https://www.google.com/travel/hotels/{clean_destination.replace(' ', '%20')}"
-                        
-                        print(f"Accessing Google Travel URL: {google_url}")
-                        page.goto(google_url, timeout=60000)
-                        page.wait_for_load_state("domcontentloaded", timeout=10000)
-                        page.wait_for_timeout(5000)
-                        
-                        # Extract hotels from Google Travel
-                        google_hotel_selectors = [
-                            'div.PVOOXe',
-                            'c-wiz[data-node-index] div.uaTTDe',
-                            'div.Ld2paf',
-                            'div.kQb6Eb',
-                            'div.R6S7Vc'
-                        ]
-                        
-                        hotels_found = False
-                        google_hotels = []
-                        
-                        for selector in google_hotel_selectors:
-                            try:
-                                if page.is_visible(selector, timeout=5000):
-                                    # Extract hotel cards
-                                    hotel_elements = page.query_selector_all(selector)
-                                    if len(hotel_elements) > 0:
-                                        print(f"Found {len(hotel_elements)} hotels on Google Travel using {selector}")
-                                        hotels_found = True
-                                        
-                                        for i, hotel_elem in enumerate(hotel_elements[:5]):
-                                            try:
-                                                hotel_data = {}
-                                                
-                                                # Try multiple name selectors
-                                                name_selectors = [
-                                                    'div.BTPx6e', 
-                                                    'h2', 
-                                                    '.lmg0Lc',
-                                                    '.kPMwsc',
-                                                    'div[role="heading"]'
-                                                ]
-                                                
-                                                for name_selector in name_selectors:
-                                                    name_elem = hotel_elem.query_selector(name_selector)
-                                                    if name_elem:
-                                                        hotel_data['name'] = name_elem.inner_text().strip()
-                                                        break
-                                                
-                                                # Try multiple price selectors
-                                                price_selectors = [
-                                                    'div.a1NkSb', 
-                                                    'div.rQCNJf', 
-                                                    '.TkqmHV',
-                                                    'div.IBkO8'
-                                                ]
-                                                
-                                                for price_selector in price_selectors:
-                                                    price_elem = hotel_elem.query_selector(price_selector)
-                                                    if price_elem:
-                                                        price = price_elem.inner_text().strip()
-                                                        hotel_data['price'] = ''.join(filter(str.isdigit, price))
-                                                        break
-                                                
-                                                # Try multiple rating selectors
-                                                rating_selectors = [
-                                                    'span.KFi5wf.lA0BZ', 
-                                                    '.sSHqwe', 
-                                                    '.TBXiFf',
-                                                    'div.NPe8Qe'
-                                                ]
-                                                
-                                                for rating_selector in rating_selectors:
-                                                    rating_elem = hotel_elem.query_selector(rating_selector)
-                                                    if rating_elem:
-                                                        rating_text = rating_elem.inner_text().strip()
-                                                        # Extract numeric rating
-                                                        rating_match = re.search(r'(\d+\.\d|\d+)', rating_text)
-                                                        if rating_match:
-                                                            hotel_data['rating'] = rating_match.group(1)
-                                                        break
-                                                
-                                                # Set default values for missing fields
-                                                if 'name' in hotel_data:
-                                                    if 'location' not in hotel_data:
-                                                        hotel_data['location'] = clean_destination
-                                                        
-                                                    if 'price' not in hotel_data or not hotel_data['price']:
-                                                        # Set hotel price at an average of 1500 rupees per night
-                                                        # Add some variation based on hotel name length and index
-                                                        name_length = len(hotel_data['name'])
-                                                        base_price = 1500  # Base price of 1500 rupees per night
-                                                        variation = (i + name_length % 10) * 50  # Small variation
-                                                        hotel_data['price'] = str(base_price + variation)
-                                                        
-                                                    if 'rating' not in hotel_data:
-                                                        hotel_data['rating'] = str(4.0 + (i % 10) / 10)
-                                                        
-                                                    hotel_data['amenities'] = ["Wi-Fi", "Breakfast", "Air Conditioning", "Swimming Pool"]
-                                                    hotel_data['source'] = 'Google Travel'
-                                                    
-                                                    google_hotels.append(hotel_data)
-                                                    print(f"Added hotel from Google: {hotel_data.get('name', 'Unknown')}")
-                                                    
-                                                    if len(google_hotels) >= 3:
-                                                        break
-                                            except Exception as e:
-                                                print(f"Error extracting Google hotel {i}: {str(e)[:100]}")
-                                        
-                                        break
-                            except Exception as e:
-                                continue
-                        
-                        if google_hotels:
-                            hotel_options.extend(google_hotels)
-                            print(f"Found {len(google_hotels)} hotels via Google")
-                    except Exception as e:
-                        print(f"Error with Google Travel: {str(e)[:150]}")
-                    
-                    # Only continue with other sources if we need more hotels
-                    if len(hotel_options) < 3:
-                        # Determine which sources to try based on the attempt number
-                        if attempt == 1:
-                            sources = ["booking"]
-                        elif attempt == 2:
-                            sources = ["goibibo"]
-                        else:
-                            sources = ["makemytrip"]
-                        
-                        for source in sources:
-                            if len(hotel_options) >= 3:
-                                break  # We already have enough hotels
-                                
-                            try:
-                                if source == "booking":
-                                    new_hotels = self._try_booking_com(page, destination, start_date, end_date)
-                                elif source == "hotels":
-                                    new_hotels = self._try_hotels_com(page, destination, start_date, end_date)
-                                elif source == "goibibo":
-                                    new_hotels = self._try_goibibo(page, destination, start_date_obj, end_date_obj)
-                                elif source == "makemytrip":
-                                    # Get MakeMyTrip credentials from environment variables
-                                    mmt_username = os.getenv('MAKEMYTRIP_USERNAME')
-                                    mmt_password = os.getenv('MAKEMYTRIP_PASSWORD')
-                                    
-                                    # Clean destination for URL
-                                    clean_destination = destination.split(',')[0].strip()
-                                    
-                                    # Attempt to log in to MakeMyTrip if credentials are available
-                                    if mmt_username and mmt_password:
-                                        print(f"Attempting to log in to MakeMyTrip with credentials: {mmt_username[:3]}***")
-                                        
-                                        # Navigate to login page
-                                        login_url = "https://www.makemytrip.com/"
-                                        page.goto(login_url, wait_until="domcontentloaded", timeout=20000)
-                                        page.wait_for_timeout(3000)
-                                        
-                                        # Close modal dialog if present
-                                        try:
-                                            if page.is_visible('span.commonModal__close', timeout=2000):
-                                                page.click('span.commonModal__close')
-                                                print("Closed modal on MakeMyTrip")
-                                        except:
-                                            pass
-                                        
-                                        # Check if already logged in
-                                        logged_in = False
-                                        try:
-                                            if page.is_visible('div.makeFlex.hrtlCenter.profileSection', timeout=2000):
-                                                print("Already logged in to MakeMyTrip")
-                                                logged_in = True
-                                        except:
-                                            pass
-                                        
-                                        if not logged_in:
-                                            # Click on login/signup button
-                                            login_button_selectors = [
-                                                'li[data-cy="account"]',
-                                                'p.makeFlex.loginModal',
-                                                'button.gr_dropbtn__login',
-                                                'div.login__tab'
-                                            ]
-                                            
-                                            login_clicked = False
-                                            for selector in login_button_selectors:
-                                                try:
-                                                    if page.is_visible(selector, timeout=2000):
-                                                        page.click(selector)
-                                                        print(f"Clicked login button on MakeMyTrip using {selector}")
-                                                        login_clicked = True
-                                                        page.wait_for_timeout(2000)
-                                                        break
-                                                except:
-                                                    continue
-                                            
-                                            if login_clicked:
-                                                # Wait for login modal and enter username
-                                                try:
-                                                    page.wait_for_selector('input#username', timeout=5000)
-                                                    page.fill('input#username', mmt_username)
-                                                    page.click('button.capText.font16')
-                                                    print("Entered email for MakeMyTrip login")
-                                                    
-                                                    # Wait for password field and enter password
-                                                    page.wait_for_selector('input#password', timeout=5000)
-                                                    page.fill('input#password', mmt_password)
-                                                    page.click('button.capText.font16')
-                                                    print("Submitted login credentials for MakeMyTrip")
-                                                    
-                                                    # Wait for login to complete
-                                                    page.wait_for_timeout(5000)
-                                                    
-                                                    # Verify login success
-                                                    if page.is_visible('div.makeFlex.hrtlCenter.profileSection', timeout=3000):
-                                                        print("Successfully logged into MakeMyTrip")
-                                                    else:
-                                                        print("Login may not have succeeded, but continuing with search")
-                                                except Exception as e:
-                                                    print(f"Error during MakeMyTrip login: {str(e)[:150]}")
-                                                    print("Continuing without login")
-                                    else:
-                                        print("No MakeMyTrip credentials available, proceeding without login")
-                                    
-                                    # Construct MakeMyTrip URL for hotels
-                                    search_url = f"https://www.makemytrip.com/hotels/hotel-listing/?checkin={start_date}&city={clean_destination}&checkout={end_date}&roomStayQualifier=2e0e"
-                                    
-                                    print(f"Accessing MakeMyTrip URL: {search_url}")
-                                    page.goto(search_url, wait_until="domcontentloaded", timeout=30000)
-                                    page.wait_for_timeout(5000)
-                                    
-                                    # Handle any popups
-                                    try:
-                                        if page.is_visible('span.commonModal__close', timeout=2000):
-                                            page.click('span.commonModal__close')
-                                            print("Closed popup on MakeMyTrip hotel search page")
-                                    except:
-                                        pass
-                                    
-                                    # Extract hotel cards
-                                    new_hotels = []
-                                    hotel_cards = page.query_selector_all('div.makeFlex.hrtlCenter')
-                                    
-                                    print(f"Found {len(hotel_cards)} hotel cards on MakeMyTrip")
-                                    for i, card in enumerate(hotel_cards[:5]):
-                                        try:
-                                            hotel_name_elem = card.query_selector('p.latoBlack.font22')
-                                            hotel_name = hotel_name_elem.inner_text().strip() if hotel_name_elem else f"Hotel in {clean_destination} #{i+1}"
-                                            
-                                            location_elem = card.query_selector('p.font12.grey')
-                                            location = location_elem.inner_text().strip() if location_elem else clean_destination
-                                            
-                                            price_elem = card.query_selector('p.latoBlack.font26')
-                                            price = price_elem.inner_text().strip() if price_elem else f"₹{6000 + i*1500}"
-                                            
-                                            rating_elem = card.query_selector('span.latoBold.font12.blue')
-                                            rating = rating_elem.inner_text().strip() if rating_elem else "4.0"
-                                            
-                                            new_hotels.append({
-                                                'name': hotel_name,
-                                                'location': location,
-                                                'price': price,
-                                                'rating': rating,
-                                                'amenities': ["Wi-Fi", "AC", "Room service", "Restaurant"],
-                                                'source': 'MakeMyTrip'
-                                            })
-                                        except Exception as e:
-                                            print(f"Error extracting MakeMyTrip hotel {i}: {str(e)[:100]}")
-                                elif source == "google":
-                                    # Use Google as last resort
-                                    clean_destination = destination.split(',')[0].strip()
-                                    search_url = f"https://www.google.com/travel/search?q=hotels%20in%20{clean_destination.replace(' ', '%20')}"
-                                    
-                                    page.goto(search_url, wait_until="domcontentloaded", timeout=30000)
-                                    page.wait_for_timeout(3000)
-                                    
-                                    # Extract from Google Travel
-                                    hotel_elements = page.query_selector_all('div.PVOOXe')
-                                    
-                                    for i, hotel_elem in enumerate(hotel_elements[:5]):
-                                        try:
-                                            name_elem = hotel_elem.query_selector('div.BTPx6e')
-                                            hotel_name = name_elem.inner_text().strip() if name_elem else f"Hotel in {clean_destination} #{i+1}"
-                                            
-                                            price_elem = hotel_elem.query_selector('div.a1NkSb')
-                                            price = price_elem.inner_text().strip() if price_elem else f"₹{7000 + i*2000}"
-                                            
-                                            rating_elem = hotel_elem.query_selector('span.KFi5wf.lA0BZ')
-                                            rating = rating_elem.inner_text().strip() if rating_elem else "4.2"
-                                            
-                                            new_hotels.append({
-                                                'name': hotel_name,
-                                                'location': clean_destination,
-                                                'price': price,
-                                                'rating': rating,
-                                                'amenities': ["Wi-Fi", "Breakfast", "Parking", "Room service"],
-                                                'source': 'Google'
-                                            })
-                                        except Exception as e:
-                                            print(f"Error extracting Google hotel {i}: {str(e)[:100]}")
-                                
-                                if new_hotels:
-                                    # Add only unique hotels
-                                    seen_names = {h['name'].lower() for h in hotel_options}
-                                    for hotel in new_hotels:
-                                        if hotel['name'].lower() not in seen_names:
-                                            hotel_options.append(hotel)
-                                            seen_names.add(hotel['name'].lower())
-                                            
-                                    print(f"Total unique hotels so far: {len(hotel_options)}")
-                                    
-                                    # Break early if we have enough hotels
-                                    if len(hotel_options) >= 3:
-                                        break
-                                
-                            except Exception as e:
-                                print(f"Error with {source}: {str(e)[:150]}")
-                                continue  # Try next source
-                        
-                        # Close the browser properly
-                        try:
-                            context.close()
-                            browser.close()
-                        except Exception as e:
-                            print(f"Error closing browser: {str(e)[:100]}")
-                
+                hotel_options = gather_hotels(providers, query, limit=3, known_hotels=hotel_options)
+            except PoolSaturated as e:
+                # No retries or backoff while the browsers are overloaded
+                print(f"Browser pool saturated, using predefined hotels: {e}")
+                return self._top_up_hotels(hotel_options, destination)[:3]
             
-            except Exception as e:
-                print(f"Critical error in hotel data extraction attempt {attempt}: {str(e)[:150]}")
-                
-                # Add delay between attempts
-                if attempt < max_attempts:
-                    delay = 3 * attempt  # Progressive backoff
-                    print(f"Waiting {delay} seconds before next attempt...")
-                    time.sleep(delay)
+            if len(hotel_options) >= 3:
+                break
+            
+            # Add delay between attempts
+            if attempt < max_attempts:
+                delay = 3 * attempt  # Progressive backoff
+                if not deadline.has_time_for(delay):
+                    break
+                print(f"Waiting {delay} seconds before next attempt...")
+                time.sleep(delay)
         
         # Sort and return available hotels
         if hotel_options:
@@ -976,15 +564,254 @@ class TravelAgent:
             except Exception as e:
                 print(f"Error sorting hotels by rating: {str(e)[:100]}")
             
+            # Out of budget with only partial results: top up with predefined hotels
+            if len(hotel_options) < 3 and deadline.expired():
+                hotel_options = self._top_up_hotels(hotel_options, destination)
+                print(f"Request budget exhausted, topped up to {len(hotel_options)} hotels with predefined ones")
+            
             return hotel_options[:3]
         
         # Final fallback - destination-specific predefined hotels
         print("No hotels could be extracted. Using destination-specific predefined hotels.")
         return self._get_fallback_hotels(destination)
     
-    def _try_goibibo(self, page, destination, start_date_obj, end_date_obj):
+    def _top_up_hotels(self, hotel_options, destination):
+        """Add predefined hotels for the destination until there are three, skipping ones already listed"""
+        hotel_options = list(hotel_options)
+        seen_names = {h['name'].lower() for h in hotel_options}
+        for hotel in self._get_fallback_hotels(destination):
+            if len(hotel_options) >= 3:
+                break
+            if hotel['name'].lower() not in seen_names:
+                hotel_options.append(hotel)
+                seen_names.add(hotel['name'].lower())
+        return hotel_options
+    
+    def _try_google_travel(self, page, destination, deadline=None):
+        """Extract hotel data from Google Travel"""
+        print(f"Extracting hotel data from Google Travel for {destination}")
+        deadline = deadline or Deadline()
+        google_hotels = []
+        
+        try:
+            # Clean destination for URL
+            clean_destination = destination.split(',')[0].strip()
+        
+            # Special handling for Goa destination
+            if clean_destination.lower() in ["goa", "goi"]:
+                google_url = f"{GOOGLE_BASE_URL}/travel/hotels/Goa"
+                print(f"Using hardcoded URL for Goa hotels: {google_url}")
+            else:
+                google_url = f"{GOOGLE_BASE_URL}/travel/hotels/{clean_destination.replace(' ', '%20')}"
+        
+            mode = get_extraction_mode()
+            print(f"Accessing Google Travel URL ({mode} extraction): {google_url}")
+            if mode != 'dom':
+                # Hotels straight from the page data and search XHRs, before anything renders
+                capture = ResponseCapture(page, r'/travel/hotels|TravelFrontendUi/data/batchexecute',
+                                          lambda payload: parse_hotel_cards(payload, clean_destination))
+                try:
+                    page.goto(google_url, wait_until="commit", timeout=deadline.timeout_ms(60000))
+                    google_hotels = capture.wait_for(1, deadline.timeout_ms(NETWORK_CAPTURE_TIMEOUT_MS))[:3]
+                finally:
+                    capture.stop()
+                if google_hotels or mode == 'network':
+                    print(f"Found {len(google_hotels)} hotels in Google Travel data")
+                    return google_hotels
+                print("No hotel data captured, reading the rendered page")
+            else:
+                page.goto(google_url, timeout=deadline.timeout_ms(60000))
+            page.wait_for_load_state("domcontentloaded", timeout=deadline.timeout_ms(10000))
+            page.wait_for_timeout(deadline.timeout_ms(5000))
+        
+            # Extract hotels from Google Travel
+            google_hotel_selectors = [
+                'div.PVOOXe',
+                'c-wiz[data-node-index] div.uaTTDe',
+                'div.Ld2paf',
+                'div.kQb6Eb',
+                'div.R6S7Vc'
+            ]
+            hotel_fields = {
+                'name': ['div.BTPx6e', 'h2', '.lmg0Lc', '.kPMwsc', 'div[role="heading"]'],
+                'price': ['div.a1NkSb', 'div.rQCNJf', '.TkqmHV', 'div.IBkO8'],
+                'rating': ['span.KFi5wf.lA0BZ', '.sSHqwe', '.TBXiFf', 'div.NPe8Qe']
+            }
+        
+            wait_for_cards(page, google_hotel_selectors, deadline.timeout_ms(5000))
+            # Every card and field is read in a single round trip
+            for selector, cards in extract_cards(page, google_hotel_selectors, fields=hotel_fields, limit=5):
+                print(f"Found {len(cards)} hotels on Google Travel using {selector}")
+                for i, card in enumerate(cards):
+                    values = card['fields']
+                    name = first_valid(values['name'])
+                    if not name:
+                        continue
+                    hotel_data = {'name': name, 'location': clean_destination}
+                
+                    price = first_valid(values['price'])
+                    hotel_data['price'] = ''.join(filter(str.isdigit, price or ''))
+                    if not hotel_data['price']:
+                        # Set hotel price at an average of 1500 rupees per night
+                        # Add some variation based on hotel name length and index
+                        base_price = 1500  # Base price of 1500 rupees per night
+                        variation = (i + len(name) % 10) * 50  # Small variation
+                        hotel_data['price'] = str(base_price + variation)
+                
+                    rating_match = first_valid(values['rating'][:1], RATING_PATTERN)
+                    hotel_data['rating'] = rating_match.group(1) if rating_match else str(4.0 + (i % 10) / 10)
+                
+                    hotel_data['amenities'] = ["Wi-Fi", "Breakfast", "Air Conditioning", "Swimming Pool"]
+                    hotel_data['source'] = 'Google Travel'
+                
+                    google_hotels.append(hotel_data)
+                    print(f"Added hotel from Google: {name}")
+                
+                    if len(google_hotels) >= 3:
+                        break
+                if google_hotels:
+                    break
+        
+            if google_hotels:
+                print(f"Found {len(google_hotels)} hotels via Google")
+        except Exception as e:
+            print(f"Error with Google Travel: {str(e)[:150]}")
+        
+        return google_hotels
+    
+    def _try_makemytrip(self, page, destination, start_date, end_date, deadline=None):
+        """Extract hotel data from MakeMyTrip, logging in first when credentials are set"""
+        print(f"Extracting hotel data from MakeMyTrip for {destination}")
+        deadline = deadline or Deadline()
+        new_hotels = []
+        
+        try:
+            # Get MakeMyTrip credentials from environment variables
+            mmt_username = os.getenv('MAKEMYTRIP_USERNAME')
+            mmt_password = os.getenv('MAKEMYTRIP_PASSWORD')
+            
+            # Clean destination for URL
+            clean_destination = destination.split(',')[0].strip()
+            
+            # Attempt to log in to MakeMyTrip if credentials are available
+            if mmt_username and mmt_password:
+                print(f"Attempting to log in to MakeMyTrip with credentials: {mmt_username[:3]}***")
+                
+                # Navigate to login page
+                login_url = f"{MAKEMYTRIP_BASE_URL}/"
+                page.goto(login_url, wait_until="domcontentloaded", timeout=deadline.timeout_ms(20000))
+                page.wait_for_timeout(deadline.timeout_ms(3000))
+                
+                # Close modal dialog if present
+                try:
+                    if page.is_visible('span.commonModal__close', timeout=deadline.timeout_ms(2000)):
+                        page.click('span.commonModal__close')
+                        print("Closed modal on MakeMyTrip")
+                except:
+                    pass
+                
+                # Check if already logged in
+                logged_in = False
+                try:
+                    if page.is_visible('div.makeFlex.hrtlCenter.profileSection', timeout=deadline.timeout_ms(2000)):
+                        print("Already logged in to MakeMyTrip")
+                        logged_in = True
+                except:
+                    pass
+                
+                if not logged_in:
+                    # Click on login/signup button
+                    login_button_selectors = [
+                        'li[data-cy="account"]',
+                        'p.makeFlex.loginModal',
+                        'button.gr_dropbtn__login',
+                        'div.login__tab'
+                    ]
+                    
+                    login_clicked = False
+                    for selector in login_button_selectors:
+                        try:
+                            if page.is_visible(selector, timeout=deadline.timeout_ms(2000)):
+                                page.click(selector)
+                                print(f"Clicked login button on MakeMyTrip using {selector}")
+                                login_clicked = True
+                                page.wait_for_timeout(deadline.timeout_ms(2000))
+                                break
+                        except:
+                            continue
+                    
+                    if login_clicked:
+                        # Wait for login modal and enter username
+                        try:
+                            page.wait_for_selector('input#username', timeout=deadline.timeout_ms(5000))
+                            page.fill('input#username', mmt_username)
+                            page.click('button.capText.font16')
+                            print("Entered email for MakeMyTrip login")
+                            
+                            # Wait for password field and enter password
+                            page.wait_for_selector('input#password', timeout=deadline.timeout_ms(5000))
+                            page.fill('input#password', mmt_password)
+                            page.click('button.capText.font16')
+                            print("Submitted login credentials for MakeMyTrip")
+                            
+                            # Wait for login to complete
+                            page.wait_for_timeout(deadline.timeout_ms(5000))
+                            
+                            # Verify login success
+                            if page.is_visible('div.makeFlex.hrtlCenter.profileSection', timeout=deadline.timeout_ms(3000)):
+                                print("Successfully logged into MakeMyTrip")
+                            else:
+                                print("Login may not have succeeded, but continuing with search")
+                        except Exception as e:
+                            print(f"Error during MakeMyTrip login: {str(e)[:150]}")
+                            print("Continuing without login")
+            else:
+                print("No MakeMyTrip credentials available, proceeding without login")
+            
+            # Construct MakeMyTrip URL for hotels
+            search_url = f"{MAKEMYTRIP_BASE_URL}/hotels/hotel-listing/?checkin={start_date}&city={clean_destination}&checkout={end_date}&roomStayQualifier=2e0e"
+            
+            print(f"Accessing MakeMyTrip URL: {search_url}")
+            page.goto(search_url, wait_until="domcontentloaded", timeout=deadline.timeout_ms(30000))
+            page.wait_for_timeout(deadline.timeout_ms(5000))
+            
+            # Handle any popups
+            try:
+                if page.is_visible('span.commonModal__close', timeout=deadline.timeout_ms(2000)):
+                    page.click('span.commonModal__close')
+                    print("Closed popup on MakeMyTrip hotel search page")
+            except:
+                pass
+            
+            # Extract hotel cards, every card and field in a single round trip
+            groups = extract_cards(page, ['div.makeFlex.hrtlCenter'], limit=5, fields={
+                'name': ['p.latoBlack.font22'],
+                'location': ['p.font12.grey'],
+                'price': ['p.latoBlack.font26'],
+                'rating': ['span.latoBold.font12.blue']
+            })
+            hotel_cards = groups[0][1] if groups else []
+            
+            print(f"Found {len(hotel_cards)} hotel cards on MakeMyTrip")
+            for i, card in enumerate(hotel_cards):
+                values = card['fields']
+                new_hotels.append({
+                    'name': first_valid(values['name']) or f"Hotel in {clean_destination} #{i+1}",
+                    'location': first_valid(values['location']) or clean_destination,
+                    'price': first_valid(values['price']) or f"₹{6000 + i*1500}",
+                    'rating': first_valid(values['rating']) or "4.0",
+                    'amenities': ["Wi-Fi", "AC", "Room service", "Restaurant"],
+                    'source': 'MakeMyTrip'
+                })
+        except Exception as e:
+            print(f"Error extracting data from MakeMyTrip: {str(e)[:150]}")
+        
+        return new_hotels
+    
+    def _try_goibibo(self, page, destination, start_date_obj, end_date_obj, deadline=None):
         """Extract hotel data from Goibibo with enhanced reliability"""
         print(f"Extracting hotel data from Goibibo for {destination}")
+        deadline = deadline or Deadline()
         hotel_options = []
         
         try:
@@ -1001,9 +828,9 @@ class TravelAgent:
                 print(f"Attempting to log in to Goibibo with credentials: {goibibo_username[:3]}***")
                 
                 # Navigate to Goibibo homepage first
-                login_url = "https://www.goibibo.com/"
-                page.goto(login_url, wait_until="domcontentloaded", timeout=20000)
-                page.wait_for_timeout(3000)
+                login_url = f"{GOIBIBO_BASE_URL}/"
+                page.goto(login_url, wait_until="domcontentloaded", timeout=deadline.timeout_ms(20000))
+                page.wait_for_timeout(deadline.timeout_ms(3000))
                 
                 # Handle any popups/consent dialogs
                 popup_selectors = [
@@ -1017,7 +844,7 @@ class TravelAgent:
                 
                 for selector in popup_selectors:
                     try:
-                        if page.is_visible(selector, timeout=2000):
+                        if page.is_visible(selector, timeout=deadline.timeout_ms(2000)):
                             page.click(selector)
                             print(f"Closed popup on Goibibo using {selector}")
                             break
@@ -1027,7 +854,7 @@ class TravelAgent:
                 # Check if already logged in
                 logged_in = False
                 try:
-                    if page.is_visible('div.loggedInUser', timeout=2000) or page.is_visible('span.personIcon', timeout=2000):
+                    if page.is_visible('div.loggedInUser', timeout=deadline.timeout_ms(2000)) or page.is_visible('span.personIcon', timeout=deadline.timeout_ms(2000)):
                         print("Already logged in to Goibibo")
                         logged_in = True
                 except:
@@ -1045,11 +872,11 @@ class TravelAgent:
                     login_clicked = False
                     for selector in login_button_selectors:
                         try:
-                            if page.is_visible(selector, timeout=2000):
+                            if page.is_visible(selector, timeout=deadline.timeout_ms(2000)):
                                 page.click(selector)
                                 print(f"Clicked login button on Goibibo using {selector}")
                                 login_clicked = True
-                                page.wait_for_timeout(2000)
+                                page.wait_for_timeout(deadline.timeout_ms(2000))
                                 break
                         except:
                             continue
@@ -1066,7 +893,7 @@ class TravelAgent:
                             input_filled = False
                             for selector in input_selectors:
                                 try:
-                                    if page.is_visible(selector, timeout=4000):
+                                    if page.is_visible(selector, timeout=deadline.timeout_ms(4000)):
                                         page.fill(selector, goibibo_username)
                                         print(f"[Goibibo] Entered username using selector: {selector}")
                                         input_filled = True
@@ -1084,7 +911,7 @@ class TravelAgent:
                             continue_clicked = False
                             for cont_selector in continue_selectors:
                                 try:
-                                    if page.is_visible(cont_selector, timeout=4000):
+                                    if page.is_visible(cont_selector, timeout=deadline.timeout_ms(4000)):
                                         page.click(cont_selector)
                                         print(f"[Goibibo] Clicked continue using selector: {cont_selector}")
                                         continue_clicked = True
@@ -1093,7 +920,7 @@ class TravelAgent:
                                     print(f"[Goibibo] Failed to click continue with {cont_selector}: {e}")
                             if not continue_clicked:
                                 raise Exception("[Goibibo] Could not find continue button after username.")
-                            page.wait_for_timeout(4000)
+                            page.wait_for_timeout(deadline.timeout_ms(4000))
                             # Enter password
                             password_selectors = [
                                 'input[type="password"]',
@@ -1103,7 +930,7 @@ class TravelAgent:
                             password_filled = False
                             for pwd_selector in password_selectors:
                                 try:
-                                    if page.is_visible(pwd_selector, timeout=6000):
+                                    if page.is_visible(pwd_selector, timeout=deadline.timeout_ms(6000)):
                                         page.fill(pwd_selector, goibibo_password)
                                         print(f"[Goibibo] Entered password using selector: {pwd_selector}")
                                         password_filled = True
@@ -1121,7 +948,7 @@ class TravelAgent:
                             login_clicked = False
                             for login_selector in login_selectors:
                                 try:
-                                    if page.is_visible(login_selector, timeout=4000):
+                                    if page.is_visible(login_selector, timeout=deadline.timeout_ms(4000)):
                                         page.click(login_selector)
                                         print(f"[Goibibo] Clicked login using selector: {login_selector}")
                                         login_clicked = True
@@ -1130,10 +957,10 @@ class TravelAgent:
                                     print(f"[Goibibo] Failed to click login with {login_selector}: {e}")
                             if not login_clicked:
                                 raise Exception("[Goibibo] Could not find login button after password.")
-                            page.wait_for_timeout(5000)
+                            page.wait_for_timeout(deadline.timeout_ms(5000))
                             # Check for successful login
                             try:
-                                if page.is_visible('div.loggedInUser', timeout=4000) or page.is_visible('span.personIcon', timeout=4000):
+                                if page.is_visible('div.loggedInUser', timeout=deadline.timeout_ms(4000)) or page.is_visible('span.personIcon', timeout=deadline.timeout_ms(4000)):
                                     print("[Goibibo] Login successful!")
                                 else:
                                     print("[Goibibo] Login may have failed: user icon not visible.")
@@ -1149,14 +976,14 @@ class TravelAgent:
             clean_destination = destination.split(',')[0].strip().lower().replace(' ', '-')
             
             # Construct Goibibo URL
-            goibibo_url = f"https://www.goibibo.com/hotels/hotels-in-{clean_destination}-ct/"
+            goibibo_url = f"{GOIBIBO_BASE_URL}/hotels/hotels-in-{clean_destination}-ct/"
             goibibo_url += f"?ci={goibibo_checkin}&co={goibibo_checkout}&adults=2&children=0"
             
             print(f"Accessing Goibibo URL: {goibibo_url}")
-            page.goto(goibibo_url, wait_until="domcontentloaded", timeout=25000)
+            page.goto(goibibo_url, wait_until="domcontentloaded", timeout=deadline.timeout_ms(25000))
             
             # Wait for content to load
-            page.wait_for_timeout(5000)
+            page.wait_for_timeout(deadline.timeout_ms(5000))
             
             # Handle any popups/consent dialogs
             popup_selectors = [
@@ -1170,7 +997,7 @@ class TravelAgent:
             
             for selector in popup_selectors:
                 try:
-                    if page.is_visible(selector, timeout=2000):
+                    if page.is_visible(selector, timeout=deadline.timeout_ms(2000)):
                         page.click(selector)
                         print(f"Closed popup on Goibibo using {selector}")
                         break
@@ -1186,160 +1013,88 @@ class TravelAgent:
                 'a.tile',
                 'div.HotelCardstyles__WrapperSectionMetaDiv-sc-*'
             ]
+            hotel_fields = {
+                'name': [
+                    'h4.HotelCardstyles__HotelNameWrapperDiv-sc-*',
+                    'h3.HotelCardstyles__HotelNameWrapperDiv-sc-*',
+                    'h3.dwebCommonstyles__SmallSectionHeader-sc-*',
+                    '.SRPstyles__HotelNameText-sc-*',
+                    'h3.dwebCommonstyles__SmallSectionHeader-sc-* + div',
+                    'h1.HotelCardstyles__HotelNameWrapperH1-sc-*'
+                ],
+                'location': [
+                    'div.HotelCardstyles__LocalityWrapper-sc-*',
+                    '.SRPstyles__PDTextTop-sc-*',
+                    'div[itemprop="address"]',
+                    '.dwebCommonstyles__SmallSectionHeader-sc-* + div',
+                    'span.dwebCommonstyles__SmallText-sc-*'
+                ],
+                'price': [
+                    'div.HotelCardstyles__CurrentPriceWrapper-sc-* span',
+                    '.SRPstyles__RoomPriceText-sc-*',
+                    'span.HotelCardstyles__CurrentPrice-sc-*',
+                    'span[itemprop="price"]',
+                    'div.SRPstyles__RoomPriceNew-sc-*'
+                ],
+                'rating': [
+                    'span.HotelCardstyles__HotelRatingBadge-sc-*',
+                    '.SRPstyles__RatingPill-sc-*',
+                    'span[itemprop="ratingValue"]',
+                    'div.SRPstyles__RatingPillTexts-sc-*'
+                ],
+                'amenities': [
+                    'div.HotelCardstyles__HotelInfoWrapperDiv-sc-*',
+                    '.SRPstyles__AmenitiesContainer-sc-*',
+                    'div[data-testid="amenities"]',
+                    'div.dwebCommonstyles__SmallContentText-sc-*'
+                ]
+            }
             
-            # Wait for any selector to be visible
-            card_selector = None
-            for selector in hotel_card_selectors:
-                try:
-                    if page.is_visible(selector, timeout=5000):
-                        card_selector = selector
-                        print(f"Found hotel cards using selector: {card_selector}")
-                        break
-                except:
-                    continue
-            
-            if card_selector:
+            if wait_for_cards(page, hotel_card_selectors, deadline.timeout_ms(15000)):
                 # Give more time for all cards to load completely
-                page.wait_for_timeout(3000)
+                page.wait_for_timeout(deadline.timeout_ms(3000))
                 
-                # Extract data from hotel cards
-                hotel_cards = page.query_selector_all(card_selector)
-                print(f"Found {len(hotel_cards)} hotel cards on Goibibo")
+                # Every card and field is read in a single round trip
+                groups = extract_cards(page, hotel_card_selectors, fields=hotel_fields, limit=5)
+                card_selector, hotel_cards = groups[0] if groups else (None, [])
+                print(f"Found {len(hotel_cards)} hotel cards on Goibibo using {card_selector}")
                 
-                for i, card in enumerate(hotel_cards[:5]):  # Process up to 5 cards
-                    try:
-                        hotel_data = {}
-                        
-                        # Extract hotel name
-                        name_selectors = [
-                            'h4.HotelCardstyles__HotelNameWrapperDiv-sc-*',
-                            'h3.HotelCardstyles__HotelNameWrapperDiv-sc-*',
-                            'h3.dwebCommonstyles__SmallSectionHeader-sc-*',
-                            '.SRPstyles__HotelNameText-sc-*',
-                            'h3.dwebCommonstyles__SmallSectionHeader-sc-* + div',
-                            'h1.HotelCardstyles__HotelNameWrapperH1-sc-*'
-                        ]
-                        
-                        for selector in name_selectors:
-                            try:
-                                name_elem = card.query_selector(selector)
-                                if name_elem:
-                                    hotel_data['name'] = name_elem.inner_text().strip()
-                                    break
-                            except:
-                                continue
-                        
-                        # Extract location
-                        location_selectors = [
-                            'div.HotelCardstyles__LocalityWrapper-sc-*',
-                            '.SRPstyles__PDTextTop-sc-*',
-                            'div[itemprop="address"]',
-                            '.dwebCommonstyles__SmallSectionHeader-sc-* + div',
-                            'span.dwebCommonstyles__SmallText-sc-*'
-                        ]
-                        
-                        for selector in location_selectors:
-                            try:
-                                location_elem = card.query_selector(selector)
-                                if location_elem:
-                                    hotel_data['location'] = location_elem.inner_text().strip()
-                                    break
-                            except:
-                                continue
-                        
-                        # Extract price
-                        price_selectors = [
-                            'div.HotelCardstyles__CurrentPriceWrapper-sc-* span',
-                            '.SRPstyles__RoomPriceText-sc-*',
-                            'span.HotelCardstyles__CurrentPrice-sc-*',
-                            'span[itemprop="price"]',
-                            'div.SRPstyles__RoomPriceNew-sc-*'
-                        ]
-                        
-                        for selector in price_selectors:
-                            try:
-                                price_elem = card.query_selector(selector)
-                                if price_elem:
-                                    price_text = price_elem.inner_text().strip()
-                                    # Clean up price text, extract only numbers
-                                    price_numeric = ''.join(filter(str.isdigit, price_text))
-                                    if price_numeric:
-                                        hotel_data['price'] = price_numeric
-                                    break
-                            except:
-                                continue
-                        
-                        # Extract rating
-                        rating_selectors = [
-                            'span.HotelCardstyles__HotelRatingBadge-sc-*',
-                            '.SRPstyles__RatingPill-sc-*',
-                            'span[itemprop="ratingValue"]',
-                            'div.SRPstyles__RatingPillTexts-sc-*'
-                        ]
-                        
-                        for selector in rating_selectors:
-                            try:
-                                rating_elem = card.query_selector(selector)
-                                if rating_elem:
-                                    rating_text = rating_elem.inner_text().strip()
-                                    # Keep only numeric part and first decimal
-                                    rating_match = re.search(r'(\d+\.\d|\d+)', rating_text)
-                                    if rating_match:
-                                        hotel_data['rating'] = rating_match.group(1)
-                                    break
-                            except:
-                                continue
-                        
-                        # Extract amenities
-                        amenities_selectors = [
-                            'div.HotelCardstyles__HotelInfoWrapperDiv-sc-*',
-                            '.SRPstyles__AmenitiesContainer-sc-*',
-                            'div[data-testid="amenities"]',
-                            'div.dwebCommonstyles__SmallContentText-sc-*'
-                        ]
-                        
-                        for selector in amenities_selectors:
-                            try:
-                                amenities_elem = card.query_selector(selector)
-                                if amenities_elem:
-                                    amenities_text = amenities_elem.inner_text().strip()
-                                    amenities_list = [a.strip() for a in amenities_text.split('•') if a.strip()]
-                                    if not amenities_list:  # Try another delimiter if bullet doesn't work
-                                        amenities_list = [a.strip() for a in amenities_text.split(',') if a.strip()]
-                                    hotel_data['amenities'] = amenities_list[:4]  # Take up to 4 amenities
-                                    break
-                            except:
-                                continue
-                        
-                        # Ensure we have essential fields
-                        if 'name' in hotel_data:
-                            # Add defaults for missing fields
-                            if 'location' not in hotel_data:
-                                hotel_data['location'] = destination
-                            
-                            if 'price' not in hotel_data:
-                                # Set hotel price at an average of 1500 rupees per night
-                                # Add small variation based on hotel name length
-                                name_length = len(hotel_data['name'])
-                                base_price = 1500  # Base price of 1500 rupees per night
-                                variation = (name_length % 10) * 50  # Small variation (0-450)
-                                estimated_price = base_price + variation
-                                hotel_data['price'] = str(estimated_price)
-                            
-                            if 'rating' not in hotel_data:
-                                hotel_data['rating'] = "4.0"
-                                
-                            if 'amenities' not in hotel_data or not hotel_data['amenities']:
-                                hotel_data['amenities'] = ["Wi-Fi", "Breakfast", "AC"]
-                            
-                            # Add source information
-                            hotel_data['source'] = 'Goibibo'
-                            
-                            hotel_options.append(hotel_data)
-                            print(f"Added hotel from Goibibo: {hotel_data.get('name', 'Unknown')}")
+                for card in hotel_cards:
+                    values = card['fields']
+                    name = first_valid(values['name'])
+                    # Ensure we have essential fields
+                    if not name:
+                        continue
+                    hotel_data = {'name': name, 'location': first_valid(values['location']) or destination}
+                    
+                    # Clean up price text, extract only numbers
+                    price_numeric = ''.join(filter(str.isdigit, values['price'][0])) if values['price'] else ''
+                    if price_numeric:
+                        hotel_data['price'] = price_numeric
+                    else:
+                        # Set hotel price at an average of 1500 rupees per night
+                        # Add small variation based on hotel name length
+                        base_price = 1500  # Base price of 1500 rupees per night
+                        variation = (len(name) % 10) * 50  # Small variation (0-450)
+                        hotel_data['price'] = str(base_price + variation)
+                    
+                    # Keep only numeric part and first decimal
+                    rating_match = first_valid(values['rating'][:1], RATING_PATTERN)
+                    hotel_data['rating'] = rating_match.group(1) if rating_match else "4.0"
+                    
+                    amenities_list = []
+                    if values['amenities']:
+                        amenities_text = values['amenities'][0]
+                        amenities_list = [a.strip() for a in amenities_text.split('•') if a.strip()]
+                        if not amenities_list:  # Try another delimiter if bullet doesn't work
+                            amenities_list = [a.strip() for a in amenities_text.split(',') if a.strip()]
+                    hotel_data['amenities'] = amenities_list[:4] or ["Wi-Fi", "Breakfast", "AC"]
+                    
+                    # Add source information
+                    hotel_data['source'] = 'Goibibo'
                     
-                    except Exception as e:
-                        print(f"Error extracting data from hotel card {i}: {str(e)[:100]}")
+                    hotel_options.append(hotel_data)
+                    print(f"Added hotel from Goibibo: {name}")
             else:
                 print("No hotel cards found on Goibibo")
                 
@@ -1549,24 +1304,29 @@ class TravelAgent:
             
             return attractions
     
-    def get_real_attractions(self, destination):
+    def get_real_attractions(self, destination, deadline=None):
         """
         Get real-time tourist attractions data for a destination in India using Google Maps Places API
         with a robust fallback to a curated database for popular Indian destinations.
         
         Args:
             destination (str): The destination to search for (city in India)
+            deadline (Deadline, optional): Request budget; the API call gets only what is left
             
         Returns:
             list: A list of attraction dictionaries with name, description, and rating
         """
         print(f"Getting real attractions data for {destination}")
+        deadline = deadline or Deadline()
         
         # Normalize the city name - get only the city part and lowercase
         city = destination.split(',')[0].strip().lower()
         
         # Try to get attractions using the API first
         try:
+            if deadline.expired():
+                raise TimeoutError("request budget exhausted before the places API call")
+            
             import requests
             import random
             import os
@@ -1582,7 +1342,7 @@ class TravelAgent:
                 print(f"Using RAPIDAPI_KEY from environment variables")
             
             # This is the endpoint that works better according to the sample code
-            url = "https://google-map-places-new-v2.p.rapidapi.com/v1/places:searchText"
+            url = PLACES_API_URL
             
             payload = {
                 "textQuery": f"top tourist attractions in {city} india",
@@ -1592,13 +1352,14 @@ class TravelAgent:
             
             headers = {
                 "x-rapidapi-key": rapidapi_key,
-                "x-rapidapi-host": "google-map-places-new-v2.p.rapidapi.com",
+                "x-rapidapi-host": PLACES_API_HOST,
                 "Content-Type": "application/json",
                 "X-Goog-FieldMask": "*"
             }
             
             print(f"Querying API for attractions in {city}...")
-            response = requests.post(url, json=payload, headers=headers, timeout=15)
+            throttle(url, deadline)
+            response = requests.post(url, json=payload, headers=headers, timeout=deadline.timeout(15))
             
             if response.status_code == 200:
                 results = response.json().get('places', [])
@@ -2177,7 +1938,8 @@ class TravelAgent:
             return random.sample(tips, 5)
         return tips
         
-    def generate_itinerary(self, source, destination, start_date, num_days, travel_mode, travel_data, hotel_data):
+    def generate_itinerary(self, source, destination, start_date, num_days, travel_mode, travel_data, hotel_data, deadline=None,
+                           include_route_attractions=False):
         """
         Generate a comprehensive travel itinerary using LLM.
         
@@ -2189,16 +1951,25 @@ class TravelAgent:
             travel_mode: 'car' or 'flight'
             travel_data: Dictionary with travel options
             hotel_data: List of hotel options
+            deadline: Optional request budget (utils.deadline.Deadline) for the LLM call
+            include_route_attractions: For car trips, also ask for the attractions along the
+                route in the same completion and store them in travel_data['route_attractions']
+                (unless that list was scraped from Google), instead of a separate LLM call
             
         Returns:
             Dictionary with complete itinerary information
         """
         print(f"Generating itinerary with Groq LLM API for {source} to {destination}")
+        deadline = deadline or Deadline()
         
         if not self.groq_client:
             print("No Groq API client available. Using fallback itinerary generation instead.")
             return self._generate_fallback_itinerary(source, destination, start_date, num_days, travel_mode, travel_data, hotel_data)
         
+        if deadline.expired():
+            print("Request budget exhausted. Using fallback itinerary generation instead.")
+            return self._generate_fallback_itinerary(source, destination, start_date, num_days, travel_mode, travel_data, hotel_data)
+        
         try:
             # Parse start date
             start_date_obj = datetime.strptime(start_date, "%Y-%m-%d")
@@ -2239,83 +2010,55 @@ class TravelAgent:
                 current_date = start_date_obj + timedelta(days=day)
                 dates.append(current_date.strftime("%A, %B %d, %Y"))
             
+            # Route attractions from this same completion save a separate LLM round trip
+            want_route_attractions = include_route_attractions and travel_mode == 'car'
+            route_request = ""
+            route_schema = ""
+            if want_route_attractions:
+                source_city = source.split(',')[0].strip().lower()
+                dest_city = destination.split(',')[0].strip().lower()
+                intermediate_locations = self._find_intermediate_locations(source_city, dest_city)
+                intermediate_str = ", ".join([loc.title() for loc in intermediate_locations])
+                route_request = f"""
+            Route attractions: 5 REAL places BETWEEN {source_city.title()} and {dest_city.title()} in India (not in either city) to stop at on the drive{", e.g. in " + intermediate_str if intermediate_str else ""}; each with a 2-sentence description, a rating from 4.0 to 4.9 and its location ("In [town]" or "X km from [city]"). Include some as stops on day 1.
+            """
+                route_schema = ', "route_attractions": [{"name": "string", "description": "string", "rating": "string", "location_context": "string"}]'
+            
+            # Output budget and per-day detail scale with the trip length
+            max_tokens, detail = itinerary_token_budget(num_days, want_route_attractions)
+            
             # Create prompt for the LLM
             prompt = f"""
-            Create a detailed and engaging travel itinerary for a trip with the following details:
-            
-            TRIP DETAILS:
-            - From: {source}
-            - To: {destination}
-            - Transportation: {travel_mode_detail}
-            - Distance: {travel_distance}
-            - Travel Duration: {travel_duration}
-            - Start Date: {start_date}
-            - Duration: {num_days} days
-            
-            ACCOMMODATION:
-            - Hotel Name: {selected_hotel.get('name', 'Not specified')}
-            - Location: {selected_hotel.get('location', 'Not specified')}
-            - Price: ₹{selected_hotel.get('price', 'N/A')} per night
-            - Rating: {selected_hotel.get('rating', 'N/A')}/5
-            - Amenities: {', '.join(selected_hotel.get('amenities', ['Not specified']))}
-            
-            ATTRACTIONS:
-            {', '.join([attr.get('name', '') for attr in attractions[:8]])}
-            
-            DATES:
-            {', '.join(dates)}
-            
-            The itinerary should include:
-            1. A compelling summary of the trip highlighting the unique experiences
-            2. Detailed travel information with practical tips
-            3. Comprehensive accommodation details including nearby points of interest
-            4. Day-by-day plan with:
-               - Morning activities with specific recommendations (not generic)
-               - Afternoon activities with detailed descriptions of attractions
-               - Evening activities with restaurant suggestions and nightlife options
-               - Specific timings for activities when relevant
-            5. 5 useful travel tips specific to the destination, season, and mode of travel
-            
-            Make the itinerary HIGHLY DETAILED and SPECIFIC. Include:
-            - Names of actual restaurants, cafes, and specific locations
-            - Detailed descriptions of attractions with historical or cultural context
-            - Specific activities to do at each location (not just "visit X")
-            - Local cuisine recommendations with dish names
-            - Photography spots and viewpoints
-            - Local customs and etiquette tips
-            - Practical information like opening hours or entrance fees when relevant
-            
-            Format the response as a JSON object with the following structure:
-            {{
-                "summary": "string",
-                "travel_details": "string",
-                "accommodation": "string",
-                "daily_plans": [
-                    {{
-                        "date": "string (formatted as 'Day of week, Month day, Year')",
-                        "morning": "string",
-                        "afternoon": "string",
-                        "evening": "string"
-                    }}
-                ],
-                "tips": ["string"]
-            }}
-            
-            Ensure the JSON is properly formatted and contains all the required fields.
+            Plan a {num_days}-day trip.
+            From: {source}
+            To: {destination}
+            Transport: {travel_mode_detail}, {travel_distance}, {travel_duration}
+            Dates: {', '.join(dates)}
+            Hotel: {selected_hotel.get('name', 'Not specified')}, {selected_hotel.get('location', 'Not specified')}, ₹{selected_hotel.get('price', 'N/A')}/night, rated {selected_hotel.get('rating', 'N/A')}/5, amenities: {', '.join(selected_hotel.get('amenities', ['Not specified']))}
+            Attractions: {', '.join([attr.get('name', '') for attr in attractions[:min(8, 2 + 2 * num_days)]])}
+            {route_request}
+            Write a summary of the trip's highlights, travel details with practical tips, the accommodation with nearby points of interest, a plan for each of the {num_days} days, and 5 tips for this destination, season and mode of travel.
+            For each morning, afternoon and evening write {detail}; evenings include a restaurant or local dish.
+            
+            JSON only:
+            {{"summary": "string", "travel_details": "string", "accommodation": "string", "daily_plans": [{{"date": "Day of week, Month day, Year", "morning": "string", "afternoon": "string", "evening": "string"}}], "tips": ["string"]{route_schema}}}
             """
             
             # Query the LLM with Groq
+            llm_started = time.monotonic()
             response = self.groq_client.chat.completions.create(
                 model="llama3-70b-8192",
                 messages=[
-                    {"role": "system", "content": "You are an expert travel planner with deep knowledge of global destinations, local cuisines, cultural attractions, and travel logistics. Create highly detailed, personalized itineraries that include specific recommendations for attractions, restaurants, activities, and experiences. Focus on providing practical, actionable information that enhances the traveler's experience. Include specific names of places, historical context, and local insights that only a knowledgeable travel expert would know. Your response must be in valid JSON format only."},
+                    {"role": "system", "content": "You are an expert travel planner. Recommend real, specific places, restaurants and dishes with practical details. Reply with valid JSON only."},
                     {"role": "user", "content": prompt}
                 ],
-                max_tokens=4000,
+                max_tokens=max_tokens,
                 temperature=0.7,
                 top_p=0.9,
-                response_format={"type": "json_object"}
+                response_format={"type": "json_object"},
+                timeout=deadline.timeout(90)
             )
+            log_llm_usage("Itinerary", response, max_tokens, llm_started)
             
             # Extract the generated content
             itinerary_text = response.choices[0].message.content
@@ -2326,6 +2069,14 @@ class TravelAgent:
                 itinerary = json.loads(itinerary_text)
                 print("Successfully parsed itinerary JSON")
                 
+                if want_route_attractions:
+                    route_attractions = self._clean_llm_route_attractions(
+                        itinerary.pop("route_attractions", None) or [], source_city, dest_city, intermediate_locations)
+                    # Places scraped from the route search still take priority
+                    if len(route_attractions) >= 3 and travel_data.get('route_attractions_source') != 'scraped':
+                        travel_data['route_attractions'] = route_attractions
+                        travel_data['route_attractions_source'] = 'llm'
+                
                 # Validate the structure to ensure all required fields are present
                 required_fields = ["summary", "travel_details", "accommodation", "daily_plans", "tips"]
                 for field in required_fields:
@@ -2361,25 +2112,28 @@ class TravelAgent:
             print(f"Error generating itinerary with LLM: {str(e)[:200]}")
             return self._generate_fallback_itinerary(source, destination, start_date, num_days, travel_mode, travel_data, hotel_data) 
     
-    def get_real_route_attractions(self, source, destination):
+    def get_real_route_attractions(self, source, destination, deadline=None, use_llm=True):
         """
         Get real-time tourist attractions data between the source and destination using Llama3-70b via Groq API
         
         Args:
             source (str): The source location
             destination (str): The destination location
+            deadline (Deadline, optional): Request budget shared by the LLM and places API calls
+            use_llm (bool): Ask the LLM first; False goes straight to the places API
             
         Returns:
             list: A list of attraction dictionaries with name, description, and rating
         """
         print(f"Getting real attractions data along the route from {source} to {destination}")
+        deadline = deadline or Deadline()
         
         # Normalize the locations - get only the city part and lowercase
         source_city = source.split(',')[0].strip().lower()
         dest_city = destination.split(',')[0].strip().lower()
         
         # First try to get attractions using Llama3-70b via Groq API
-        llm_attractions = self._get_route_attractions_via_llm(source_city, dest_city)
+        llm_attractions = self._get_route_attractions_via_llm(source_city, dest_city, deadline=deadline) if use_llm else []
         if llm_attractions and len(llm_attractions) >= 3:
             print(f"Successfully retrieved {len(llm_attractions)} attractions along the route using LLM")
             return llm_attractions
@@ -2389,7 +2143,7 @@ class TravelAgent:
         route_attractions = []
         
         # Get destination attractions to avoid duplication
-        destination_attractions = self.get_real_attractions(destination)
+        destination_attractions = self.get_real_attractions(destination, deadline=deadline)
         destination_attraction_names = [a['name'] for a in destination_attractions] if destination_attractions else []
         
         try:
@@ -2408,7 +2162,7 @@ class TravelAgent:
                 print(f"Using RAPIDAPI_KEY from environment variables")
             
             # This is the endpoint that works better for place search
-            url = "https://google-map-places-new-v2.p.rapidapi.com/v1/places:searchText"
+            url = PLACES_API_URL
             
             # Try different queries to find attractions truly along the route
             search_queries = [
@@ -2430,6 +2184,9 @@ class TravelAgent:
             for query in search_queries:
                 if len(route_attractions) >= 3:
                     break
+                if deadline.expired():
+                    print("Request budget exhausted, skipping remaining route attraction queries")
+                    break
                     
                 payload = {
                     "textQuery": query,
@@ -2439,14 +2196,15 @@ class TravelAgent:
                 
                 headers = {
                     "x-rapidapi-key": rapidapi_key,
-                    "x-rapidapi-host": "google-map-places-new-v2.p.rapidapi.com",
+                    "x-rapidapi-host": PLACES_API_HOST,
                     "Content-Type": "application/json",
                     "X-Goog-FieldMask": "*"
                 }
                 
                 print(f"Querying API with: {query}")
                 try:
-                    response = requests.post(url, json=payload, headers=headers, timeout=15)
+                    throttle(url, deadline)
+                    response = requests.post(url, json=payload, headers=headers, timeout=deadline.timeout(15))
                     
                     if response.status_code == 200:
                         results = response.json().get('places', [])
@@ -2521,7 +2279,7 @@ class TravelAgent:
             
         return route_attractions
         
-    def _get_route_attractions_via_llm(self, source, destination):
+    def _get_route_attractions_via_llm(self, source, destination, deadline=None):
         """
         Use Llama3-70b via Groq API to get attractions along the route
         
@@ -2533,11 +2291,16 @@ class TravelAgent:
             list: A list of attraction dictionaries with name, description, and rating
         """
         print(f"Using Llama3-70b to find attractions between {source} and {destination}")
+        deadline = deadline or Deadline()
         
         if not self.groq_client:
             print("Groq client not available, skipping LLM-based attraction search")
             return []
         
+        if deadline.expired():
+            print("Request budget exhausted, skipping LLM-based attraction search")
+            return []
+        
         # Get intermediate locations to help with accuracy
         intermediate_locations = self._find_intermediate_locations(source, destination)
         intermediate_str = ", ".join([loc.title() for loc in intermediate_locations]) if intermediate_locations else ""    
@@ -2568,6 +2331,7 @@ class TravelAgent:
             
             # Call Groq API with Llama3-70b model
             print("Calling Groq API with Llama3-70b model...")
+            llm_started = time.monotonic()
             response = self.groq_client.chat.completions.create(
                 model="llama3-70b-8192",
                 messages=[
@@ -2575,10 +2339,12 @@ class TravelAgent:
                     {"role": "user", "content": prompt}
                 ],
                 temperature=0.2,  # Lower temperature for more factual responses
-                max_tokens=1500,
+                max_tokens=ROUTE_ATTRACTIONS_MAX_TOKENS,
                 top_p=0.95,
-                stream=False
+                stream=False,
+                timeout=deadline.timeout(60)
             )
+            log_llm_usage("Route attractions", response, ROUTE_ATTRACTIONS_MAX_TOKENS, llm_started)
             
             # Extract the response text
             response_text = response.choices[0].message.content
@@ -2606,71 +2372,7 @@ class TravelAgent:
                     # If JSON parsing fails, try to manually extract the attractions
                     attractions = self._manually_parse_llm_response(response_text, source, destination)
             
-            # Filter attractions to ensure they're not in source or destination
-            source_lower = source.lower()
-            dest_lower = destination.lower()
-            filtered_attractions = []
-            
-            for attraction in attractions:
-                name = attraction.get("name", "").lower()
-                location = attraction.get("location_context", "").lower()
-                
-                # Skip if attraction name or location contains source or destination
-                if source_lower in name or dest_lower in name:
-                    print(f"Filtering out {attraction.get('name')} - contains source/destination name")
-                    continue
-                    
-                if source_lower in location and "from " + source_lower not in location:
-                    print(f"Filtering out {attraction.get('name')} - location contains source")
-                    continue
-                    
-                if dest_lower in location and "from " + dest_lower not in location:
-                    print(f"Filtering out {attraction.get('name')} - location contains destination")
-                    continue
-                
-                # Add to filtered list
-                filtered_attractions.append(attraction)
-            
-            # Ensure we have the required fields and format
-            formatted_attractions = []
-            for attraction in filtered_attractions[:5]:  # Limit to 5 attractions
-                if "name" in attraction and "description" in attraction:
-                    # Ensure rating is in the right format
-                    if "rating" not in attraction or not isinstance(attraction["rating"], (int, float, str)):
-                        import random
-                        attraction["rating"] = f"{random.uniform(4.1, 4.9):.1f}"
-                    elif isinstance(attraction["rating"], (int, float)):
-                        attraction["rating"] = f"{float(attraction['rating']):.1f}"
-                        
-                    # Ensure location context is present
-                    if "location_context" not in attraction or not attraction["location_context"]:
-                        attraction["location_context"] = f"On the route from {source.title()} to {destination.title()}"
-                    
-                    # Enhance the description if it's too short
-                    if len(attraction["description"]) < 50:
-                        attraction["description"] += f" This is a popular stop for travelers on the route from {source.title()} to {destination.title()}."
-                        
-                    formatted_attractions.append(attraction)
-            
-            # If we have intermediate locations but no attractions, try to generate some based on those locations
-            if not formatted_attractions and intermediate_locations:
-                print("No valid attractions from LLM, generating based on intermediate locations")
-                for location in intermediate_locations[:3]:
-                    import random
-                    attraction = {
-                        "name": f"{location.title()} {random.choice(['Temple', 'Fort', 'Lake', 'Museum', 'Garden'])}",
-                        "description": f"A popular attraction in {location.title()}, known for its historical significance and beautiful surroundings. Visitors often stop here when traveling between {source.title()} and {destination.title()}.",
-                        "rating": f"{random.uniform(4.1, 4.9):.1f}",
-                        "location_context": f"In {location.title()}, between {source.title()} and {destination.title()}"
-                    }
-                    formatted_attractions.append(attraction)
-            
-            if formatted_attractions:
-                print(f"Returning {len(formatted_attractions)} attractions from LLM")
-                return formatted_attractions
-            else:
-                print("No valid attractions found in LLM response")
-                return []
+            return self._clean_llm_route_attractions(attractions, source, destination, intermediate_locations)
                 
         except Exception as e:
             print(f"Error using LLM for route attractions: {str(e)[:150]}")
@@ -2678,6 +2380,87 @@ class TravelAgent:
             print(traceback.format_exc())
             return []
             
+    def _clean_llm_route_attractions(self, attractions, source, destination, intermediate_locations=None):
+        """
+        Keep the LLM's route attractions that are really between the two cities and
+        fill in missing ratings and locations
+        
+        Args:
+            attractions (list): Attraction dictionaries parsed from the LLM response
+            source (str): Source city
+            destination (str): Destination city
+            intermediate_locations (list, optional): Towns on the route, used when nothing usable is left
+            
+        Returns:
+            list: Up to 5 attraction dictionaries with name, description, rating and location_context
+        """
+        # Filter attractions to ensure they're not in source or destination
+        source_lower = source.lower()
+        dest_lower = destination.lower()
+        filtered_attractions = []
+        
+        for attraction in attractions:
+            if not isinstance(attraction, dict):
+                continue
+            name = attraction.get("name", "").lower()
+            location = attraction.get("location_context", "").lower()
+            
+            # Skip if attraction name or location contains source or destination
+            if source_lower in name or dest_lower in name:
+                print(f"Filtering out {attraction.get('name')} - contains source/destination name")
+                continue
+                
+            if source_lower in location and "from " + source_lower not in location:
+                print(f"Filtering out {attraction.get('name')} - location contains source")
+                continue
+                
+            if dest_lower in location and "from " + dest_lower not in location:
+                print(f"Filtering out {attraction.get('name')} - location contains destination")
+                continue
+            
+            # Add to filtered list
+            filtered_attractions.append(attraction)
+        
+        # Ensure we have the required fields and format
+        formatted_attractions = []
+        for attraction in filtered_attractions[:5]:  # Limit to 5 attractions
+            if "name" in attraction and "description" in attraction:
+                # Ensure rating is in the right format
+                if "rating" not in attraction or not isinstance(attraction["rating"], (int, float, str)):
+                    import random
+                    attraction["rating"] = f"{random.uniform(4.1, 4.9):.1f}"
+                elif isinstance(attraction["rating"], (int, float)):
+                    attraction["rating"] = f"{float(attraction['rating']):.1f}"
+                    
+                # Ensure location context is present
+                if "location_context" not in attraction or not attraction["location_context"]:
+                    attraction["location_context"] = f"On the route from {source.title()} to {destination.title()}"
+                
+                # Enhance the description if it's too short
+                if len(attraction["description"]) < 50:
+                    attraction["description"] += f" This is a popular stop for travelers on the route from {source.title()} to {destination.title()}."
+                    
+                formatted_attractions.append(attraction)
+        
+        # If we have intermediate locations but no attractions, try to generate some based on those locations
+        if not formatted_attractions and intermediate_locations:
+            print("No valid attractions from LLM, generating based on intermediate locations")
+            for location in intermediate_locations[:3]:
+                import random
+                attraction = {
+                    "name": f"{location.title()} {random.choice(['Temple', 'Fort', 'Lake', 'Museum', 'Garden'])}",
+                    "description": f"A popular attraction in {location.title()}, known for its historical significance and beautiful surroundings. Visitors often stop here when traveling between {source.title()} and {destination.title()}.",
+                    "rating": f"{random.uniform(4.1, 4.9):.1f}",
+                    "location_context": f"In {location.title()}, between {source.title()} and {destination.title()}"
+                }
+                formatted_attractions.append(attraction)
+        
+        if formatted_attractions:
+            print(f"Returning {len(formatted_attractions)} attractions from LLM")
+        else:
+            print("No valid attractions found in LLM response")
+        return formatted_attractions
+        
     def _manually_parse_llm_response(self, response_text, source, destination):
         """
         Manually parse the LLM response when JSON parsing fails
@@ -3068,13 +2851,9 @@ class TravelAgent:
             prices = []
             for flight in flight_data['flight_options']:
                 if 'price' in flight:
-                    # Clean the price string to extract just the number
-                    price_str = flight['price'].replace('₹', '').replace(',', '').strip()
-                    try:
-                        price = float(price_str)
-                        prices.append(price)
-                    except ValueError:
-                        continue
+                    price = parse_amount(str(flight['price']))
+                    if price is not None:
+                        prices.append(float(price))
                     
             # Use the cheapest flight price if available
             if prices:
@@ -3088,14 +2867,9 @@ class TravelAgent:
             hotel_prices = []
             for hotel in hotel_data:
                 if 'price_per_night' in hotel:
-                    # Clean the price string
-                    price_str = hotel['price_per_night'].replace('₹', '').replace(',', '').replace('/night', '').strip()
-                    try:
-                        price = float(price_str)
-                        hotel_prices.append(price)
-                    except ValueError:
-                        # If we can't parse the price, use the default price
-                        hotel_prices.append(default_hotel_price)
+                    price = parse_amount(str(hotel['price_per_night']))
+                    # If we can't parse the price, use the default price
+                    hotel_prices.append(float(price) if price is not None else default_hotel_price)
             
             # Use average hotel price if available, otherwise use default
             if hotel_prices:
@@ -3152,16 +2926,12 @@ class TravelAgent:
                 # Calculate fuel cost: distance / mileage * price per liter
                 fuel_cost = (distance_km / AVG_CAR_MILEAGE) * FUEL_PRICE_PER_LITER
             elif 'distance' in route:
-                # Extract numeric distance
-                distance_str = route['distance'].replace('km', '').replace('mi', '').strip()
-                try:
-                    distance_km = float(distance_str.replace(',', ''))
-                    # If the distance is in miles, convert to km
-                    if 'mi' in route['distance'].lower():
-                        distance_km = distance_km * 1.60934
+                # Extract numeric distance (miles are converted to km)
+                distance_km = parse_distance_km(route['distance'])
+                if distance_km is not None:
                     # Calculate fuel cost: distance / mileage * price per liter
                     fuel_cost = (distance_km / AVG_CAR_MILEAGE) * FUEL_PRICE_PER_LITER
-                except ValueError:
+                else:
                     # Fallback to a reasonable estimate if distance parsing fails
                     if ('hyderabad' in route.get('source', '').lower() and 'goa' in route.get('destination', '').lower()) or \
                        ('hyd' in route.get('source', '').lower() and 'goa' in route.get('destination', '').lower()):
@@ -3180,14 +2950,9 @@ class TravelAgent:
             
             for hotel in hotel_data:
                 if 'price_per_night' in hotel:
-                    # Clean the price string
-                    price_str = hotel['price_per_night'].replace('₹', '').replace(',', '').replace('/night', '').strip()
-                    try:
-                        price = float(price_str)
-                        hotel_prices.append(price)
-                    except ValueError:
-                        # If we can't parse the price, use the default price
-                        hotel_prices.append(default_hotel_price)
+                    price = parse_amount(str(hotel['price_per_night']))
+                    # If we can't parse the price, use the default price
+                    hotel_prices.append(float(price) if price is not None else default_hotel_price)
             
             # Use average hotel price if available, otherwise use default
             if hotel_prices:
@@ -3280,4 +3045,23 @@ class TravelAgent:
         ]
         
         print(f"Created fallback route options with distance: {approx_distance} km")
-        return routes
\ No newline at end of file
+        return routes
+
+
+_travel_agent = None
+_travel_agent_lock = threading.Lock()
+
+
+def get_travel_agent():
+    """
+    Return the process-wide TravelAgent, creating it on first use.
+
+    The agent only holds the Groq client (which is safe to share between
+    threads), so every request and batch worker uses the same one.
+    """
+    global _travel_agent
+    if _travel_agent is None:
+        with _travel_agent_lock:
+            if _travel_agent is None:
+                _travel_agent = TravelAgent()
+    return _travel_agent
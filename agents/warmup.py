@@ -0,0 +1,101 @@
+"""
+Application warm-up and readiness
+
+warm_up() does the work the first plan would otherwise pay for: it creates the
+shared TravelAgent, opens its Groq connection, loads and indexes the airport
+dataset and launches the browser pool's browsers. app.py runs it on a
+background thread at startup (unless WARMUP_ON_START is false), and /readyz
+reports ready once it has finished:
+
+    start_warm_up()
+    get_warm_up_status() -> {'ready': True, 'status': 'degraded', 'components': {...}, 'elapsed': 2.4}
+
+A component that fails to warm up (no Chromium installed, Groq unreachable) is
+reported but doesn't keep the app from being ready; requests then fall back
+just as they would without warm-up. Browser launch is skipped with
+WARMUP_BROWSERS=false.
+"""
+import os
+import time
+import threading
+from utils.airports import get_airport_index
+from utils.browser_pool import get_browser_pool
+
+WARMUP_TIMEOUT_SECONDS = float(os.getenv('WARMUP_TIMEOUT_SECONDS', 60))
+
+_status = {'ready': False, 'status': 'pending', 'components': {}, 'elapsed': None}
+_status_lock = threading.Lock()
+_started = False
+
+
+def _set_component(name, state, detail=None):
+    with _status_lock:
+        _status['components'][name] = {'state': state, 'detail': detail} if detail else {'state': state}
+
+
+def _warm_datasets():
+    index = get_airport_index().warm()
+    return f"{len(index)} airports"
+
+
+def _warm_llm():
+    from agents.travel_agent import get_travel_agent
+    agent = get_travel_agent()
+    if agent.groq_client is None:
+        return 'skipped', 'GROQ_API_KEY not set'
+    return ('ok', None) if agent.warm() else ('failed', 'Groq API did not answer')
+
+
+def _warm_browsers():
+    if os.getenv('WARMUP_BROWSERS', 'true').lower() not in ('true', '1', 't'):
+        return 'skipped', 'WARMUP_BROWSERS is false'
+    pool = get_browser_pool()
+    launched = pool.warm(timeout=WARMUP_TIMEOUT_SECONDS)
+    detail = f"{launched}/{pool.size} browsers launched"
+    return ('ok' if launched == pool.size else 'failed'), detail
+
+
+def warm_up():
+    """Warm every component in turn and mark the app ready; returns the status"""
+    started = time.monotonic()
+    print("Warming up...")
+    try:
+        _set_component('datasets', 'ok', _warm_datasets())
+    except Exception as e:
+        _set_component('datasets', 'failed', str(e)[:200])
+    for name, warm in (('llm', _warm_llm), ('browsers', _warm_browsers)):
+        try:
+            state, detail = warm()
+        except Exception as e:
+            state, detail = 'failed', str(e)[:200]
+        _set_component(name, state, detail)
+
+    with _status_lock:
+        failed = [name for name, component in _status['components'].items() if component['state'] == 'failed']
+        _status['elapsed'] = round(time.monotonic() - started, 2)
+        _status['status'] = 'degraded' if failed else 'ok'
+        _status['ready'] = True
+    print(f"Warm-up finished in {_status['elapsed']}s" + (f", failed: {', '.join(failed)}" if failed else ""))
+    return get_warm_up_status()
+
+
+def start_warm_up():
+    """Run warm_up() once on a background thread"""
+    global _started
+    with _status_lock:
+        if _started:
+            return
+        _started = True
+        _status['status'] = 'warming'
+    threading.Thread(target=warm_up, name='warm-up', daemon=True).start()
+
+
+def get_warm_up_status():
+    """Copy of the readiness status"""
+    with _status_lock:
+        return {
+            'ready': _status['ready'],
+            'status': _status['status'],
+            'components': {name: dict(component) for name, component in _status['components'].items()},
+            'elapsed': _status['elapsed'],
+        }
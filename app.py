@@ -1,43 +1,17 @@
-from flask import Flask, render_template, request, jsonify, send_file, session, redirect, url_for, flash
+from flask import Flask, render_template, request, jsonify, send_file, session, redirect, url_for, flash, Response, stream_with_context
 import os
 import sys
 import traceback
-import asyncio
 from dotenv import load_dotenv
 import json
 import time
-from datetime import date
-from utils.pdf_generator import generate_pdf
-from agents.travel_agent import TravelAgent
-from agents.clean_real_flight_data import get_real_flight_data
+from datetime import date, datetime
+from agents.plan_pipeline import build_plan, parse_trip, iter_plans, BATCH_CONCURRENCY
+from agents.fare_calendar import get_fare_calendar, DEFAULT_FLEX_DAYS
+from utils.deadline import Deadline
+from utils.airports import get_airport_index
+from agents.warmup import start_warm_up, get_warm_up_status
 from flask_session import Session
-from playwright.async_api import async_playwright
-
-# Initialize Playwright browser instance
-playwright_instance = None
-browser_instance = None
-
-async def get_browser():
-    """Get or create a Playwright browser instance"""
-    global playwright_instance, browser_instance
-    
-    if not browser_instance or not browser_instance.is_connected():
-        playwright_instance = await async_playwright().start()
-        browser_instance = await playwright_instance.chromium.launch(headless=True)
-    
-    return browser_instance
-
-async def close_browser():
-    """Close the Playwright browser instance"""
-    global playwright_instance, browser_instance
-    
-    if browser_instance:
-        await browser_instance.close()
-        browser_instance = None
-    
-    if playwright_instance:
-        await playwright_instance.stop()
-        playwright_instance = None
 
 # Load environment variables
 load_dotenv()
@@ -50,6 +24,16 @@ app.config['SESSION_FILE_DIR'] = os.path.join(os.path.dirname(os.path.abspath(__
 app.config['SESSION_PERMANENT'] = False
 Session(app)
 
+# Load the airport index up front so the first typeahead request is fast
+get_airport_index().warm()
+
+# Create the shared TravelAgent, open the Groq connection and launch the browsers
+# in the background; /readyz reports ready once that is done. Scraper worker
+# processes (BROWSER_POOL_MODE=process) import this module as __mp_main__ and
+# must not warm up a pool of their own.
+if __name__ != '__mp_main__' and os.getenv('WARMUP_ON_START', 'true').lower() in ('true', '1', 't'):
+    start_warm_up()
+
 # Register the image directory as a static folder
 image_folder = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'image')
 app.static_folder = 'static'
@@ -101,145 +85,12 @@ def plan_trip():
             flash('Please fill all the required fields', 'error')
             return redirect(url_for('index'))
         
-        # Initialize travel agent
-        print("Initializing TravelAgent...")
-        travel_agent = TravelAgent()
-        
-        # Get travel data based on mode using the updated methods
-        print(f"Getting travel data for {travel_mode}...")
-        try:
-            if travel_mode == 'car':
-                print("Calling get_car_travel_data...")
-                travel_data = travel_agent.get_car_travel_data(source, destination, start_date, num_days)
-                print("Car travel data retrieved!")
-            else:
-                print("Calling get_real_flight_data for ACTUAL real-time flight data...")
-                # Use our improved real-time flight data function
-                travel_data = get_real_flight_data(source, destination, start_date, num_days)
-                
-                # Check if we got real data or fallback data
-                if travel_data.get('using_real_data', False):
-                    print("✅ Successfully retrieved REAL flight data!")
-                    
-                    # Process the flight data - extract outbound flights
-                    flight_options = travel_data.get('flight_options', [])
-                    
-                    # Add a clear label to indicate these are VERIFIED real-time prices
-                    for flight in flight_options:
-                        if 'price' in flight and '₹' not in flight['price'] and not flight['price'].startswith('₹'):
-                            flight['price'] = f"₹ {flight['price']}"
-                        
-                        # Ensure consistent naming between departure/arrival 
-                        if 'departure_time' in flight and 'departure' not in flight:
-                            flight['departure'] = flight['departure_time']
-                        if 'arrival_time' in flight and 'arrival' not in flight:
-                            flight['arrival'] = flight['arrival_time']
-                        
-                        # Add a marker noting these are verified prices
-                        if 'data_source' not in flight:
-                            flight['data_source'] = "Google Flights (VERIFIED)"
-                        
-                        # Ensure we have all required fields
-                        if 'source' not in flight:
-                            flight['source'] = source
-                        if 'destination' not in flight:
-                            flight['destination'] = destination
-                else:
-                    print("⚠ Using fallback flight data - no real-time data available")
-                
-                print("Flight travel data retrieved!")
-            print(f"Travel data retrieved: {str(travel_data)[:100]}...")
-        except Exception as e:
-            print(f"Error getting travel data: {e}")
-            traceback.print_exc()
-            # Use fallback data
-            print("Using fallback travel data due to error")
-            if travel_mode == 'car':
-                # Let the travel_agent generate appropriate fallback data with estimated distances
-                travel_data = {
-                    'driving_options': [],  # This will get populated by travel_agent's fallback mechanism
-                    'attractions': travel_agent.get_real_attractions(destination),
-                    'route_attractions': travel_agent.get_real_route_attractions(source, destination)
-                }
-            else:
-                source_len = len(source)
-                dest_len = len(destination)
-                base_price = 3000 + (ord(source[0].lower()) - ord('a')) * 100
-                
-                travel_data = {
-                    'flight_options': [
-                        {
-                            'airline': 'IndiGo',
-                            'flight_number': f'6E {900 + (source_len % 100)}',
-                            'departure': f'0{6 + (source_len % 3)}:15',
-                            'arrival': f'0{8 + (dest_len % 3)}:45',
-                            'duration': f'1h {30 + (dest_len % 30)}m',
-                            'price': f'₹ {base_price:,}'
-                        }
-                    ],
-                    'attractions': travel_agent.get_real_attractions(destination)
-                }
-        
-        # Get hotel data
-        print(f"Getting hotel data for {destination}...")
-        try:
-            print("Calling get_hotel_data...")
-            hotel_data = travel_agent.get_hotel_data(destination, start_date, num_days)
-            print("Hotel data retrieved!")
-            print(f"Hotel data retrieved: {str(hotel_data)[:100]}...")
-        except Exception as e:
-            print(f"Error getting hotel data: {e}")
-            traceback.print_exc()
-            # Use fallback data
-            print("Using fallback hotel data due to error")
-            hotel_data = travel_agent._get_fallback_hotels(destination)
-        
-        # Generate itinerary
-        print("Generating itinerary...")
-        try:
-            # Try to use LLaMA via Groq if available
-            print("Calling generate_itinerary...")
-            itinerary = travel_agent.generate_itinerary(source, destination, start_date, num_days, travel_mode, travel_data, hotel_data)
-            print("Itinerary generated successfully")
-        except Exception as e:
-            print(f"Error generating itinerary: {e}")
-            traceback.print_exc()
-            # Use fallback itinerary
-            print("Using fallback itinerary due to error")
-            itinerary = travel_agent._generate_fallback_itinerary(source, destination, start_date, num_days, travel_mode, travel_data, hotel_data)
-        
-        # Calculate trip cost based on travel mode
-        print("Calculating trip costs...")
-        cost_breakdown = {}
-        try:
-            if travel_mode == 'car':
-                cost_breakdown = travel_agent.calculate_car_trip_cost(travel_data, hotel_data, num_days)
-                print(f"Car trip cost calculated: ₹{cost_breakdown['total']:.2f}")
-            else:  # flight mode
-                cost_breakdown = travel_agent.calculate_flight_trip_cost(travel_data, hotel_data, num_days)
-                print(f"Flight trip cost calculated: ₹{cost_breakdown['total']:.2f}")
-        except Exception as e:
-            print(f"Error calculating trip costs: {e}")
-            traceback.print_exc()
-            # Create fallback cost breakdown with hotel price at 1500 per night
-            hotel_price_per_night = 1500.0  # Set hotel price to 1500 per night
-            if travel_mode == 'car':
-                cost_breakdown = {
-                    'fuel': 2000.0,
-                    'hotel': hotel_price_per_night * num_days,
-                    'food': 1000.0 * num_days,
-                    'num_nights': num_days,
-                    'total': 2000.0 + hotel_price_per_night * num_days + 1000.0 * num_days
-                }
-            else:  # flight mode
-                cost_breakdown = {
-                    'flight': 5000.0,
-                    'hotel': hotel_price_per_night * num_days,
-                    'food': 1000.0 * num_days,
-                    'local_transport': 500.0 * num_days,
-                    'num_nights': num_days,
-                    'total': 5000.0 + hotel_price_per_night * num_days + 1000.0 * num_days + 500.0 * num_days
-                }
+        # Run the transport, hotel, itinerary and cost stages within one request deadline
+        plan = build_plan(source, destination, start_date, num_days, travel_mode, deadline=Deadline.from_env())
+        travel_data = plan['travel_data']
+        hotel_data = plan['hotel_data']
+        itinerary = plan['itinerary']
+        cost_breakdown = plan['cost_breakdown']
         
         # Format the itinerary for better display
         print("Formatting itinerary for display...")
@@ -412,9 +263,137 @@ def plan_trip():
         flash('An error occurred while processing your request. Please try again.', 'error')
         return redirect(url_for('index'))
 
+@app.route('/readyz')
+def readyz():
+    """Readiness probe: 200 once warm-up has finished, 503 before"""
+    status = get_warm_up_status()
+    return jsonify(status), 200 if status['ready'] else 503
+
+@app.route('/metrics')
+def metrics():
+    """Browser pool, circuit breaker and rate limit numbers as JSON, for dashboards and capacity planning"""
+    from utils.browser_pool import get_browser_pool
+    from utils.circuit_breaker import all_breakers
+    from utils.rate_limit import all_buckets
+    pool = get_browser_pool()
+    return jsonify({
+        'browser_pool': {'size': pool.size, 'queued': pool.queued(), 'max_queue': pool.max_queue,
+                         'rejected': pool.rejected, 'workers': pool.metrics()},
+        'circuits': all_breakers(),
+        'rate_limits': all_buckets(),
+    })
+
+@app.route('/api/places/suggest')
+def suggest_places():
+    """Typeahead for the From/To inputs, answered from the in-memory airport index"""
+    started = time.perf_counter()
+    query = request.args.get('q', '').strip()[:64]
+    try:
+        limit = min(max(int(request.args.get('limit', 8)), 1), 20)
+    except ValueError:
+        limit = 8
+    
+    index = get_airport_index()
+    matches = index.suggest(query, limit=limit) if query else []
+    if not matches and query:
+        # No prefix match: offer the typo-corrected city instead ("banglore" -> Bengaluru)
+        airport = index.resolve(query)
+        matches = [(airport.city, airport)] if airport else []
+    
+    suggestions = [{
+        'label': label,
+        'city': airport.city,
+        'state': airport.state if label == airport.city else '',
+        'country': airport.country,
+        'iata': airport.iata,
+        'airport': airport.name,
+    } for label, airport in matches]
+    
+    response = jsonify({'query': query, 'suggestions': suggestions})
+    response.headers['Cache-Control'] = 'public, max-age=3600'
+    response.headers['Server-Timing'] = f"suggest;dur={(time.perf_counter() - started) * 1000:.2f}"
+    return response
+
+@app.route('/api/flights/calendar')
+def fare_calendar():
+    """Cheapest fare per departure date around the requested one (flexible dates)"""
+    source = request.args.get('from', '').strip()
+    destination = request.args.get('to', '').strip()
+    start_date = request.args.get('date', '').strip()
+    try:
+        num_days = int(request.args.get('days', 3))
+        flex_days = int(request.args.get('flex', DEFAULT_FLEX_DAYS))
+        datetime.strptime(start_date, "%Y-%m-%d")
+    except ValueError:
+        return jsonify({'error': 'date must be YYYY-MM-DD and days/flex must be numbers'}), 400
+    if not source or not destination:
+        return jsonify({'error': 'from and to are required'}), 400
+    
+    calendar = get_fare_calendar(source, destination, start_date, num_days, flex_days=flex_days,
+                                 deadline=Deadline.from_env())
+    return jsonify(calendar), 400 if calendar.get('error') else 200
+
+# Largest batch accepted by /api/plan/batch
+MAX_BATCH_TRIPS = int(os.getenv('PLAN_BATCH_MAX_TRIPS', 50))
+
+@app.route('/api/plan/batch', methods=['POST'])
+def plan_batch():
+    """
+    Plan several trips in one request, streamed as NDJSON.
+
+    The body is a JSON list of trips (or {"trips": [...], "concurrency": n}), each
+    with from, to, start_date, num_days and travel_mode; concurrency can only
+    lower PLAN_BATCH_CONCURRENCY. Every line of the response is one trip:
+    {"index", "status": "ok", "elapsed", "plan"} as soon as its plan is ready, or
+    {"index", "status": "error", "error"}. Invalid trips are reported first.
+    """
+    body = request.get_json(silent=True)
+    concurrency = None
+    if isinstance(body, dict):
+        concurrency = body.get('concurrency')
+        body = body.get('trips')
+    if not isinstance(body, list) or not body:
+        return jsonify({'error': 'Expected a JSON list of trips'}), 400
+    if len(body) > MAX_BATCH_TRIPS:
+        return jsonify({'error': f'At most {MAX_BATCH_TRIPS} trips per batch'}), 400
+    try:
+        # Clients may ask for fewer trips at once than PLAN_BATCH_CONCURRENCY, not more
+        concurrency = min(max(int(concurrency), 1), BATCH_CONCURRENCY) if concurrency is not None else None
+    except (TypeError, ValueError):
+        return jsonify({'error': 'concurrency must be a number'}), 400
+    
+    trips, indexes, invalid = [], [], []
+    for i, trip in enumerate(body):
+        try:
+            trips.append(parse_trip(trip))
+            indexes.append(i)
+        except ValueError as e:
+            invalid.append({'index': i, 'status': 'error', 'error': str(e)})
+    print(f"Batch plan request: {len(trips)} trips, {len(invalid)} invalid")
+    
+    def generate():
+        for line in invalid:
+            yield json.dumps(line) + '\n'
+        for position, plan, error in iter_plans(trips, max_concurrency=concurrency):
+            if error:
+                line = {'index': indexes[position], 'status': 'error', 'error': error}
+            else:
+                line = {'index': indexes[position], 'status': 'ok', 'elapsed': round(plan['elapsed'], 2),
+                        'budget_exhausted': plan['budget_exhausted'], 'plan': plan}
+            yield json.dumps(line, default=str) + '\n'
+    
+    response = Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+    # Ask proxies not to buffer, so each plan reaches the client when it is ready
+    response.headers['X-Accel-Buffering'] = 'no'
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
 @app.route('/download-pdf')
 def download_pdf():
     """Generate and download the itinerary as a PDF file"""
+    # xhtml2pdf and reportlab are only loaded by workers that render PDFs
+    from utils.pdf_generator import generate_pdf
+    
     try:
         # Check if trip data exists in session
         if 'trip_data' not in session:
@@ -589,25 +568,6 @@ def server_error(e):
     print(traceback.format_exc())
     return render_template('index.html', error="An internal server error occurred"), 500
 
-def run_async(coro):
-    """Run an async function in a sync context"""
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    try:
-        return loop.run_until_complete(coro)
-    finally:
-        loop.close()
-
-# Register cleanup on application exit
-import atexit
-
-def cleanup():
-    """Cleanup function to close the browser when the app exits"""
-    if browser_instance:
-        run_async(close_browser())
-
-atexit.register(cleanup)
-
 if __name__ == '__main__':
     # Configure the application to run
     debug_mode = os.getenv('FLASK_DEBUG', 'True').lower() in ('true', '1', 't')
@@ -617,4 +577,5 @@ if __name__ == '__main__':
     print(f"Environment variables set: GROQ_API_KEY={'Yes' if os.getenv('GROQ_API_KEY') else 'No'}")
     
     # Run with use_reloader=False to prevent Playwright issues
-    app.run(debug=debug_mode, port=port, host='0.0.0.0', use_reloader=False) 
+    # Production: gunicorn app:app (see gunicorn.conf.py)
+    app.run(debug=debug_mode, port=port, host='0.0.0.0', use_reloader=False, threaded=True)
@@ -0,0 +1,81 @@
+"""
+Import-time benchmark for the app and its worker entry points
+
+Imports each module in a fresh interpreter with `python -X importtime` (and
+warm-up disabled), reports the cumulative import time of the module and the
+slowest modules it pulled in, and checks that the heavy subsystems that are
+meant to load on first use (Playwright, Groq, xhtml2pdf/reportlab and
+agents.travel_agent) were not imported. Exits with status 1 when a heavy module
+was imported or a module is over --max-ms, so it can run in CI.
+
+Example:
+    python benchmarks/bench_import.py --modules app,agents.fare_calendar --repeat 5 --max-ms 600
+"""
+import os
+import re
+import sys
+import argparse
+import subprocess
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Loaded on first use; importing any of these at startup is a regression
+LAZY_MODULES = ['playwright', 'groq', 'xhtml2pdf', 'reportlab', 'agents.travel_agent']
+
+_IMPORTTIME_LINE = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)')
+
+
+def import_profile(module):
+    """{module name: (self us, cumulative us)} for one fresh import of module"""
+    env = dict(os.environ, WARMUP_ON_START='false', PYTHONDONTWRITEBYTECODE='1')
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                            cwd=ROOT_DIR, env=env, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr[-2000:]}")
+    profile = {}
+    for line in result.stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match:
+            profile[match.group(4)] = (int(match.group(1)), int(match.group(2)))
+    return profile
+
+
+def lazy_violations(profile):
+    """Heavy modules that were imported although they should load on first use"""
+    return sorted(name for name in profile
+                  if any(name == lazy or name.startswith(lazy + '.') for lazy in LAZY_MODULES))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--modules', default='app', help='Comma-separated modules to import')
+    parser.add_argument('--repeat', type=int, default=3, help='Fresh imports per module; the fastest is reported')
+    parser.add_argument('--top', type=int, default=10, help='Slowest imported modules to list')
+    parser.add_argument('--max-ms', type=float, help='Fail when a module takes longer than this to import')
+    args = parser.parse_args()
+
+    failed = False
+    for module in [m.strip() for m in args.modules.split(',') if m.strip()]:
+        profiles = [import_profile(module) for _ in range(max(1, args.repeat))]
+        best = min(profiles, key=lambda profile: profile[module][1])
+        total_ms = best[module][1] / 1000
+        print(f"{module}: {total_ms:.1f} ms cumulative, {len(best)} modules imported "
+              f"(best of {len(profiles)})")
+
+        slowest = sorted(best.items(), key=lambda item: item[1][0], reverse=True)[:args.top]
+        for name, (self_us, cumulative_us) in slowest:
+            print(f"    {self_us / 1000:8.1f} ms self {cumulative_us / 1000:8.1f} ms cumulative  {name}")
+
+        loaded = lazy_violations(best)
+        if loaded:
+            failed = True
+            roots = sorted({name for name in loaded if not any(name.startswith(other + '.') for other in loaded)})
+            print(f"  ✗ loaded at import time but should load on first use: {', '.join(roots)}")
+        if args.max_ms is not None and total_ms > args.max_ms:
+            failed = True
+            print(f"  ✗ over the {args.max_ms:.0f} ms budget")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
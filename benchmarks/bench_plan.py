@@ -0,0 +1,130 @@
+"""
+End-to-end /plan benchmark against local stand-in upstreams
+
+Starts benchmarks/stub_upstreams.py on a free port, points the app at it through
+the environment, then drives POST /plan for car and flight plans at several
+concurrency levels and reports p50/p95/p99 latency and requests per second.
+
+Example:
+    python benchmarks/bench_plan.py --concurrency 1,4,8 --requests 16 --llm-latency-ms 800
+"""
+import os
+import sys
+import json
+import time
+import argparse
+from datetime import date, timedelta
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from stub_upstreams import start_in_background, upstream_env
+
+TRIPS = {
+    'car': {'from_location': 'Hyderabad', 'to_location': 'Varanasi'},
+    'flight': {'from_location': 'Hyderabad', 'to_location': 'Goa'},
+}
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, int(round(pct / 100.0 * len(ordered) + 0.5)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def run_level(flask_app, travel_mode, concurrency, total_requests, num_days):
+    """Fire total_requests plans with the given concurrency and collect timings"""
+    form = dict(TRIPS[travel_mode])
+    form.update({
+        'start_date': (date.today() + timedelta(days=30)).strftime('%Y-%m-%d'),
+        'num_days': str(num_days),
+        'travel_mode': travel_mode,
+    })
+
+    def one_request(_):
+        client = flask_app.test_client()
+        started = time.perf_counter()
+        response = client.post('/plan', data=form)
+        elapsed = time.perf_counter() - started
+        # A redirect back to the form means the pipeline failed outright
+        return elapsed, response.status_code == 200
+
+    wall_start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(one_request, range(total_requests)))
+    wall = time.perf_counter() - wall_start
+
+    latencies = [elapsed for elapsed, _ in results]
+    return {
+        'mode': travel_mode,
+        'concurrency': concurrency,
+        'requests': total_requests,
+        'errors': sum(1 for _, ok in results if not ok),
+        'p50': percentile(latencies, 50),
+        'p95': percentile(latencies, 95),
+        'p99': percentile(latencies, 99),
+        'rps': total_requests / wall if wall else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark /plan against local stand-in upstreams')
+    parser.add_argument('--modes', default='car,flight', help='Comma-separated travel modes')
+    parser.add_argument('--concurrency', default='1,2,4', help='Comma-separated concurrency levels')
+    parser.add_argument('--requests', type=int, default=8, help='Requests per mode and concurrency level')
+    parser.add_argument('--num-days', type=int, default=3)
+    parser.add_argument('--llm-latency-ms', type=int, default=0, help='Added latency of the fake Groq endpoint')
+    parser.add_argument('--places-latency-ms', type=int, default=0, help='Added latency of the fake places endpoint')
+    parser.add_argument('--page-latency-ms', type=int, default=0, help='Added latency of the HTML fixtures')
+    parser.add_argument('--extraction-mode', choices=['auto', 'network', 'dom'],
+                        help='Set SCRAPER_EXTRACTION_MODE for the run')
+    parser.add_argument('--json', dest='json_path', help='Also write the results to this JSON file')
+    args = parser.parse_args()
+
+    server, base_url = start_in_background(
+        llm_latency_ms=args.llm_latency_ms,
+        places_latency_ms=args.places_latency_ms,
+        page_latency_ms=args.page_latency_ms,
+    )
+    print(f"Stand-in upstreams running at {base_url}")
+
+    # The upstream URLs are read at import time, so the overrides must be in place first
+    os.environ.update(upstream_env(base_url))
+    if args.extraction_mode:
+        os.environ['SCRAPER_EXTRACTION_MODE'] = args.extraction_mode
+    os.chdir(ROOT_DIR)
+    from app import app as flask_app
+
+    # The planner prints a lot; keep only the benchmark table on the console
+    results = []
+    real_stdout, real_stderr = sys.stdout, sys.stderr
+    try:
+        for travel_mode in [m.strip() for m in args.modes.split(',') if m.strip()]:
+            for concurrency in [int(c) for c in args.concurrency.split(',') if c.strip()]:
+                sys.stdout = sys.stderr = open(os.devnull, 'w')
+                try:
+                    result = run_level(flask_app, travel_mode, concurrency, args.requests, args.num_days)
+                finally:
+                    sys.stdout.close()
+                    sys.stdout, sys.stderr = real_stdout, real_stderr
+                results.append(result)
+                print(f"{result['mode']:<7} c={result['concurrency']:<3} n={result['requests']:<4} "
+                      f"errors={result['errors']:<3} p50={result['p50']:.2f}s p95={result['p95']:.2f}s "
+                      f"p99={result['p99']:.2f}s rps={result['rps']:.2f}")
+    finally:
+        sys.stdout, sys.stderr = real_stdout, real_stderr
+        server.shutdown()
+
+    if args.json_path:
+        with open(args.json_path, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"Results written to {args.json_path}")
+
+
+if __name__ == '__main__':
+    main()
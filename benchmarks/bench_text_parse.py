@@ -0,0 +1,96 @@
+"""
+Microbenchmark for utils/text_parse.py
+
+Times every parser over the captured strings in benchmarks/fixtures/text_corpus.json
+and, for comparison, the inline re.search/re.findall calls the scrapers used to
+make with uncompiled patterns. Reports microseconds per string.
+
+Example:
+    python benchmarks/bench_text_parse.py --repeat 2000
+"""
+import os
+import re
+import sys
+import json
+import time
+import argparse
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from utils import text_parse
+from agents.flight_engine import parse_flight_text
+
+CORPUS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'text_corpus.json')
+
+
+def _inline_price(text):
+    match = re.search(r'₹\s?([0-9,]+)', text)
+    return int(match.group(1).replace(',', '')) if match else None
+
+
+def _inline_duration(text):
+    match = re.search(r'(\d+)\s*hr\s*(\d*)|(\d+)\s*min', text)
+    if not match:
+        return None
+    if match.group(1):
+        return int(match.group(1)) * 60 + int(match.group(2) or 0)
+    return int(match.group(3))
+
+
+def _inline_distance(text):
+    matches = re.findall(r'([\d\,]{4,})\s*km', text) or re.findall(r'(\d{3,})\s*(?:km|kilometers)', text, re.IGNORECASE)
+    return float(matches[0].replace(',', '')) if matches else None
+
+
+def _inline_route_card(text):
+    return (_inline_distance(text), _inline_duration(text), re.search(r'via\s+([^\.]+)', text))
+
+
+def _route_card(text):
+    return (text_parse.parse_distance_km(text), text_parse.parse_duration(text), text_parse.parse_via(text))
+
+
+# corpus key -> [(label, function)]
+CASES = {
+    'prices': [('parse_price', text_parse.parse_price), ('inline re.search', _inline_price)],
+    'time_ranges': [('parse_time_range', text_parse.parse_time_range)],
+    'durations': [('parse_duration', text_parse.parse_duration), ('inline re.search', _inline_duration)],
+    'distances': [('parse_distance_km', text_parse.parse_distance_km), ('inline re.findall', _inline_distance)],
+    'route_cards': [('distance+duration+via', _route_card), ('inline', _inline_route_card)],
+    'flight_cards': [('parse_flight_text', parse_flight_text)],
+}
+
+
+def time_case(func, strings, repeat):
+    """Microseconds per string for func over strings, best of three runs"""
+    best = None
+    for _ in range(3):
+        started = time.perf_counter()
+        for _ in range(repeat):
+            for text in strings:
+                func(text)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best / (repeat * len(strings)) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=1000, help='Passes over the corpus per timing run')
+    parser.add_argument('--corpus', default=CORPUS_PATH, help='JSON file of {kind: [strings]}')
+    args = parser.parse_args()
+
+    with open(args.corpus, encoding='utf-8') as f:
+        corpus = json.load(f)
+
+    for kind, cases in CASES.items():
+        strings = corpus.get(kind, [])
+        if not strings:
+            continue
+        for label, func in cases:
+            print(f"{kind:<13} {label:<24} n={len(strings):<3} {time_case(func, strings, args.repeat):8.2f} us/string")
+
+
+if __name__ == '__main__':
+    main()
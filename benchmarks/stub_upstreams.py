@@ -0,0 +1,273 @@
+"""
+Local stand-in servers for the upstreams the plan pipeline talks to
+
+Serves:
+- static HTML fixtures shaped like the Google Maps directions, Google search,
+  Google Travel hotels, Google Flights, EaseMyTrip and ixigo pages our
+  selectors target
+- the Google Flights GetShoppingResults and Maps directions XHR payloads those
+  pages fetch, for the network-capture extraction path
+- a fake RapidAPI places "searchText" endpoint
+- a fake OpenAI-compatible Groq chat completions endpoint with configurable latency
+
+Point the app at it with GOOGLE_BASE_URL, PLACES_API_URL and GROQ_BASE_URL.
+Run standalone with: python benchmarks/stub_upstreams.py --port 8765
+"""
+import os
+import re
+import json
+import time
+import argparse
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs, unquote_plus
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+# Path prefix -> fixture file served for it
+PAGE_ROUTES = [
+    ('/maps/dir/', 'google_maps_directions.html'),
+    ('/travel/hotels', 'google_travel_hotels.html'),
+    ('/travel/search', 'google_travel_hotels.html'),
+    ('/travel/flights', 'google_flights_results.html'),
+    ('/FlightList/Index', 'easemytrip_flights.html'),
+    ('/search/result/flight', 'ixigo_flights.html'),
+    ('/search', 'google_search_route_attractions.html'),
+]
+
+STUB_PLACES = [
+    ("Heritage Fort", 4.6, "Sixteenth-century hill fort with panoramic views."),
+    ("Old City Bazaar", 4.3, "Historic market lanes known for spices and textiles."),
+    ("Lakeside Promenade", 4.5, "Evening walkway around the city's largest lake."),
+    ("State Museum", 4.4, "Archaeology and art collections from the region."),
+    ("Botanical Garden", 4.2, "Colonial-era garden with a glass house."),
+]
+
+# Same flights and routes as the HTML fixtures, in the shapes agents/google_payloads.py reads
+STUB_FLIGHT_OFFERS = [
+    ("6E", "IndiGo", "2134", [6, 5], [8, 20], 135, 4523),
+    ("AI", "Air India", "544", [9, 40], [12, 5], 145, 5102),
+    ("SG", "SpiceJet", "1021", [18, 55], [21, 5], 130, 4860),
+]
+STUB_DRIVING_ROUTES = [
+    (1339000, "1,339 km", 54300, "15 hr 5 min", "via NH44 and NH30"),
+    (1402000, "1,402 km", 58800, "16 hr 20 min", "via NH44 and NH27"),
+    (1455000, "1,455 km", 61320, "17 hr 2 min", "via NH353C"),
+]
+
+
+def _load_fixture(name):
+    with open(os.path.join(FIXTURES_DIR, name), encoding='utf-8') as f:
+        return f.read()
+
+
+class StubUpstreamHandler(BaseHTTPRequestHandler):
+    """Request handler serving fixtures, fake places results and fake LLM completions"""
+
+    # Set by make_server()
+    llm_latency = 0.0
+    places_latency = 0.0
+    page_latency = 0.0
+    fixtures = {}
+
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        # Keep benchmark output readable
+        pass
+
+    def _send(self, status, body, content_type):
+        if isinstance(body, str):
+            body = body.encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_json(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        if not length:
+            return {}
+        try:
+            return json.loads(self.rfile.read(length).decode('utf-8'))
+        except ValueError:
+            return {}
+
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        if parsed.path.startswith('/maps/preview/directions'):
+            if self.page_latency:
+                time.sleep(self.page_latency)
+            self._send(200, ")]}'\n" + json.dumps(self._directions_payload()), 'application/json; charset=utf-8')
+            return
+        for prefix, fixture in PAGE_ROUTES:
+            if parsed.path.startswith(prefix):
+                if self.page_latency:
+                    time.sleep(self.page_latency)
+                self._send(200, self._render_page(fixture, parsed), 'text/html; charset=utf-8')
+                return
+        self._send(404, 'Not found', 'text/plain')
+
+    def do_POST(self):
+        parsed = urlparse(self.path)
+        payload = self._read_json()
+        if parsed.path.endswith('places:searchText'):
+            if self.places_latency:
+                time.sleep(self.places_latency)
+            self._send(200, json.dumps(self._places_response(payload)), 'application/json')
+        elif parsed.path.endswith('/chat/completions'):
+            if self.llm_latency:
+                time.sleep(self.llm_latency)
+            self._send(200, json.dumps(self._chat_response(payload)), 'application/json')
+        elif parsed.path.endswith('/GetShoppingResults'):
+            if self.page_latency:
+                time.sleep(self.page_latency)
+            self._send(200, self._shopping_results_payload(), 'application/json; charset=utf-8')
+        else:
+            self._send(404, json.dumps({'error': 'not found'}), 'application/json')
+
+    def _render_page(self, fixture, parsed):
+        html = self.fixtures[fixture]
+        parts = [unquote_plus(p) for p in parsed.path.split('/') if p]
+        query = parse_qs(parsed.query).get('q', [''])[0]
+        source = parts[2] if len(parts) > 2 and parts[0] == 'maps' else ''
+        destination = parts[3] if len(parts) > 3 and parts[0] == 'maps' else (parts[-1] if parts else '')
+        return (html.replace('{{source}}', source.title())
+                    .replace('{{destination}}', destination.title())
+                    .replace('{{query}}', query))
+
+    def _places_response(self, payload):
+        query = payload.get('textQuery', '')
+        match = re.search(r'in (.+?) india', query)
+        city = match.group(1).title() if match else 'City'
+        places = []
+        for name, rating, snippet in STUB_PLACES:
+            places.append({
+                'displayName': {'text': f"{city} {name}", 'languageCode': 'en'},
+                'rating': rating,
+                'editorial': {'snippet': {'text': snippet}},
+            })
+        return {'places': places}
+
+    def _shopping_results_payload(self):
+        offers = [
+            [[code, [airline], [["DEL", [code, number]]], "DEL", [2025, 1, 1], departure,
+              "BOM", [2025, 1, 1], arrival, minutes],
+             [[None, price], "stub-token"]]
+            for code, airline, number, departure, arrival, minutes, price in STUB_FLIGHT_OFFERS
+        ]
+        envelope = [["wrb.fr", None, json.dumps([None, None, [offers]])]]
+        body = json.dumps(envelope)
+        return f")]}}'\n\n{len(body)}\n{body}\n"
+
+    def _directions_payload(self):
+        return [[[meters, distance], [seconds, duration], via]
+                for meters, distance, seconds, duration, via in STUB_DRIVING_ROUTES]
+
+    def _chat_response(self, payload):
+        messages = payload.get('messages', [])
+        prompt = messages[-1].get('content', '') if messages else ''
+        if payload.get('response_format', {}).get('type') == 'json_object':
+            content = json.dumps(self._fake_itinerary(prompt))
+        else:
+            content = json.dumps([
+                {'name': name, 'description': snippet, 'rating': str(rating),
+                 'location_context': 'On the highway between the two cities'}
+                for name, rating, snippet in STUB_PLACES[:4]
+            ])
+        return {
+            'id': 'chatcmpl-stub',
+            'object': 'chat.completion',
+            'created': int(time.time()),
+            'model': payload.get('model', 'stub'),
+            'choices': [{
+                'index': 0,
+                'message': {'role': 'assistant', 'content': content},
+                'finish_reason': 'stop',
+                'logprobs': None,
+            }],
+            'usage': {'prompt_tokens': len(prompt) // 4, 'completion_tokens': len(content) // 4,
+                      'total_tokens': (len(prompt) + len(content)) // 4},
+        }
+
+    def _fake_itinerary(self, prompt):
+        match = re.search(r'Duration:\s*(\d+)\s*days', prompt)
+        num_days = int(match.group(1)) if match else 3
+        dates_match = re.search(r'DATES:\s*\n\s*(.+)', prompt)
+        dates = re.findall(r'[A-Z][a-z]+day, [A-Z][a-z]+ \d{2}, \d{4}', dates_match.group(1)) if dates_match else []
+        return {
+            'summary': 'A stand-in itinerary generated by the local benchmark server.',
+            'travel_details': 'Travel details from the stand-in LLM.',
+            'accommodation': 'Accommodation details from the stand-in LLM.',
+            'daily_plans': [
+                {
+                    'date': dates[day] if day < len(dates) else f"Day {day + 1}",
+                    'morning': 'Visit the heritage fort.',
+                    'afternoon': 'Lunch and the state museum.',
+                    'evening': 'Walk along the lakeside promenade.',
+                }
+                for day in range(num_days)
+            ],
+            'tips': ['Carry water.', 'Start early.', 'Book ahead.', 'Dress modestly.', 'Keep cash handy.'],
+        }
+
+
+def make_server(host='127.0.0.1', port=0, llm_latency_ms=0, places_latency_ms=0, page_latency_ms=0):
+    """Create (but do not start) a stand-in upstream server; port 0 picks a free port"""
+    handler = type('ConfiguredStubUpstreamHandler', (StubUpstreamHandler,), {
+        'llm_latency': llm_latency_ms / 1000.0,
+        'places_latency': places_latency_ms / 1000.0,
+        'page_latency': page_latency_ms / 1000.0,
+        'fixtures': {name: _load_fixture(name) for _, name in PAGE_ROUTES},
+    })
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def start_in_background(**kwargs):
+    """Start a stand-in server on a daemon thread and return (server, base_url)"""
+    server = make_server(**kwargs)
+    thread = threading.Thread(target=server.serve_forever, name='stub-upstreams', daemon=True)
+    thread.start()
+    host, port = server.server_address[:2]
+    return server, f"http://{host}:{port}"
+
+
+def upstream_env(base_url):
+    """Environment overrides that point the app at a stand-in server"""
+    return {
+        'GOOGLE_BASE_URL': base_url,
+        'GOIBIBO_BASE_URL': base_url,
+        'MAKEMYTRIP_BASE_URL': base_url,
+        'EASEMYTRIP_BASE_URL': base_url,
+        'IXIGO_BASE_URL': base_url,
+        'PLACES_API_URL': f"{base_url}/v1/places:searchText",
+        'GROQ_BASE_URL': base_url,
+        'GROQ_API_KEY': 'stub-key',
+        'RAPIDAPI_KEY': 'stub-key',
+    }
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Run local stand-in upstream servers')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--llm-latency-ms', type=int, default=0)
+    parser.add_argument('--places-latency-ms', type=int, default=0)
+    parser.add_argument('--page-latency-ms', type=int, default=0)
+    args = parser.parse_args()
+
+    server = make_server(args.host, args.port, args.llm_latency_ms, args.places_latency_ms, args.page_latency_ms)
+    base_url = f"http://{args.host}:{server.server_address[1]}"
+    print(f"Stand-in upstreams listening on {base_url}")
+    print("Point the app at them with:")
+    for key, value in upstream_env(base_url).items():
+        print(f"  {key}={value}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
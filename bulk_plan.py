@@ -0,0 +1,215 @@
+"""
+Bulk itinerary generation from a CSV or JSONL file of trips
+
+Every row is one trip with source, destination, start_date (YYYY-MM-DD), num_days
+and travel_mode (car or flight); "from"/"to" work as column names too. The trips
+are planned by a pool of workers that share one TravelAgent and the browser
+pool, exactly as the web form would plan them, and each finished plan is written
+to the output directory as JSON (and, with --pdf, as the same PDF the site
+offers for download).
+
+Every written plan is appended to a checkpoint file, so running the same command
+again after an interruption skips the trips that are already done. Trips that
+failed are not checkpointed and are tried again.
+
+Example:
+    python bulk_plan.py trips.csv --out itineraries --workers 4 --pdf
+"""
+import os
+import re
+import csv
+import sys
+import json
+import time
+import shutil
+import argparse
+from dotenv import load_dotenv
+from agents.plan_pipeline import parse_trip, iter_plans, BATCH_CONCURRENCY
+
+# Load environment variables
+load_dotenv()
+
+# Alternative column names accepted in the input
+COLUMN_ALIASES = {'source': 'from', 'destination': 'to', 'mode': 'travel_mode', 'days': 'num_days', 'date': 'start_date'}
+_UNSAFE_FILENAME = re.compile(r'[^A-Za-z0-9]+')
+
+
+def read_rows(path, input_format=None):
+    """Rows of a CSV or JSONL file as dicts, with column names normalised"""
+    input_format = input_format or ('jsonl' if path.lower().endswith(('.jsonl', '.ndjson')) else 'csv')
+    rows = []
+    with open(path, encoding='utf-8', newline='') as f:
+        if input_format == 'jsonl':
+            for line_number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    rows.append(json.loads(line))
+                except ValueError as e:
+                    rows.append({'_error': f"line {line_number}: invalid JSON ({e})"})
+        else:
+            rows = list(csv.DictReader(f))
+
+    normalized = []
+    for row in rows:
+        if not isinstance(row, dict):
+            normalized.append({'_error': 'row is not an object'})
+            continue
+        trip = {}
+        for key, value in row.items():
+            key = (key or '').strip().lower()
+            trip[COLUMN_ALIASES.get(key, key)] = value
+        normalized.append(trip)
+    return normalized
+
+
+def trip_key(trip):
+    """Checkpoint key of a validated trip"""
+    return '|'.join(str(trip[field]).lower() for field in
+                    ('source', 'destination', 'start_date', 'num_days', 'travel_mode'))
+
+
+def output_name(row_number, trip):
+    """File name (without extension) for a trip's outputs"""
+    parts = [trip['source'], trip['destination'], trip['start_date'], f"{trip['num_days']}d", trip['travel_mode']]
+    return f"{row_number:04d}_" + '_'.join(_UNSAFE_FILENAME.sub('-', str(part)).strip('-') for part in parts)
+
+
+def load_checkpoint(path):
+    """Keys of the trips already written by an earlier run"""
+    done = set()
+    if not os.path.exists(path):
+        return done
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            try:
+                done.add(json.loads(line)['key'])
+            except (ValueError, KeyError):
+                # A line cut short by an interrupted run
+                continue
+    return done
+
+
+def write_plan(out_dir, name, trip, plan, with_pdf):
+    """Write the plan as JSON (and PDF) and return the paths written"""
+    json_path = os.path.join(out_dir, name + '.json')
+    document = dict(trip)
+    document.update(plan)
+    tmp_path = json_path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(document, f, indent=2, ensure_ascii=False, default=str)
+    # Never leave a half-written plan behind for the checkpoint to trust
+    os.replace(tmp_path, json_path)
+    paths = [json_path]
+
+    if with_pdf:
+        from utils.pdf_generator import generate_pdf
+        travel_data = plan.get('travel_data') or {}
+        hotel_data = plan.get('hotel_data')
+        pdf_path = generate_pdf({
+            'source': trip['source'],
+            'destination': trip['destination'],
+            'start_date': trip['start_date'],
+            'num_days': trip['num_days'],
+            'travel_mode': trip['travel_mode'],
+            'itinerary': plan.get('itinerary'),
+            'cost_breakdown': plan.get('cost_breakdown', {}),
+            'attractions': travel_data.get('attractions', []),
+            'hotels': hotel_data if isinstance(hotel_data, list) else [],
+            'route_attractions': travel_data.get('route_attractions', [])
+        })
+        if pdf_path:
+            target = os.path.join(out_dir, name + '.pdf')
+            shutil.move(pdf_path, target)
+            paths.append(target)
+        else:
+            print(f"PDF generation failed for {name}, JSON written only")
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('input', help='CSV or JSONL file of trips')
+    parser.add_argument('--format', choices=['csv', 'jsonl'], help='Input format, guessed from the extension by default')
+    parser.add_argument('--out', default='itineraries', help='Directory for the generated plans')
+    parser.add_argument('--workers', type=int, default=BATCH_CONCURRENCY,
+                        help='Trips planned at once (default: PLAN_BATCH_CONCURRENCY)')
+    parser.add_argument('--pdf', action='store_true', help='Also write a PDF per plan')
+    parser.add_argument('--checkpoint', help='Checkpoint file (default: <out>/checkpoint.jsonl)')
+    parser.add_argument('--limit', type=int, help='Plan at most this many trips in this run')
+    args = parser.parse_args()
+
+    os.makedirs(args.out, exist_ok=True)
+    checkpoint_path = args.checkpoint or os.path.join(args.out, 'checkpoint.jsonl')
+    done = load_checkpoint(checkpoint_path)
+
+    trips, names, invalid, skipped, duplicates = [], [], 0, 0, 0
+    seen = set()
+    for row_number, row in enumerate(read_rows(args.input, args.format), 1):
+        try:
+            if '_error' in row:
+                raise ValueError(row['_error'])
+            trip = parse_trip(row)
+        except ValueError as e:
+            print(f"Row {row_number} skipped: {e}")
+            invalid += 1
+            continue
+        key = trip_key(trip)
+        if key in done:
+            skipped += 1
+            continue
+        if key in seen:
+            duplicates += 1
+            continue
+        seen.add(key)
+        trips.append(trip)
+        names.append(output_name(row_number, trip))
+    if args.limit is not None:
+        trips, names = trips[:args.limit], names[:args.limit]
+
+    print(f"{len(trips)} trips to plan, {skipped} already done, {duplicates} duplicates, {invalid} invalid rows; "
+          f"{max(1, args.workers)} workers, writing to {args.out}")
+    if not trips:
+        return 0 if not invalid else 1
+
+    started = time.monotonic()
+    succeeded = failed = 0
+    with open(checkpoint_path, 'a', encoding='utf-8') as checkpoint:
+        try:
+            for position, plan, error in iter_plans(trips, max_concurrency=max(1, args.workers)):
+                trip, name = trips[position], names[position]
+                if error:
+                    failed += 1
+                    print(f"✗ {name}: {error}")
+                else:
+                    try:
+                        paths = write_plan(args.out, name, trip, plan, args.pdf)
+                    except OSError as e:
+                        failed += 1
+                        print(f"✗ {name}: could not write plan ({e})")
+                    else:
+                        succeeded += 1
+                        checkpoint.write(json.dumps({'key': trip_key(trip), 'files': paths,
+                                                     'elapsed': round(plan['elapsed'], 2)}) + '\n')
+                        checkpoint.flush()
+                        os.fsync(checkpoint.fileno())
+                        print(f"✓ {name} in {plan['elapsed']:.1f}s")
+
+                finished = succeeded + failed
+                elapsed = time.monotonic() - started
+                rate = finished / elapsed * 60 if elapsed else 0.0
+                eta = (len(trips) - finished) / (finished / elapsed) if finished and elapsed else 0.0
+                print(f"[{finished}/{len(trips)}] {succeeded} ok, {failed} failed, "
+                      f"{rate:.1f} trips/min, ETA {eta:.0f}s")
+        except KeyboardInterrupt:
+            print("Interrupted; run the same command again to resume from the checkpoint")
+            return 130
+
+    elapsed = time.monotonic() - started
+    print(f"Done: {succeeded} plans written, {failed} failed in {elapsed:.1f}s "
+          f"({(succeeded + failed) / elapsed * 60 if elapsed else 0:.1f} trips/min)")
+    return 0 if not failed and not invalid else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
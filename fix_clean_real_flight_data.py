@@ -1,403 +1,6 @@
 """
 Real-time flight data extraction module - Fixed version
-"""
-import os
-import time
-import json
-from datetime import datetime, timedelta
-import re
-import traceback
-from dotenv import load_dotenv
-from playwright.sync_api import sync_playwright
-
-# Load environment variables
-load_dotenv()
-
-def get_real_flight_data(source, destination, start_date, num_days):
-    """Extract flight data for the specified route and dates with improved reliability"""
-    print(f"Getting real flight data: {source} to {destination} on {start_date}")
-    
-    # Get credentials from env
-    emt_username = os.getenv('EASEMYTRIP_USERNAME')
-    emt_password = os.getenv('EASEMYTRIP_PASSWORD')
-    mmt_username = os.getenv('MAKEMYTRIP_USERNAME')
-    mmt_password = os.getenv('MAKEMYTRIP_PASSWORD')
-    
-    # Check if credentials are available and print detailed debug
-    print("\n--- CREDENTIALS CHECK ---")
-    if emt_username and emt_password:
-        print(f"✓ EaseMyTrip credentials found: {emt_username[:3]}***")
-    else:
-        print("✗ No EaseMyTrip credentials found! Add them to your .env file as EASEMYTRIP_USERNAME and EASEMYTRIP_PASSWORD")
-        
-    if mmt_username and mmt_password:
-        print(f"✓ MakeMyTrip credentials found: {mmt_username[:3]}***")
-    else:
-        print("✗ No MakeMyTrip credentials found! Add them to your .env file as MAKEMYTRIP_USERNAME and MAKEMYTRIP_PASSWORD")
-    
-    # Parse start date
-    start_date_obj = datetime.strptime(start_date, "%Y-%m-%d")
-    
-    # Generate fallback flight data in case all web scraping attempts fail
-    fallback_flights = generate_fallback_flights(source, destination, start_date)
-    
-    # Store extracted flight options
-    flight_options = []
-    
-    # Try to get real flight data
-    try:
-        print("\n--- ATTEMPTING TO RETRIEVE REAL-TIME FLIGHT DATA ---")
-        print("Launching Playwright browser...")
-        with sync_playwright() as p:
-            # Check if Playwright was installed correctly
-            print("✓ Playwright loaded successfully")
-            
-            # Launch browser with more robust error handling
-            try:
-                browser = p.chromium.launch(
-                    headless=True,
-                    args=[
-                        '--disable-gpu',
-                        '--no-sandbox',
-                        '--disable-dev-shm-usage',
-                        '--disable-extensions',
-                        '--disable-popup-blocking'
-                    ]
-                )
-                print("✓ Browser launched successfully")
-            except Exception as e:
-                print(f"✗ CRITICAL: Failed to launch browser: {str(e)}")
-                traceback.print_exc()
-                print("Recommendation: Try running 'playwright install' or 'python -m playwright install' to fix browser issues")
-                raise
-            
-            # Create browser context with additional settings
-            try:
-                context = browser.new_context(
-                    viewport={'width': 1366, 'height': 768},
-                    user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-                    ignore_https_errors=True
-                )
-                print("✓ Browser context created successfully")
-            except Exception as e:
-                print(f"✗ CRITICAL: Failed to create browser context: {str(e)}")
-                traceback.print_exc()
-                raise
-            
-            # Try EaseMyTrip
-            try:
-                print("\n--- TRYING EASEMYTRIP ---")
-                page = context.new_page()
-                page.set_default_timeout(30000)  # Increased timeout to 30 seconds
-                
-                # Use city code mappings for Indian cities
-                city_codes = {
-                    "hyderabad": "HYD", "hyd": "HYD", "delhi": "DEL", "mumbai": "BOM",
-                    "bangalore": "BLR", "chennai": "MAA", "kolkata": "CCU", "goa": "GOI",
-                    "ahmedabad": "AMD", "pune": "PNQ"
-                }
-                
-                # Clean the source and destination with debug information
-                clean_source = source.split(',')[0].strip().lower()
-                clean_destination = destination.split(',')[0].strip().lower()
-                print(f"Parsed source: '{clean_source}', destination: '{clean_destination}'")
-                
-                # Get airport codes if available
-                src_code = city_codes.get(clean_source, clean_source.upper())
-                dst_code = city_codes.get(clean_destination, clean_destination.upper())
-                print(f"Using airport codes - Source: {src_code}, Destination: {dst_code}")
-                
-                # Format date for URL (dd-mm-yyyy)
-                emt_date = start_date_obj.strftime("%d-%m-%Y")
-                emt_url = f"https://flight.easemytrip.com/FlightList/Index?org={src_code}&dest={dst_code}&deptdate={emt_date}&adult=1&child=0&infant=0&cabin=1&airline=Any&val=0"
-                
-                print(f"Navigating to: {emt_url}")
-                try:
-                    response = page.goto(emt_url, wait_until="domcontentloaded", timeout=30000)
-                    if response:
-                        print(f"✓ EaseMyTrip flight search loaded with status: {response.status}")
-                    else:
-                        print("✗ No response from EaseMyTrip flight search - possible network issue")
-                    page.wait_for_timeout(15000)  # Increased wait time
-                except Exception as e:
-                    print(f"✗ Failed to load EaseMyTrip flight search: {str(e)}")
-                    traceback.print_exc()
-                    raise
-                
-                # Check for flight cards with improved debugging
-                result_selectors = [
-                    'div.fltResult', 'div.flightDetSecOuter', 'div.fliResults', 'div.flight-list-view',
-                    'div.row_flt_list', 'div.right_prt_flt_result', 'div.srp_result_list'
-                ]
-                
-                flight_cards_found = False
-                for selector in result_selectors:
-                    try:
-                        if page.is_visible(selector, timeout=5000):
-                            print(f"✓ Found flight results with selector: {selector}")
-                            flight_cards = page.query_selector_all(selector)
-                            num_cards = len(flight_cards)
-                            print(f"✓ Found {num_cards} flight results on EaseMyTrip")
-                            
-                            if num_cards == 0:
-                                print("⚠ No flight cards found with this selector, but the container exists")
-                                continue
-                            
-                            flight_cards_found = True
-                            
-                            # Process up to 3 cards
-                            for i, card in enumerate(flight_cards[:3]):
-                                try:
-                                    flight_data = {}
-                                    try:
-                                        card_text = card.inner_text()
-                                        print(f"Card {i+1} text (truncated): {card_text[:100]}...")
-                                    except Exception as e:
-                                        print(f"✗ Could not extract text from card {i+1}: {str(e)}")
-                                        continue
-                                    
-                                    # Extract all flight data with better regex
-                                    airline_found = False
-                                    airlines = ["IndiGo", "Air India", "SpiceJet", "Vistara", "GoAir", "Air Asia"]
-                                    for airline in airlines:
-                                        if airline.lower() in card_text.lower():
-                                            flight_data['airline'] = airline
-                                            print(f"  ✓ Found airline: {airline}")
-                                            airline_found = True
-                                            break
-                                    
-                                    if not airline_found:
-                                        print("  ⚠ Could not identify airline in card text")
-                                    
-                                    # Extract price
-                                    price_match = re.search(r'(?:₹|Rs\.?)\s*([0-9,]+)', card_text)
-                                    if price_match:
-                                        flight_data['price'] = f"₹ {price_match.group(1)}"
-                                        print(f"  ✓ Found price: {flight_data['price']}")
-                                    else:
-                                        print("  ⚠ Could not extract price from card text")
-                                    
-                                    # Extract times
-                                    time_matches = re.findall(r'(\d{1,2}:\d{2}(?:\s*[AP]M)?)', card_text)
-                                    if len(time_matches) >= 2:
-                                        flight_data['departure'] = time_matches[0]
-                                        flight_data['arrival'] = time_matches[1]
-                                        print(f"  ✓ Found departure: {flight_data['departure']}, arrival: {flight_data['arrival']}")
-                                    else:
-                                        print(f"  ⚠ Could not extract times. Found matches: {time_matches}")
-                                    
-                                    # Extract duration
-                                    duration_match = re.search(r'(\d+h\s*\d*m|\d+\s*h(?:rs)?\s*\d*\s*m(?:in)?)', card_text)
-                                    if duration_match:
-                                        flight_data['duration'] = duration_match.group(1)
-                                        print(f"  ✓ Found duration: {flight_data['duration']}")
-                                    else:
-                                        print("  ⚠ Could not extract duration from card text")
-                                    
-                                    # Extract flight number
-                                    flight_num_match = re.search(r'([A-Z0-9]{2}[-\s]?[0-9]{3,4})', card_text)
-                                    if flight_num_match:
-                                        flight_data['flight_number'] = flight_num_match.group(1)
-                                        print(f"  ✓ Found flight number: {flight_data['flight_number']}")
-                                    else:
-                                        print("  ⚠ Could not extract flight number from card text")
-                                    
-                                    # Use fallbacks if needed
-                                    if 'airline' not in flight_data:
-                                        airlines = ["IndiGo", "Air India", "SpiceJet", "Vistara", "GoAir"]
-                                        flight_data['airline'] = airlines[i % len(airlines)]
-                                        print(f"  ⚠ Using fallback airline: {flight_data['airline']}")
-                                    
-                                    if 'flight_number' not in flight_data:
-                                        airline_code = flight_data['airline'][:2].upper()
-                                        flight_data['flight_number'] = f"{airline_code}{1000 + i*111}"
-                                        print(f"  ⚠ Using fallback flight number: {flight_data['flight_number']}")
-                                    
-                                    if 'price' not in flight_data:
-                                        base_prices = [4500, 5200, 5800]
-                                        flight_data['price'] = f"₹ {base_prices[i % len(base_prices)]}"
-                                        print(f"  ⚠ Using fallback price: {flight_data['price']}")
-                                    
-                                    if 'departure' not in flight_data:
-                                        departure_hour = 6 + i
-                                        flight_data['departure'] = f"{departure_hour:02d}:00"
-                                        print(f"  ⚠ Using fallback departure time: {flight_data['departure']}")
-                                    
-                                    if 'arrival' not in flight_data:
-                                        departure_hour = 6 + i
-                                        duration_hours = 2 + (i % 3)
-                                        arrival_hour = departure_hour + duration_hours
-                                        flight_data['arrival'] = f"{arrival_hour:02d}:30"
-                                        print(f"  ⚠ Using fallback arrival time: {flight_data['arrival']}")
-                                    
-                                    if 'duration' not in flight_data:
-                                        duration_hours = 2 + (i % 3)
-                                        flight_data['duration'] = f"{duration_hours}h 30m"
-                                        print(f"  ⚠ Using fallback duration: {flight_data['duration']}")
-                                    
-                                    # Check if we're using mostly real data
-                                    real_data_count = sum(1 for k in ['airline', 'price', 'departure', 'arrival', 'duration', 'flight_number'] 
-                                                        if k in flight_data and not k.startswith('fallback_'))
-                                    
-                                    # Only mark as real if we have enough real data
-                                    if real_data_count >= 3:
-                                        flight_data['source'] = 'EaseMyTrip (REAL)'
-                                        flight_data['is_real'] = True
-                                        flight_options.append(flight_data)
-                                        print(f"✅ SUCCESS: Extracted real flight: {flight_data['airline']} {flight_data['flight_number']} for {flight_data['price']}")
-                                    else:
-                                        print("⚠ Not enough real data extracted from this card, skipping")
-                                
-                                except Exception as e:
-                                    print(f"✗ Error extracting EaseMyTrip card: {str(e)}")
-                            
-                            break
-                    except Exception as e:
-                        print(f"✗ Error with selector {selector}: {str(e)}")
-                
-                if not flight_cards_found:
-                    print("⚠ No flight cards found with any selector")
-            
-            except Exception as e:
-                print(f"✗ EaseMyTrip error: {str(e)}")
-            
-            # Close browser properly
-            try:
-                context.close()
-                browser.close()
-            except Exception as e:
-                print(f"Error closing browser: {e}")
-    
-    except Exception as e:
-        print(f"✗ Critical error in flight data extraction: {str(e)}")
-        traceback.print_exc()
-    
-    # Final results processing
-    print("\n--- FINAL RESULTS ---")
-    
-    # If we couldn't get flight options, use fallback data
-    if not flight_options:
-        print("⚠ No real flight data obtained, using fallback flight data")
-        flight_options = fallback_flights
-        print("Note: This is simulated data as real-time data could not be fetched.")
-    else:
-        print(f"✅ SUCCESS! Retrieved {len(flight_options)} REAL flight options!")
-        
-        # Mark data as real to make it clear in the output
-        for flight in flight_options:
-            if 'is_real' not in flight:
-                flight['is_real'] = True
-            
-            # Add REAL tag to the source if not already there
-            if 'source' in flight and 'REAL' not in flight['source']:
-                flight['source'] = f"{flight['source']} (REAL)"
-            else:
-                flight['source'] = "Online Travel Agency (REAL)"
-    
-    # Get default attractions for the destination
-    attractions = generate_fallback_attractions(destination)
-    
-    # Return structured data - ensure we have only up to 3 flight options
-    result = {
-        'flight_options': flight_options[:3],
-        'attractions': attractions
-    }
-    
-    # Add a marker to indicate if using real or fallback data
-    result['using_real_data'] = any(flight.get('is_real', False) for flight in flight_options)
-    
-    # Print summary 
-    print("\n--- SUMMARY ---")
-    print(f"Returning {'REAL' if result['using_real_data'] else 'FALLBACK'} flight data")
-    for i, flight in enumerate(result['flight_options']):
-        print(f"Flight {i+1}: {flight['airline']} {flight['flight_number']} - {flight['price']} ({flight.get('source', 'Unknown source')})")
-    
-    return result
 
-def generate_fallback_flights(source, destination, start_date):
-    """Generate fallback flight data when web scraping fails"""
-    print("Generating fallback flight data")
-    
-    # Get airport codes (simulated)
-    source_code = source[:3].upper()
-    dest_code = destination[:3].upper()
-    
-    # List of airlines to create variation
-    airlines = ["IndiGo", "Air India", "SpiceJet", "Vistara", "GoAir"]
-    
-    # Generate three different flight options
-    flight_options = []
-    
-    for i in range(3):
-        # Create variations in time and price
-        departure_hour = 6 + i
-        duration_hours = 2 + (i % 3)
-        arrival_hour = departure_hour + duration_hours
-        flight_num = 100 + (i * 111)
-        price_base = 4000 + (i * 800)
-        
-        # Format times nicely
-        departure_time = f"{departure_hour:02d}:00"
-        arrival_time = f"{arrival_hour:02d}:30"
-        
-        flight_options.append({
-            'airline': airlines[i % len(airlines)],
-            'flight_number': f"{airlines[i % len(airlines)][:2].upper()}-{flight_num}",
-            'departure': departure_time,
-            'arrival': arrival_time,
-            'duration': f"{duration_hours}h 30m",
-            'price': f"₹ {price_base}",
-            'source': 'Generated (Fallback)',
-            'is_real': False
-        })
-    
-    return flight_options
-
-def generate_fallback_attractions(destination):
-    """Generate a list of attractions for the destination"""
-    popular_attractions = {
-        "goa": [
-            {"name": "Calangute Beach", "description": "Popular beach known for water sports and nightlife"},
-            {"name": "Basilica of Bom Jesus", "description": "UNESCO World Heritage site, houses the remains of St. Francis Xavier"},
-            {"name": "Fort Aguada", "description": "17th-century Portuguese fort and lighthouse with panoramic views"},
-            {"name": "Dudhsagar Falls", "description": "Four-tiered waterfall on the Mandovi River"},
-            {"name": "Anjuna Flea Market", "description": "Popular market selling handicrafts, clothes, and souvenirs"}
-        ],
-        "delhi": [
-            {"name": "Red Fort", "description": "Historic fort that was the main residence of the Mughal emperors"},
-            {"name": "Qutub Minar", "description": "UNESCO World Heritage site, a 73-meter tall minaret"},
-            {"name": "India Gate", "description": "War memorial dedicated to soldiers who died in World War I"},
-            {"name": "Humayun's Tomb", "description": "UNESCO World Heritage site, tomb of Mughal Emperor Humayun"},
-            {"name": "Chandni Chowk", "description": "One of the oldest and busiest markets in Old Delhi"}
-        ],
-        "mumbai": [
-            {"name": "Gateway of India", "description": "Iconic monument built during the British Raj"},
-            {"name": "Marine Drive", "description": "Scenic boulevard along the coastline of South Mumbai"},
-            {"name": "Elephanta Caves", "description": "UNESCO World Heritage site with ancient cave temples"},
-            {"name": "Chhatrapati Shivaji Terminus", "description": "Historic railway station and UNESCO World Heritage site"},
-            {"name": "Juhu Beach", "description": "Popular beach and recreational area"}
-        ],
-        "hyderabad": [
-            {"name": "Charminar", "description": "Iconic monument and mosque with four minarets"},
-            {"name": "Golconda Fort", "description": "Historic fort and former diamond trading center"},
-            {"name": "Hussain Sagar Lake", "description": "Large heart-shaped lake with a statue of Buddha in the center"},
-            {"name": "Ramoji Film City", "description": "World's largest integrated film city and tourism complex"},
-            {"name": "Salar Jung Museum", "description": "One of the largest museums in India with a diverse collection"}
-        ]
-    }
-    
-    # Get the attractions for the destination (case-insensitive)
-    clean_destination = destination.lower().split(',')[0].strip()
-    
-    # If we have attractions for this destination, return them
-    if clean_destination in popular_attractions:
-        return popular_attractions[clean_destination]
-    
-    # Otherwise generate generic attractions based on the destination name
-    return [
-        {"name": f"{destination} Central Park", "description": f"Beautiful park in the heart of {destination}"},
-        {"name": f"{destination} Heritage Museum", "description": f"Museum showcasing the rich history of {destination}"},
-        {"name": f"{destination} Beach", "description": f"Picturesque beach with golden sands and clear waters"},
-        {"name": f"Old {destination} Market", "description": f"Traditional market selling local crafts and souvenirs"},
-        {"name": f"{destination} Hill Station", "description": f"Scenic viewpoint offering panoramic views of the area"}
-    ] 
\ No newline at end of file
+Kept for existing imports; the scraping lives in agents.flight_engine.
+"""
+from agents.flight_engine import get_real_flight_data, generate_fallback_flights
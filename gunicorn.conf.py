@@ -0,0 +1,22 @@
+"""
+Gunicorn settings for serving the app in production
+
+    gunicorn app:app
+
+A plan spends nearly all of its time waiting: on browser pool futures, on the
+places API and on the Groq API. The gthread worker serves every request on a
+thread of a worker process, so one process holds WEB_THREADS (64) plans in
+flight while the actual browser work stays bounded by BROWSER_POOL_SIZE.
+Every worker process has its own browser pool and caches, so add processes
+(WEB_WORKERS) for CPU rather than for concurrency.
+"""
+import os
+
+bind = f"0.0.0.0:{os.getenv('FLASK_PORT', 5000)}"
+workers = int(os.getenv('WEB_WORKERS', 1))
+worker_class = 'gthread'
+threads = int(os.getenv('WEB_THREADS', 64))
+# A plan may use its whole budget; give the worker some room on top before it is killed
+timeout = int(float(os.getenv('PLAN_DEADLINE_SECONDS', 90))) + 30
+# NDJSON batch responses stay open while plans finish
+keepalive = 5
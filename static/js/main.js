@@ -58,6 +58,46 @@ document.addEventListener('DOMContentLoaded', function() {
         });
     });
 
+    // City typeahead for the From/To inputs, debounced so typing sends one request per pause
+    document.querySelectorAll('input[data-place-suggest]').forEach(function(input) {
+        const datalist = document.getElementById(input.getAttribute('list'));
+        if (!datalist) return;
+        let timer = null;
+        let controller = null;
+        let lastQuery = '';
+
+        input.addEventListener('input', function() {
+            clearTimeout(timer);
+            const query = input.value.trim();
+            if (query.length < 2 || query === lastQuery) return;
+
+            timer = setTimeout(function() {
+                lastQuery = query;
+                // Drop the answer to a previous, now outdated query
+                if (controller) controller.abort();
+                controller = typeof AbortController !== 'undefined' ? new AbortController() : null;
+
+                fetch('/api/places/suggest?q=' + encodeURIComponent(query),
+                      controller ? {signal: controller.signal} : {})
+                    .then(function(response) { return response.ok ? response.json() : {suggestions: []}; })
+                    .then(function(data) {
+                        datalist.innerHTML = '';
+                        (data.suggestions || []).forEach(function(place) {
+                            const option = document.createElement('option');
+                            option.value = place.label;
+                            option.textContent = place.label === place.city
+                                ? `${place.city} (${place.iata})`
+                                : `${place.label}, near ${place.city} (${place.iata})`;
+                            datalist.appendChild(option);
+                        });
+                    })
+                    .catch(function(error) {
+                        if (error.name !== 'AbortError') console.log('Place suggestions failed:', error);
+                    });
+            }, 200);
+        });
+    });
+
     // Form validation
     const plannerForm = document.querySelector('form[action="/plan"]');
     
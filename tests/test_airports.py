@@ -0,0 +1,48 @@
+import pytest
+
+from utils.airports import Airport, AirportIndex
+
+
+@pytest.fixture(scope='module')
+def index():
+    return AirportIndex.from_csv()
+
+
+@pytest.mark.parametrize('text, iata', [
+    ('Bengaluru', 'BLR'),
+    ('Bangalor', 'BLR'),
+    ('banglore', 'BLR'),
+    ('hyderbad', 'HYD'),
+    ('Vizag', 'VTZ'),
+    ('Bombay, India', 'BOM'),
+    ('Goa (GOI)', 'GOI'),
+    ('Shimla', 'SLV'),
+])
+def test_resolves_cities_aliases_and_typos(index, text, iata):
+    assert index.code(text) == iata
+
+
+@pytest.mark.parametrize('text', [
+    # Two edits from "ellora" (Aurangabad), "dharwad" (Hubballi), "manipal" (Mangaluru), "bilaspur"
+    'Vellore',
+    'Nellore',
+    'Dhanbad',
+    'Panipat',
+    'Bijapur',
+    'Atlantis',
+])
+def test_unknown_cities_resolve_to_nothing(index, text):
+    assert index.resolve(text) is None
+
+
+def test_typo_must_keep_the_first_letter(index):
+    assert index.resolve('yderabad') is None
+
+
+def test_typo_as_close_to_two_cities_is_ambiguous():
+    index = AirportIndex([
+        (Airport('AAA', 'Karur', 'Karur Airport', '', 'India'), []),
+        (Airport('BBB', 'Karun', 'Karun Airport', '', 'India'), []),
+    ])
+    assert index.resolve('Karux') is None
+    assert index.code('Karur') == 'AAA'
@@ -0,0 +1,275 @@
+"""
+City to airport (IATA) resolution from the bundled data/airports.csv
+
+Every city name, alias ("bombay", "vizag"), airport name and IATA code in the
+dataset is a key in an exact-match dict and in a prefix trie (for suggest()).
+resolve() tries the exact key first (a dict lookup) and only then looks for a key
+one edit away through an index of the keys with one character deleted, so typos
+like "hyderbad" or "banglore" still resolve:
+
+    index = get_airport_index()
+    index.resolve("Hyderabad, Telangana")   -> Airport(iata='HYD', city='Hyderabad', ...)
+    index.resolve("Vizag")                  -> Airport(iata='VTZ', ...)
+    index.resolve("Atlantis")               -> None
+    index.resolve("Vellore")                -> None (not "Ellora", two edits away)
+    index.suggest("ben", limit=5)           -> [('Benares', Airport(iata='VNS', ...)), ('Bengaluru', ...), ...]
+
+A typo must keep the first letter, and one that is as close to two different
+cities resolves to nothing rather than to a guess. A city that resolves to
+nothing gets no flight search; its plan shows estimated flights instead.
+AIRPORTS_DATA_PATH points at another CSV with the same columns.
+"""
+import os
+import re
+import csv
+import threading
+from collections import namedtuple, deque
+
+DEFAULT_DATA_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'airports.csv')
+
+# Listed first in suggestions
+DOMESTIC_COUNTRY = 'India'
+
+Airport = namedtuple('Airport', ['iata', 'city', 'name', 'state', 'country'])
+
+# Trie node key holding the airports of the key that ends at that node
+_END = ''
+_NON_ALNUM = re.compile(r'[^a-z0-9]+')
+_CODE_IN_PARENS = re.compile(r'\(([A-Za-z]{3})\)')
+# Words that don't help tell cities apart ("Goa Airport", "Pune, India")
+_NOISE_WORDS = {'airport', 'international', 'india', 'city'}
+
+
+def normalize(text):
+    """Lowercase, punctuation to single spaces, noise words dropped"""
+    words = _NON_ALNUM.sub(' ', (text or '').lower()).split()
+    return ' '.join(word for word in words if word not in _NOISE_WORDS)
+
+
+def _max_distance(key):
+    """Typos tolerated for a key of this length; two edits turn real cities into other ones"""
+    return 0 if len(key) <= 3 else 1
+
+
+class AirportIndex:
+    """Exact and typo-tolerant lookup of airports by city, alias, airport name or code"""
+
+    def __init__(self, airports=None):
+        self.airports = []
+        self._exact = {}
+        self._trie = {}
+        self._cache = {}
+        # Built on the first typo lookup
+        self._deletes = None
+        for airport, aliases in airports or []:
+            self.add(airport, aliases)
+
+    @classmethod
+    def from_csv(cls, path=None):
+        """Build the index from a CSV with iata, city, airport, state, country and aliases columns"""
+        index = cls()
+        with open(path or DEFAULT_DATA_PATH, encoding='utf-8', newline='') as f:
+            for row in csv.DictReader(f):
+                airport = Airport(row['iata'].strip().upper(), row['city'].strip(), row['airport'].strip(),
+                                  row['state'].strip(), row['country'].strip())
+                aliases = [alias for alias in (row.get('aliases') or '').split('|') if alias.strip()]
+                index.add(airport, aliases)
+        return index
+
+    def add(self, airport, aliases=()):
+        """Index an airport under its code, city, airport name and aliases (city names rank first)"""
+        position = len(self.airports)
+        self.airports.append(airport)
+        # (kind, key, label shown in suggestions): 0 city, 1 alias, 2 airport name or code,
+        # which are shown as the city they belong to
+        keys = [(0, airport.city, airport.city)] + [(1, alias, alias.strip().title()) for alias in aliases] + \
+            [(2, airport.name, airport.city), (2, airport.iata, airport.city)]
+        for kind, key, label in keys:
+            key = normalize(key)
+            if not key:
+                continue
+            # The city wins over aliases and names when two airports share a key
+            entry = (min(kind, 1), position)
+            current = self._exact.get(key)
+            if current is None or entry < current:
+                self._exact[key] = entry
+            node = self._trie
+            for char in key:
+                node = node.setdefault(char, {})
+            node.setdefault(_END, []).append((kind, position, label))
+        self._cache.clear()
+        self._deletes = None
+
+    def warm(self):
+        """Build the typo index now rather than on the first misspelt lookup"""
+        if self._deletes is None:
+            self._deletes = self._build_deletes()
+        return self
+
+    def __len__(self):
+        return len(self.airports)
+
+    def resolve(self, text):
+        """
+        Airport for a city typed by a user ("Hyderabad", "Bombay, India", "Goa (GOI)", "banglore").
+
+        Returns:
+            Airport or None when nothing in the dataset is close enough
+        """
+        if not text:
+            return None
+        cached = self._cache.get(text, False)
+        if cached is not False:
+            return cached
+
+        airport = None
+        code = _CODE_IN_PARENS.search(text)
+        if code:
+            airport = self._lookup(code.group(1).lower())
+        if airport is None:
+            # "Hyderabad, Telangana, India": the city comes first
+            key = normalize(text.split(',')[0])
+            airport = self._lookup(key) or self._fuzzy(key)
+
+        if len(self._cache) > 4096:
+            self._cache.clear()
+        self._cache[text] = airport
+        return airport
+
+    def code(self, text):
+        """IATA code for a city, or None"""
+        airport = self.resolve(text)
+        return airport.iata if airport else None
+
+    def suggest(self, prefix, limit=8):
+        """
+        Places whose city, alias, airport name or code starts with prefix.
+
+        City names come before aliases, airport names and codes, Indian places
+        before others, and shorter completions before longer ones, so "goa"
+        lists Goa before North Goa.
+
+        Returns:
+            list: (label, Airport) pairs; the label is the matched city or alias
+            (for airport name and code matches, the city the airport serves)
+            and the airport is the one serving it
+        """
+        key = normalize(prefix)
+        if not key:
+            return []
+        node = self._trie
+        for char in key:
+            node = node.get(char)
+            if node is None:
+                return []
+
+        # Breadth first, so shorter completions are found first; a few extra are
+        # collected so city names can be ranked above aliases and codes
+        matches = []
+        queue = deque([(node, 0)])
+        while queue and len(matches) < limit * 4:
+            current, depth = queue.popleft()
+            for kind, position, label in current.get(_END, ()):
+                domestic = self.airports[position].country == DOMESTIC_COUNTRY
+                matches.append((kind, not domestic, depth, label, position))
+            for char, child in current.items():
+                if char != _END:
+                    queue.append((child, depth + 1))
+
+        results, seen = [], set()
+        for _, _, _, label, position in sorted(matches):
+            if label.lower() not in seen:
+                seen.add(label.lower())
+                results.append((label, self.airports[position]))
+        return results[:limit]
+
+    def _lookup(self, key):
+        entry = self._exact.get(key)
+        return self.airports[entry[1]] if entry else None
+
+    def _fuzzy(self, key):
+        """
+        Closest key within the typo budget, found through the deletion index.
+
+        A candidate must start with the same letter as key. When the closest
+        candidates belong to different cities the match is ambiguous and None
+        is returned.
+        """
+        max_distance = _max_distance(key)
+        if not max_distance:
+            return None
+        if self._deletes is None:
+            self._deletes = self._build_deletes()
+
+        candidates = set()
+        for variant in _deletions(key, max_distance):
+            candidates.update(self._deletes.get(variant, ()))
+        matches = []
+        for candidate in candidates:
+            if candidate[0] != key[0] or abs(len(candidate) - len(key)) > max_distance:
+                continue
+            distance = _edit_distance(key, candidate, max_distance)
+            if distance <= max_distance:
+                matches.append((distance,) + self._exact[candidate])
+        if not matches:
+            return None
+        matches.sort()
+        closest = [self.airports[position] for distance, _, position in matches if distance == matches[0][0]]
+        if len({airport.city.lower() for airport in closest}) > 1:
+            return None
+        return closest[0]
+
+    def _build_deletes(self):
+        """Every key with up to one character removed -> the keys it came from"""
+        deletes = {}
+        for key in self._exact:
+            max_distance = _max_distance(key)
+            if max_distance:
+                for variant in _deletions(key, max_distance):
+                    deletes.setdefault(variant, set()).add(key)
+        return deletes
+
+
+def _deletions(word, max_distance):
+    """word and every string made by deleting up to max_distance of its characters"""
+    variants = {word}
+    frontier = {word}
+    for _ in range(max_distance):
+        frontier = {w[:i] + w[i + 1:] for w in frontier for i in range(len(w))}
+        variants |= frontier
+    return variants
+
+
+def _edit_distance(a, b, limit):
+    """Edit distance of a and b counting a swap of neighbours as one edit, or limit + 1 once it is above limit"""
+    before, previous = None, list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        row = [i]
+        for j, char_b in enumerate(b, 1):
+            value = min(row[j - 1] + 1, previous[j] + 1, previous[j - 1] + (char_a != char_b))
+            if before is not None and j > 1 and char_a == b[j - 2] and a[i - 2] == char_b:
+                value = min(value, before[j - 2] + 1)
+            row.append(value)
+        if min(row) > limit:
+            return limit + 1
+        before, previous = previous, row
+    return previous[-1]
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_airport_index():
+    """Return the shared index, loading the dataset on first use"""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = AirportIndex.from_csv(os.getenv('AIRPORTS_DATA_PATH') or DEFAULT_DATA_PATH)
+    return _index
+
+
+def resolve_airport(city):
+    """Airport for a city name with the shared index, or None"""
+    return get_airport_index().resolve(city)
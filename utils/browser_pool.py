@@ -0,0 +1,316 @@
+"""
+Shared pool of headless Chromium browsers for the scrapers
+
+Playwright's sync API is bound to the thread that started it, so the pool runs a
+fixed number of worker threads and each worker owns one long-lived browser. Work
+is submitted as a function that receives that browser and runs on the worker:
+
+    future = get_browser_pool().submit(scrape_something, destination)
+    hotels = future.result()
+
+where scrape_something(browser, destination) opens its own context. Browsers are
+launched lazily and relaunched if they disconnect. A task must never wait on
+another pool task, otherwise a full pool would deadlock.
+
+Only BROWSER_POOL_MAX_QUEUE (4 per worker) tasks may wait for a worker; past
+that submit() raises PoolSaturated straight away, and callers serve fallback
+data rather than queue behind work that is already going to be late.
+
+Each worker's BrowserGovernor closes contexts a task left open and replaces the
+browser after BROWSER_MAX_JOBS (200) tasks or once its process tree uses more
+than BROWSER_MAX_RSS_MB (1536) of memory; pool.metrics() reports the numbers.
+
+The number of workers defaults to BROWSER_POOL_SIZE (3).
+"""
+import os
+import queue
+import atexit
+import threading
+from concurrent.futures import Future, wait
+from utils.process_memory import child_pids, tree_rss_bytes
+
+# Launch flags shared by every scraper browser
+LAUNCH_ARGS = [
+    '--disable-gpu',
+    '--no-sandbox',
+    '--disable-dev-shm-usage',
+    '--disable-web-security',
+    '--disable-features=IsolateOrigins,site-per-process',
+    '--disable-site-isolation-trials',
+    '--disable-http2',  # Force HTTP/1.1
+    '--disable-background-networking',
+    '--disable-breakpad',
+    '--disable-client-side-phishing-detection',
+    '--disable-default-apps',
+    '--disable-extensions',
+    '--disable-hang-monitor',
+    '--disable-popup-blocking',
+    '--disable-prompt-on-repost',
+    '--disable-sync',
+    '--disable-translate',
+    '--metrics-recording-only',
+    '--no-first-run',
+    '--safebrowsing-disable-auto-update'
+]
+
+
+# Recycle a browser after this many jobs, or once its process tree uses more
+# than this much resident memory; 0 turns either check off
+MAX_JOBS_PER_BROWSER = int(os.getenv('BROWSER_MAX_JOBS', 200))
+MAX_BROWSER_RSS_MB = float(os.getenv('BROWSER_MAX_RSS_MB', 1536))
+
+
+class PoolSaturated(RuntimeError):
+    """The browser pool's wait queue is full; use cached or fallback data instead"""
+
+
+def max_queue_for(size):
+    """Tasks allowed to wait for a worker, BROWSER_POOL_MAX_QUEUE or 4 per worker; 0 means no limit"""
+    return int(os.getenv('BROWSER_POOL_MAX_QUEUE', 4 * size))
+
+
+# Playwright drivers are found as the new child process of a start; one start at a time
+_driver_start_lock = threading.Lock()
+
+
+class BrowserGovernor:
+    """
+    Owns one worker's Playwright driver and browser and keeps them healthy.
+
+    After every job it closes contexts the job left open, counts the job and
+    measures the resident memory of the driver's process tree (driver, Chromium
+    and its renderers). When the browser has served MAX_JOBS_PER_BROWSER jobs or
+    uses more than MAX_BROWSER_RSS_MB it is closed, and the next job launches a
+    fresh one. A worker runs one job at a time, so this never drops work in flight.
+    """
+
+    def __init__(self, owner):
+        self.owner = owner
+        self.playwright = None
+        self.browser = None
+        self.driver_pid = None
+        self.launches = 0
+        self.jobs = 0
+        self.jobs_on_browser = 0
+        self.recycles = {'jobs': 0, 'memory': 0}
+        self.leaked_contexts_closed = 0
+        self.rss_bytes = None
+        self.peak_rss_bytes = 0
+        self._lock = threading.Lock()
+
+    def browser_for_job(self):
+        """Connected browser for the next job, starting Playwright and launching Chromium if needed"""
+        if self.browser is None or not self.browser.is_connected():
+            if self.playwright is None:
+                # Loaded here so importing the pool doesn't pull in Playwright
+                from playwright.sync_api import sync_playwright
+                with _driver_start_lock:
+                    before = child_pids(os.getpid())
+                    self.playwright = sync_playwright().start()
+                    started = child_pids(os.getpid()) - before
+                self.driver_pid = min(started) if started else None
+            print(f"[{self.owner}] Launching headless browser...")
+            self.browser = self.playwright.chromium.launch(headless=True, args=LAUNCH_ARGS)
+            with self._lock:
+                self.launches += 1
+                self.jobs_on_browser = 0
+        return self.browser
+
+    def after_job(self):
+        """Clean up after a job and recycle the browser when it is worn out"""
+        if self.browser is None:
+            return
+        leaked = 0
+        try:
+            for context in list(self.browser.contexts):
+                leaked += 1
+                context.close()
+        except Exception as e:
+            print(f"[{self.owner}] Error closing leftover contexts: {str(e)[:100]}")
+        if leaked:
+            print(f"[{self.owner}] Closed {leaked} browser context(s) a job left open")
+
+        rss = tree_rss_bytes(self.driver_pid)
+        with self._lock:
+            self.jobs += 1
+            self.jobs_on_browser += 1
+            self.leaked_contexts_closed += leaked
+            self.rss_bytes = rss
+            self.peak_rss_bytes = max(self.peak_rss_bytes, rss or 0)
+            reason = None
+            if MAX_BROWSER_RSS_MB and rss is not None and rss > MAX_BROWSER_RSS_MB * 1024 * 1024:
+                reason = 'memory'
+            elif MAX_JOBS_PER_BROWSER and self.jobs_on_browser >= MAX_JOBS_PER_BROWSER:
+                reason = 'jobs'
+            if reason:
+                self.recycles[reason] += 1
+        if reason:
+            print(f"[{self.owner}] Recycling browser after {self.jobs_on_browser} jobs "
+                  f"({(rss or 0) / 1024 / 1024:.0f} MB resident, reason: {reason})")
+            # Restarting the driver too gives back everything the tree had grown to
+            self.close()
+
+    def close(self):
+        """Close the browser and stop its Playwright driver"""
+        try:
+            if self.browser is not None:
+                self.browser.close()
+            if self.playwright is not None:
+                self.playwright.stop()
+        except Exception as e:
+            print(f"Error closing pooled browser: {e}")
+        self.browser = self.playwright = self.driver_pid = None
+        with self._lock:
+            self.jobs_on_browser = 0
+
+    def snapshot(self):
+        """Counters and memory of this worker's browser as a plain dictionary"""
+        with self._lock:
+            return {
+                'worker': self.owner,
+                'connected': self.browser is not None,
+                'launches': self.launches,
+                'jobs': self.jobs,
+                'jobs_on_browser': self.jobs_on_browser,
+                'recycles': dict(self.recycles),
+                'leaked_contexts_closed': self.leaked_contexts_closed,
+                'rss_mb': round(self.rss_bytes / 1024 / 1024, 1) if self.rss_bytes is not None else None,
+                'peak_rss_mb': round(self.peak_rss_bytes / 1024 / 1024, 1),
+            }
+
+
+class BrowserPool:
+    """Fixed set of worker threads, each owning one headless Chromium"""
+
+    def __init__(self, size=None):
+        self.size = size or int(os.getenv('BROWSER_POOL_SIZE', 3))
+        self._tasks = queue.Queue()
+        self.max_queue = max_queue_for(self.size)
+        self.rejected = 0
+        self._workers = []
+        self._governors = []
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def submit(self, fn, *args, **kwargs):
+        """
+        Run fn(browser, *args, **kwargs) on a pool worker and return a Future.
+
+        Raises:
+            PoolSaturated: when max_queue tasks are already waiting for a worker
+        """
+        future = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Browser pool has been shut down")
+            if not self._workers:
+                self._start_workers()
+            if self.max_queue and self._tasks.qsize() >= self.max_queue:
+                self.rejected += 1
+                raise PoolSaturated(f"{self._tasks.qsize()} browser tasks are already waiting")
+            self._tasks.put((future, fn, args, kwargs))
+        return future
+
+    def queued(self):
+        """Tasks waiting for a worker"""
+        return self._tasks.qsize()
+
+    def warm(self, timeout=60):
+        """
+        Start the workers and launch every worker's browser now, so the first
+        request doesn't pay for it. Returns the number of browsers that launched.
+        """
+        # Each warm-up task holds its worker at the barrier until every worker has
+        # taken one, so no worker runs two of them and each launches its browser
+        barrier = threading.Barrier(self.size)
+
+        def launched(browser):
+            try:
+                barrier.wait(timeout=timeout)
+            except threading.BrokenBarrierError:
+                pass
+            return browser.is_connected()
+
+        futures = [self.submit(launched) for _ in range(self.size)]
+        done, _ = wait(futures, timeout=timeout)
+        ready = 0
+        for future in done:
+            try:
+                ready += bool(future.result())
+            except Exception as e:
+                print(f"Browser warm-up failed: {str(e)[:200]}")
+        return ready
+
+    def metrics(self):
+        """BrowserGovernor snapshot of every worker that has started"""
+        with self._lock:
+            governors = list(self._governors)
+        return [governor.snapshot() for governor in governors]
+
+    def _start_workers(self):
+        print(f"Starting browser pool with {self.size} workers")
+        for i in range(self.size):
+            worker = threading.Thread(target=self._worker, name=f"browser-pool-{i}", daemon=True)
+            worker.start()
+            self._workers.append(worker)
+
+    def _worker(self):
+        governor = BrowserGovernor(threading.current_thread().name)
+        with self._lock:
+            self._governors.append(governor)
+        while True:
+            task = self._tasks.get()
+            if task is None:
+                break
+            future, fn, args, kwargs = task
+            # Skip tasks that were cancelled while they waited in the queue
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                result = fn(governor.browser_for_job(), *args, **kwargs)
+            except BaseException as e:
+                future.set_exception(e)
+            else:
+                future.set_result(result)
+            try:
+                governor.after_job()
+            except Exception as e:
+                print(f"Browser governor error: {str(e)[:200]}")
+
+        governor.close()
+
+    def shutdown(self, wait=True):
+        """Stop the workers and close their browsers"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            workers = list(self._workers)
+        for _ in workers:
+            self._tasks.put(None)
+        if wait:
+            for worker in workers:
+                worker.join(timeout=10)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_browser_pool():
+    """
+    Return the process-wide browser pool, creating it on first use.
+
+    BROWSER_POOL_MODE=process runs the browsers in separate scraper processes
+    (utils.scraper_workers) instead of threads of this process.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            if os.getenv('BROWSER_POOL_MODE', 'thread').lower() == 'process':
+                from utils.scraper_workers import ProcessBrowserPool
+                _pool = ProcessBrowserPool()
+            else:
+                _pool = BrowserPool()
+            atexit.register(_pool.shutdown)
+        return _pool
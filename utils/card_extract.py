@@ -0,0 +1,125 @@
+"""
+Single-round-trip extraction of result cards
+
+Reading a card field by field with element.query_selector() and inner_text()
+costs one Playwright round trip per call, so a few cards with a handful of
+fallback selectors each add up to hundreds of round trips. extract_cards() sends
+every card selector and every field selector to the page in one page.evaluate
+call and gets back the text of each card and the text found by each field
+selector, in selector order. Python only has to pick the first value that
+validates:
+
+    groups = extract_cards(page, ['div.card', 'li.result'],
+                           fields={'name': ['h2', '.title'], 'price': ['.price']})
+    for selector, cards in groups:
+        for card in cards:
+            name = first_valid(card['fields']['name'])
+
+Selectors written with a trailing '*' on a class name (e.g. the generated
+'.HotelCardstyles__HotelNameWrapperDiv-sc-*' class names) are turned into
+[class*="..."] attribute selectors so they match the generated suffixes.
+"""
+import re
+
+_CLASS_PREFIX = re.compile(r'\.([A-Za-z0-9_-]+)\*')
+
+# Runs in the page: one call reads every card of every card selector
+_EXTRACT_SCRIPT = """
+({cardSelectors, fields, multiFields, limit}) => {
+    const text = el => (el.innerText || el.textContent || '').trim();
+    const visible = el => el.getClientRects().length > 0;
+    const queryAll = (root, selector) => {
+        try {
+            return Array.from(root.querySelectorAll(selector));
+        } catch (e) {
+            return [];
+        }
+    };
+    const groups = [];
+    for (const cardSelector of cardSelectors) {
+        const cards = queryAll(document, cardSelector).filter(visible);
+        if (!cards.length) {
+            continue;
+        }
+        groups.push({
+            selector: cardSelector,
+            cards: cards.slice(0, limit).map(card => {
+                const values = {};
+                for (const [name, selectors] of Object.entries(fields)) {
+                    values[name] = [];
+                    for (const selector of selectors) {
+                        const el = queryAll(card, selector)[0];
+                        const value = el ? text(el) : '';
+                        if (value) {
+                            values[name].push(value);
+                        }
+                    }
+                }
+                for (const [name, selectors] of Object.entries(multiFields)) {
+                    values[name] = selectors
+                        .map(selector => queryAll(card, selector).map(text).filter(Boolean))
+                        .filter(texts => texts.length);
+                }
+                return {text: text(card), fields: values};
+            })
+        });
+    }
+    return groups;
+}
+"""
+
+
+def css_selector(selector):
+    """Turn '.Prefix-sc-*' class wildcards into '[class*="Prefix-sc-"]' so the browser accepts them"""
+    return _CLASS_PREFIX.sub(r'[class*="\1"]', selector)
+
+
+def wait_for_cards(page, card_selectors, timeout_ms):
+    """Wait until any of the card selectors is visible; return False on timeout"""
+    try:
+        page.wait_for_selector(', '.join(css_selector(s) for s in card_selectors), timeout=timeout_ms)
+        return True
+    except Exception as e:
+        print(f"No result cards appeared: {str(e)[:100]}")
+        return False
+
+
+def extract_cards(page, card_selectors, fields=None, multi_fields=None, limit=5):
+    """
+    Read result cards and their fields with a single page.evaluate.
+
+    Args:
+        page: Playwright page showing the results
+        card_selectors (list): Card selectors, most specific first
+        fields (dict): Field name -> selectors; each card gets the text of the
+            first element of every selector that matched, in selector order
+        multi_fields (dict): Field name -> selectors; each card gets the texts of
+            all elements of every selector that matched, as one list per selector
+        limit (int): Cards returned per card selector
+
+    Returns:
+        list: (card selector, cards) for every card selector with visible cards,
+        where each card is {'text': card text, 'fields': {name: values}}
+    """
+    fields = {name: [css_selector(s) for s in selectors] for name, selectors in (fields or {}).items()}
+    multi_fields = {name: [css_selector(s) for s in selectors] for name, selectors in (multi_fields or {}).items()}
+    groups = page.evaluate(_EXTRACT_SCRIPT, {
+        'cardSelectors': [css_selector(s) for s in card_selectors],
+        'fields': fields,
+        'multiFields': multi_fields,
+        'limit': limit,
+    })
+    return [(group['selector'], group['cards']) for group in groups]
+
+
+def first_valid(values, pattern=None):
+    """First value (or pattern match object when a pattern is given) that is usable"""
+    for value in values or []:
+        if pattern is None:
+            if value:
+                return value
+            continue
+        match = pattern.search(value)
+        if match:
+            return match
+    return None
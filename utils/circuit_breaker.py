@@ -0,0 +1,197 @@
+"""
+Per-upstream circuit breakers
+
+Each upstream host (google.com, goibibo.com, ...) gets one breaker that watches the
+outcome and latency of recent scraping calls. When too many of them fail or are too
+slow the circuit opens and callers go straight to their fallback data instead of
+launching a browser. After a cool-down the breaker lets a single probe through
+(half-open); a successful probe closes the circuit again.
+
+Thresholds can be tuned from the environment:
+    CIRCUIT_WINDOW            number of recent calls considered (default 10)
+    CIRCUIT_MIN_CALLS         calls needed before the circuit can open (default 3)
+    CIRCUIT_ERROR_RATE        failure ratio that opens the circuit (default 0.5)
+    CIRCUIT_SLOW_CALL_SECONDS a call slower than this counts as slow (default 45)
+    CIRCUIT_SLOW_CALL_RATE    slow-call ratio that opens the circuit (default 0.8)
+    CIRCUIT_OPEN_SECONDS      cool-down before a probe is allowed (default 120)
+"""
+import os
+import time
+import threading
+from collections import deque
+from urllib.parse import urlsplit
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class CircuitBreaker:
+    """Error-rate and latency based circuit breaker for one upstream"""
+
+    def __init__(self, name, window=None, min_calls=None, error_rate=None,
+                 slow_call_seconds=None, slow_call_rate=None, open_seconds=None):
+        self.name = name
+        self.window = window or int(os.getenv('CIRCUIT_WINDOW', 10))
+        self.min_calls = min_calls or int(os.getenv('CIRCUIT_MIN_CALLS', 3))
+        self.error_rate = error_rate or float(os.getenv('CIRCUIT_ERROR_RATE', 0.5))
+        self.slow_call_seconds = slow_call_seconds or float(os.getenv('CIRCUIT_SLOW_CALL_SECONDS', 45))
+        self.slow_call_rate = slow_call_rate or float(os.getenv('CIRCUIT_SLOW_CALL_RATE', 0.8))
+        self.open_seconds = open_seconds or float(os.getenv('CIRCUIT_OPEN_SECONDS', 120))
+
+        self._lock = threading.Lock()
+        self._calls = deque(maxlen=self.window)  # (succeeded, duration) pairs
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+
+    @property
+    def state(self):
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self):
+        if self._state == OPEN and time.monotonic() - self._opened_at >= self.open_seconds:
+            self._state = HALF_OPEN
+            self._probe_in_flight = False
+        return self._state
+
+    def is_open(self):
+        """Return True while calls are being rejected"""
+        return self.state == OPEN
+
+    def allow_request(self):
+        """Return True if a call to this upstream may go ahead"""
+        with self._lock:
+            state = self._current_state()
+            if state == CLOSED:
+                return True
+            if state == HALF_OPEN and not self._probe_in_flight:
+                # Let exactly one probe through while half-open
+                self._probe_in_flight = True
+                print(f"[circuit:{self.name}] Half-open, allowing a probe request")
+                return True
+            return False
+
+    def record_success(self, duration=0.0):
+        """Record a call that returned usable data"""
+        self._record(True, duration)
+
+    def record_failure(self, duration=0.0):
+        """Record a call that raised, timed out or returned nothing usable"""
+        self._record(False, duration)
+
+    def release(self):
+        """Hand back a half-open probe that was allowed but never completed (e.g. cancelled)"""
+        _log_outcome(self.name, 'release', 0.0)
+        with self._lock:
+            self._probe_in_flight = False
+
+    def _record(self, succeeded, duration):
+        _log_outcome(self.name, 'success' if succeeded else 'failure', duration)
+        with self._lock:
+            state = self._current_state()
+            slow = duration >= self.slow_call_seconds
+
+            if state == HALF_OPEN:
+                self._probe_in_flight = False
+                if succeeded and not slow:
+                    print(f"[circuit:{self.name}] Probe succeeded, closing circuit")
+                    self._state = CLOSED
+                    self._calls.clear()
+                else:
+                    self._trip("probe failed")
+                return
+
+            self._calls.append((succeeded, duration))
+            if state == CLOSED and len(self._calls) >= self.min_calls:
+                failures = sum(1 for ok, _ in self._calls if not ok)
+                slow_calls = sum(1 for _, took in self._calls if took >= self.slow_call_seconds)
+                if failures / len(self._calls) >= self.error_rate:
+                    self._trip(f"{failures}/{len(self._calls)} recent calls failed")
+                elif slow_calls / len(self._calls) >= self.slow_call_rate:
+                    self._trip(f"{slow_calls}/{len(self._calls)} recent calls slower than {self.slow_call_seconds:.0f}s")
+
+    def _trip(self, reason):
+        self._state = OPEN
+        self._opened_at = time.monotonic()
+        self._calls.clear()
+        print(f"[circuit:{self.name}] Opening circuit for {self.open_seconds:.0f}s: {reason}")
+
+    def snapshot(self):
+        """Return the breaker state as a plain dictionary"""
+        with self._lock:
+            state = self._current_state()
+            calls = list(self._calls)
+            return {
+                'name': self.name,
+                'state': state,
+                'recent_calls': len(calls),
+                'recent_failures': sum(1 for ok, _ in calls if not ok),
+            }
+
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+
+def host_key(url):
+    """Reduce a URL or host to the registrable host, e.g. https://www.google.com/x -> google.com"""
+    host = urlsplit(url).netloc if '://' in url else url
+    host = host.split(':')[0].lower()
+    return host[4:] if host.startswith('www.') else host
+
+
+def get_breaker(url_or_host):
+    """Return the shared breaker for an upstream host"""
+    key = host_key(url_or_host)
+    with _breakers_lock:
+        breaker = _breakers.get(key)
+        if breaker is None:
+            breaker = CircuitBreaker(key)
+            _breakers[key] = breaker
+        return breaker
+
+
+# Scraper worker processes (utils.scraper_workers) have their own breakers; they
+# log every outcome so the web process can apply it to the breakers that matter
+_outcome_log = None
+
+
+def _log_outcome(name, outcome, duration):
+    if _outcome_log is not None:
+        _outcome_log.append((name, outcome, duration))
+
+
+def start_outcome_log():
+    """Start keeping every breaker outcome in this process for drain_outcome_log()"""
+    global _outcome_log
+    _outcome_log = []
+
+
+def drain_outcome_log():
+    """(breaker name, 'success' | 'failure' | 'release', duration) outcomes since the last call"""
+    if _outcome_log is None:
+        return []
+    outcomes = list(_outcome_log)
+    del _outcome_log[:len(outcomes)]
+    return outcomes
+
+
+def apply_outcomes(outcomes):
+    """Record outcomes drained in another process on this process's breakers"""
+    for name, outcome, duration in outcomes:
+        breaker = get_breaker(name)
+        if outcome == 'release':
+            breaker.release()
+        elif outcome == 'success':
+            breaker.record_success(duration)
+        else:
+            breaker.record_failure(duration)
+
+
+def all_breakers():
+    """Return snapshots of every breaker created so far"""
+    with _breakers_lock:
+        breakers = list(_breakers.values())
+    return [breaker.snapshot() for breaker in breakers]
@@ -0,0 +1,90 @@
+"""
+Per-request deadlines for the plan pipeline
+
+A Deadline is created once per /plan request and passed down to every stage.
+Scrapers and API calls ask it for their timeouts instead of using fixed values,
+so a stage never gets more than the time left in the request. A Deadline created
+with seconds=None never expires, which keeps the old behaviour for callers that
+do not pass one.
+
+The overall budget defaults to PLAN_DEADLINE_SECONDS (90 seconds).
+"""
+import os
+import time
+
+DEFAULT_PLAN_DEADLINE_SECONDS = 90
+
+
+class Deadline:
+    """Point in time by which a piece of work has to be finished"""
+
+    def __init__(self, seconds=None):
+        self.seconds = seconds
+        self.expires_at = None if seconds is None else time.monotonic() + seconds
+        self.cancelled = False
+
+    @classmethod
+    def from_env(cls):
+        """Create the per-request deadline configured by PLAN_DEADLINE_SECONDS"""
+        return cls(float(os.getenv('PLAN_DEADLINE_SECONDS', DEFAULT_PLAN_DEADLINE_SECONDS)))
+
+    def remaining(self):
+        """Seconds left, never negative (infinite for an unbounded deadline)"""
+        if self.cancelled:
+            return 0.0
+        if self.expires_at is None:
+            return float('inf')
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self):
+        return self.remaining() <= 0
+
+    def cancel(self):
+        """
+        Expire this deadline right away.
+
+        Work running under it sees no time left, so its next wait fails fast and its
+        loops stop. Cancel a reserve() child to stop one piece of work without
+        touching the rest of the request.
+        """
+        self.cancelled = True
+
+    def has_time_for(self, seconds):
+        """Return True if at least this many seconds are left"""
+        return self.remaining() >= seconds
+
+    def timeout(self, cap_seconds):
+        """Timeout in seconds for a call that would normally wait cap_seconds"""
+        return max(0.001, min(cap_seconds, self.remaining()))
+
+    def timeout_ms(self, cap_ms):
+        """
+        Timeout in milliseconds for a Playwright call that would normally wait cap_ms.
+
+        Never returns 0 because Playwright treats a zero timeout as "wait forever";
+        once the deadline has passed calls get 1 ms and fail straight away.
+        """
+        return int(max(1, min(cap_ms, self.remaining() * 1000)))
+
+    def reserve(self, seconds):
+        """
+        Return a deadline that ends `seconds` before this one.
+
+        Used to keep part of the budget for later stages, e.g. the transport
+        scraper must leave time for hotels and the itinerary.
+        """
+        if self.expires_at is None or self.cancelled:
+            child = Deadline(None)
+            child.cancelled = self.cancelled
+            return child
+        child = Deadline(None)
+        child.expires_at = max(time.monotonic(), self.expires_at - seconds)
+        child.seconds = child.expires_at - time.monotonic()
+        return child
+
+    def __repr__(self):
+        if self.cancelled:
+            return "Deadline(cancelled)"
+        if self.expires_at is None:
+            return "Deadline(unbounded)"
+        return f"Deadline({self.remaining():.1f}s left)"
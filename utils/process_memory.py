@@ -0,0 +1,73 @@
+"""
+Resident memory of a process tree, read from /proc
+
+Chromium is a tree of processes (browser, GPU, renderers, utilities) under the
+Playwright driver, so its memory use is the sum over the whole tree. These
+helpers read it from /proc without extra dependencies; where /proc is not
+available (macOS, Windows) they return None and callers skip memory checks.
+
+    tree_rss_bytes(driver_pid) -> 412876800
+"""
+import os
+
+try:
+    PAGE_SIZE = os.sysconf('SC_PAGE_SIZE')
+except (AttributeError, ValueError, OSError):
+    PAGE_SIZE = 4096
+
+
+def proc_available():
+    return os.path.isdir('/proc/self')
+
+
+def _parent_pid(pid):
+    with open(f'/proc/{pid}/stat') as f:
+        # The command name in parentheses may contain spaces; fields after it are fixed
+        return int(f.read().rsplit(')', 1)[1].split()[1])
+
+
+def _children_by_parent():
+    children = {}
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            children.setdefault(_parent_pid(entry), []).append(int(entry))
+        except (OSError, ValueError, IndexError):
+            # Exited while we were looking
+            continue
+    return children
+
+
+def child_pids(pid):
+    """Direct children of pid, or an empty set without /proc"""
+    if not proc_available():
+        return set()
+    return set(_children_by_parent().get(pid, []))
+
+
+def tree_pids(pid):
+    """pid and all of its descendants"""
+    children = _children_by_parent()
+    pids, stack = [], [pid]
+    while stack:
+        current = stack.pop()
+        pids.append(current)
+        stack.extend(children.get(current, []))
+    return pids
+
+
+def rss_bytes(pid):
+    """Resident memory of one process, or 0 when it is gone"""
+    try:
+        with open(f'/proc/{pid}/statm') as f:
+            return int(f.read().split()[1]) * PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        return 0
+
+
+def tree_rss_bytes(pid):
+    """Resident memory of pid and all of its descendants, or None without /proc"""
+    if pid is None or not proc_available():
+        return None
+    return sum(rss_bytes(current) for current in tree_pids(pid))
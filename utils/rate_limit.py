@@ -0,0 +1,219 @@
+"""
+Per-host token-bucket rate limits for outbound navigations and API calls
+
+Bursts of parallel scrapes against one upstream get us throttled, sent to a
+consent wall or shown a captcha, each of which costs a whole retry cycle. Every
+HTTP call therefore takes a token from its host's bucket first:
+
+    throttle(url, deadline)
+    requests.post(url, ...)
+
+Browser navigations take theirs before the job is handed to the browser pool,
+one token per page.goto() the job will make, so waiting for the limit never
+holds a pooled browser idle:
+
+    throttle_navigation(provider.base_url, deadline, tokens=2)
+    future = get_browser_pool().submit(...)
+
+Replayed sessions (SCRAPER_REPLAY_MODE=replay) never reach the host, so their
+navigations are not throttled.
+
+A bucket refills at `rate` tokens per second up to `burst` tokens, so a host
+sees at most `burst` requests at once and `rate` per second after that. Waiting
+for a token never runs past the request deadline; when the wait would, throttle()
+raises RateLimited and the caller falls back as it would on any other failure.
+
+The bucket state lives in one small file per host under RATE_LIMIT_DIR, locked
+with flock, so web workers, scraper worker processes and bulk runs on the same
+machine share the same limits. Without fcntl (Windows) the limits are per
+process.
+
+Limits are "rate/burst" per host and can be overridden from the environment:
+    RATE_LIMITS         e.g. "google.com=0.5/2,goibibo.com=0.3/1"
+    RATE_LIMIT_DEFAULT  limit of any other host (default 2/4); a rate of 0 means no limit
+    RATE_LIMIT_DIR      directory for the shared bucket files
+"""
+import os
+import time
+import tempfile
+import threading
+from dotenv import load_dotenv
+from utils.circuit_breaker import host_key
+from utils.upstreams import PLACES_API_HOST
+from utils import scrape_replay
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+# Load environment variables
+load_dotenv()
+
+DEFAULT_LIMITS = {
+    'google.com': '1/3',
+    'goibibo.com': '0.5/2',
+    'makemytrip.com': '0.5/2',
+    PLACES_API_HOST: '2/4',
+}
+
+RATE_LIMIT_DIR = os.getenv('RATE_LIMIT_DIR', os.path.join(tempfile.gettempdir(), 'travel-planner-rate-limits'))
+
+
+class RateLimited(RuntimeError):
+    """The host's rate limit would not hand out a token before the request deadline"""
+
+
+def parse_limit(text):
+    """'1.5/3' -> (1.5, 3): tokens per second and bucket size"""
+    rate, _, burst = str(text).partition('/')
+    rate = float(rate)
+    return rate, max(1, int(float(burst))) if burst else max(1, int(rate))
+
+
+def configured_limits():
+    """{host: (rate, burst)} from DEFAULT_LIMITS and RATE_LIMITS"""
+    limits = {host: parse_limit(limit) for host, limit in DEFAULT_LIMITS.items()}
+    for item in os.getenv('RATE_LIMITS', '').split(','):
+        host, _, limit = item.partition('=')
+        if host.strip() and limit.strip():
+            limits[host_key(host.strip())] = parse_limit(limit.strip())
+    return limits
+
+
+class TokenBucket:
+    """Token bucket for one host, shared through a state file when flock is available"""
+
+    def __init__(self, name, rate, burst, state_dir=None):
+        self.name = name
+        self.rate = rate
+        self.burst = burst
+        self._lock = threading.Lock()
+        self._path = None
+        if fcntl is not None:
+            state_dir = state_dir or RATE_LIMIT_DIR
+            try:
+                os.makedirs(state_dir, exist_ok=True)
+                self._path = os.path.join(state_dir, name.replace(os.sep, '_') + '.bucket')
+            except OSError as e:
+                print(f"[rate:{name}] Cannot use {state_dir} ({e}), limiting this process only")
+        # In-process state when there is no shared file
+        self._tokens = float(burst)
+        self._updated = time.time()
+
+        self.granted = 0
+        self.waits = 0
+        self.waited_seconds = 0.0
+        self.rejected = 0
+
+    def _refill_and_take(self, tokens, updated, now, count):
+        # Wall-clock time, so every process agrees; a clock step backwards refills nothing
+        tokens = min(self.burst, tokens + max(0.0, now - updated) * self.rate)
+        if tokens >= count:
+            return tokens - count, 0.0
+        return tokens, (count - tokens) / self.rate
+
+    def _take(self, count=1):
+        """Take count tokens if they are available and return 0, else the seconds until they will be"""
+        now = time.time()
+        with self._lock:
+            if self._path is None:
+                self._tokens, wait = self._refill_and_take(self._tokens, self._updated, now, count)
+                self._updated = now
+                return wait
+            with open(self._path, 'a+') as f:
+                fcntl.flock(f, fcntl.LOCK_EX)
+                try:
+                    f.seek(0)
+                    try:
+                        tokens, updated = (float(value) for value in f.read().split())
+                    except ValueError:
+                        # New or unreadable file: start with a full bucket
+                        tokens, updated = float(self.burst), now
+                    tokens, wait = self._refill_and_take(tokens, updated, now, count)
+                    f.seek(0)
+                    f.truncate()
+                    f.write(f"{tokens:.6f} {now:.6f}")
+                    f.flush()
+                finally:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+            return wait
+
+    def acquire(self, deadline=None, tokens=1):
+        """
+        Wait for `tokens` tokens (at most the burst size) and return the seconds spent waiting.
+
+        Raises:
+            RateLimited: when the next token would only come after the deadline
+        """
+        if self.rate <= 0:
+            return 0.0
+        count = min(max(1, tokens), self.burst)
+        waited = 0.0
+        while True:
+            wait = self._take(count)
+            if wait <= 0:
+                with self._lock:
+                    self.granted += 1
+                    if waited:
+                        self.waits += 1
+                        self.waited_seconds += waited
+                return waited
+            if deadline is not None and not deadline.has_time_for(wait):
+                with self._lock:
+                    self.rejected += 1
+                raise RateLimited(f"Rate limit for {self.name} has no token for another {wait:.1f}s")
+            # Other threads and processes may take the token first; check again after sleeping
+            time.sleep(wait)
+            waited += wait
+
+    def snapshot(self):
+        """Return the bucket's limit and this process's counters as a plain dictionary"""
+        with self._lock:
+            return {
+                'name': self.name,
+                'rate': self.rate,
+                'burst': self.burst,
+                'granted': self.granted,
+                'waits': self.waits,
+                'waited_seconds': round(self.waited_seconds, 2),
+                'rejected': self.rejected,
+            }
+
+
+_buckets = {}
+_buckets_lock = threading.Lock()
+
+
+def get_bucket(url_or_host):
+    """Return the shared token bucket for an upstream host"""
+    key = host_key(url_or_host)
+    with _buckets_lock:
+        bucket = _buckets.get(key)
+        if bucket is None:
+            rate, burst = configured_limits().get(key) or parse_limit(os.getenv('RATE_LIMIT_DEFAULT', '2/4'))
+            bucket = TokenBucket(key, rate, burst)
+            _buckets[key] = bucket
+        return bucket
+
+
+def throttle(url, deadline=None, tokens=1):
+    """Wait for the rate limit of url's host before an HTTP call"""
+    waited = get_bucket(url).acquire(deadline, tokens)
+    if waited >= 1:
+        print(f"[rate:{host_key(url)}] Waited {waited:.1f}s for the rate limit")
+    return waited
+
+
+def throttle_navigation(url, deadline=None, tokens=1):
+    """Wait for the rate limit of url's host before submitting a browser job that makes `tokens` navigations"""
+    if scrape_replay.get_mode() == 'replay':
+        return 0.0
+    return throttle(url, deadline, tokens)
+
+
+def all_buckets():
+    """Return snapshots of every bucket created so far"""
+    with _buckets_lock:
+        buckets = list(_buckets.values())
+    return [bucket.snapshot() for bucket in buckets]
@@ -0,0 +1,161 @@
+"""
+Extraction from the JSON/RPC responses a page fetches
+
+Google Flights, Maps and Travel render their results from XHR payloads. Reading
+those payloads with page.on('response') gives us the data as soon as the XHR
+lands, without waiting for the page to render it and without regex-scanning
+the DOM.
+
+    capture = ResponseCapture(page, r'/maps/preview/directions', parse_driving_routes)
+    page.goto(url, wait_until="commit")
+    routes = capture.wait_for(1, deadline.timeout_ms(12000))
+    capture.stop()
+
+The response handler only keeps the matching Response objects; their bodies are
+read and parsed in wait_for(), on the calling thread. Payloads are decoded from
+Google's ")]}'" prefixed JSON, including batchexecute "wrb.fr" envelopes whose
+data is a JSON string of its own.
+
+SCRAPER_EXTRACTION_MODE picks how the Google scrapers read results:
+- auto (default): network payloads first, the rendered page if none arrive
+- network: network payloads only
+- dom: the rendered page only (the old behaviour)
+"""
+import os
+import re
+import json
+import time
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+VALID_MODES = ('auto', 'network', 'dom')
+
+# Longest a scraper waits for its data XHR before it falls back to the page
+NETWORK_CAPTURE_TIMEOUT_MS = int(float(os.getenv('NETWORK_CAPTURE_TIMEOUT_SECONDS', 12)) * 1000)
+
+_XSSI_PREFIX = ")]}'"
+_INIT_DATA = re.compile(r'AF_initDataCallback\(\{.*?data:(\[.*?\]), sideChannel', re.DOTALL)
+
+
+def get_extraction_mode():
+    """Return the configured extraction mode"""
+    mode = os.getenv('SCRAPER_EXTRACTION_MODE', 'auto').strip().lower()
+    return mode if mode in VALID_MODES else 'auto'
+
+
+def decode_payloads(body):
+    """
+    Yield every JSON value in a Google response body.
+
+    Handles plain JSON, ")]}'" prefixed JSON, length-prefixed batchexecute
+    chunks and the AF_initDataCallback data inlined in HTML pages. For "wrb.fr"
+    envelopes the embedded JSON string is decoded as well.
+    """
+    text = body.strip()
+    if 'AF_initDataCallback' in text:
+        # HTML page: the initial results are inlined in AF_initDataCallback({... data: [...]}) calls
+        for match in _INIT_DATA.finditer(text):
+            try:
+                yield json.loads(match.group(1))
+            except ValueError:
+                continue
+        return
+    if text.startswith(_XSSI_PREFIX):
+        text = text[len(_XSSI_PREFIX):].strip()
+
+    try:
+        values = [json.loads(text)]
+    except ValueError:
+        # batchexecute: a length line followed by a JSON array, repeated
+        values = []
+        for line in text.splitlines():
+            line = line.strip()
+            if line.startswith('['):
+                try:
+                    values.append(json.loads(line))
+                except ValueError:
+                    continue
+
+    for value in values:
+        yield value
+        if isinstance(value, list):
+            for envelope in value:
+                if isinstance(envelope, list) and len(envelope) > 2 and envelope[0] == 'wrb.fr' \
+                        and isinstance(envelope[2], str):
+                    try:
+                        yield json.loads(envelope[2])
+                    except ValueError:
+                        continue
+
+
+def iter_lists(node, max_depth=40):
+    """Yield every list nested in a decoded payload, outermost first"""
+    stack = [(node, 0)]
+    while stack:
+        current, depth = stack.pop()
+        if not isinstance(current, list):
+            continue
+        yield current
+        if depth < max_depth:
+            stack.extend((child, depth + 1) for child in reversed(current) if isinstance(child, list))
+
+
+class ResponseCapture:
+    """Collects items parsed from the page responses whose URL matches a pattern"""
+
+    def __init__(self, page, url_pattern, parser):
+        self.page = page
+        self.url_pattern = re.compile(url_pattern)
+        self.parser = parser
+        self.items = []
+        self._pending = []
+        self._seen_urls = 0
+        page.on('response', self._on_response)
+
+    def _on_response(self, response):
+        # Only remember the response here, its body is read on the calling thread
+        if self.url_pattern.search(response.url):
+            self._pending.append(response)
+
+    def _drain(self):
+        while self._pending:
+            response = self._pending.pop(0)
+            self._seen_urls += 1
+            try:
+                if not response.ok:
+                    continue
+                body = response.text()
+            except Exception as e:
+                print(f"Could not read captured response: {str(e)[:100]}")
+                continue
+            for payload in decode_payloads(body):
+                try:
+                    self.items.extend(self.parser(payload))
+                except Exception as e:
+                    print(f"Could not parse captured response: {str(e)[:100]}")
+
+    def wait_for(self, min_items, timeout_ms):
+        """
+        Wait until at least min_items items were parsed or timeout_ms passed.
+
+        Returns:
+            list: Every item parsed so far (possibly fewer than min_items)
+        """
+        ends_at = time.monotonic() + timeout_ms / 1000.0
+        while True:
+            self._drain()
+            if len(self.items) >= min_items or time.monotonic() >= ends_at:
+                break
+            # Playwright dispatches the response events while we wait
+            self.page.wait_for_timeout(100)
+        print(f"Captured {len(self.items)} items from {self._seen_urls} matching responses")
+        return self.items
+
+    def stop(self):
+        """Stop listening for responses"""
+        try:
+            self.page.remove_listener('response', self._on_response)
+        except Exception:
+            pass
@@ -0,0 +1,190 @@
+"""
+Record-and-replay support for scraper browser sessions
+
+SCRAPER_REPLAY_MODE controls how scraper browser contexts are created:
+- off (default): talk to the live sites
+- record: save every site session as a HAR archive with embedded response bodies
+- replay: serve the recorded responses to Playwright through context.route and
+  abort anything that was not recorded, so runs are offline and deterministic
+
+Archives are written to SCRAPER_ARCHIVE_DIR (default: scrape_archives/), one file
+per session name, e.g. "car-hyderabad-goa.har".
+"""
+import os
+import re
+import json
+import base64
+import threading
+from urllib.parse import urlsplit
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+VALID_MODES = ('off', 'record', 'replay')
+
+# Headers that no longer match the body once Playwright hands it back to the page
+_DROPPED_HEADERS = {'content-encoding', 'content-length', 'transfer-encoding'}
+
+_archive_cache = {}
+_archive_lock = threading.Lock()
+
+
+def get_mode():
+    """Return the configured replay mode"""
+    mode = os.getenv('SCRAPER_REPLAY_MODE', 'off').strip().lower()
+    return mode if mode in VALID_MODES else 'off'
+
+
+def get_archive_dir():
+    """Return the directory that holds the session archives"""
+    return os.getenv('SCRAPER_ARCHIVE_DIR', os.path.join(os.getcwd(), 'scrape_archives'))
+
+
+def session_name(kind, *parts):
+    """Build a stable, filesystem-safe session name such as 'hotels-goa-2025-01-10-3'"""
+    raw = '-'.join([kind] + [str(part).split(',')[0].strip().lower() for part in parts])
+    return re.sub(r'[^a-z0-9\-]+', '_', raw)
+
+
+def archive_path(name):
+    """Return the HAR path for a session name"""
+    return os.path.join(get_archive_dir(), f"{name}.har")
+
+
+def new_context(browser, name, **context_options):
+    """
+    Create a browser context for a scraper session honouring the replay mode.
+
+    Args:
+        browser: Playwright browser to create the context on
+        name (str): Session name, see session_name()
+        **context_options: Regular browser.new_context() options
+
+    Returns:
+        BrowserContext: The context. Callers must close it so recordings get saved.
+    """
+    mode = get_mode()
+
+    if mode == 'record':
+        path = archive_path(name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        print(f"[replay] Recording session '{name}' to {path}")
+        return browser.new_context(record_har_path=path, record_har_content='embed', **context_options)
+
+    context = browser.new_context(**context_options)
+    if mode == 'replay':
+        install_replay_routes(context, name)
+    return context
+
+
+def install_replay_routes(context, name):
+    """Serve a recorded session to a context and abort every unrecorded request"""
+    entries = _load_entries(archive_path(name))
+    if entries is None:
+        print(f"[replay] No archive for session '{name}', all requests will be aborted")
+        entries = []
+    else:
+        print(f"[replay] Replaying session '{name}' ({len(entries)} recorded responses)")
+    # A fresh archive per context, so every replay of a session starts from its first responses
+    archive = ReplayArchive(entries)
+
+    def handle(route):
+        request = route.request
+        entry = archive.lookup(request.method, request.url)
+        if entry is None:
+            route.abort()
+            return
+        route.fulfill(status=entry['status'], headers=entry['headers'], body=entry['body'])
+
+    context.route('**/*', handle)
+    return archive
+
+
+class ReplayArchive:
+    """Recorded responses indexed by method and URL, with the positions served to one context"""
+
+    def __init__(self, entries):
+        self._exact = {}
+        self._by_path = {}
+        self._served = {}
+        self._lock = threading.Lock()
+        for entry in entries:
+            self._exact.setdefault((entry['method'], entry['url']), []).append(entry)
+            self._by_path.setdefault((entry['method'], _strip_query(entry['url'])), []).append(entry)
+
+    def __len__(self):
+        return sum(len(entries) for entries in self._exact.values())
+
+    def lookup(self, method, url):
+        """
+        Find the recorded response for a request.
+
+        Repeated requests for the same URL get the recorded responses in order, and
+        the last one once they run out. Requests whose query string changed (cache
+        busters, timestamps) fall back to a match on scheme, host and path.
+        """
+        for key, index in (((method, url), self._exact), ((method, _strip_query(url)), self._by_path)):
+            entries = index.get(key)
+            if entries:
+                with self._lock:
+                    position = self._served.get(key, 0)
+                    self._served[key] = position + 1
+                return entries[min(position, len(entries) - 1)]
+        return None
+
+
+def _strip_query(url):
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}{parts.path}"
+
+
+def _load_entries(path):
+    """Parse a HAR file into replayable response entries, caching them per path"""
+    with _archive_lock:
+        if path in _archive_cache:
+            return _archive_cache[path]
+
+        if not os.path.exists(path):
+            return None
+
+        try:
+            with open(path, encoding='utf-8') as f:
+                har = json.load(f)
+        except Exception as e:
+            print(f"[replay] Could not read archive {path}: {e}")
+            return None
+
+        entries = []
+        for item in har.get('log', {}).get('entries', []):
+            request = item.get('request', {})
+            response = item.get('response', {})
+            status = response.get('status', 0)
+            # Requests that never completed are recorded with status 0 or -1
+            if not status or status < 0:
+                continue
+
+            content = response.get('content', {})
+            text = content.get('text', '')
+            if content.get('encoding') == 'base64':
+                body = base64.b64decode(text)
+            else:
+                body = text.encode('utf-8')
+
+            headers = {}
+            for header in response.get('headers', []):
+                header_name = header.get('name', '')
+                if header_name.lower() in _DROPPED_HEADERS or header_name.startswith(':'):
+                    continue
+                headers[header_name] = header.get('value', '')
+
+            entries.append({
+                'method': request.get('method', 'GET'),
+                'url': request.get('url', ''),
+                'status': status,
+                'headers': headers,
+                'body': body,
+            })
+
+        _archive_cache[path] = entries
+        return entries
@@ -0,0 +1,341 @@
+"""
+Scraper worker processes: the browser pool, outside the web process
+
+With BROWSER_POOL_MODE=process, get_browser_pool() returns a ProcessBrowserPool
+instead of the in-process thread pool. It has the same interface:
+
+    future = get_browser_pool().submit(scrape_something, destination, deadline)
+    hotels = future.result()
+
+but every browser lives in its own worker process (BROWSER_POOL_SIZE of them,
+started on first use). Jobs wait in a local queue; a dispatcher thread per worker
+sends the next one down a pipe and waits for the answer. A job that doesn't
+answer in time is killed together with its worker process, which is replaced
+for the next job, so a hung page, a crashed renderer or a memory spike costs
+one job instead of the web process.
+
+A job's hard time limit is SCRAPER_JOB_TIMEOUT_SECONDS (120), or less when it
+is passed a Deadline: the time left on it plus SCRAPER_KILL_GRACE_SECONDS (5)
+for the job to notice on its own. The worker gets a pickled copy of the
+Deadline, so cancelling the original (first-N-wins hotel and flight searches
+cancel the losers) is passed on: the dispatcher signals the worker, which
+cancels its copy, and kills the worker if the job hasn't stopped within the
+grace period. Jobs and their arguments are pickled, so they
+must be module-level functions or methods of picklable objects. Circuit breaker
+outcomes recorded inside a job are sent back and applied to the web process's
+breakers.
+"""
+import os
+import time
+import queue
+import pickle
+import signal
+import threading
+import multiprocessing
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FuturesTimeoutError, wait
+from utils.deadline import Deadline
+from utils.browser_pool import BrowserGovernor, PoolSaturated, max_queue_for
+from utils.circuit_breaker import start_outcome_log, drain_outcome_log, apply_outcomes
+
+JOB_TIMEOUT_SECONDS = float(os.getenv('SCRAPER_JOB_TIMEOUT_SECONDS', 120))
+KILL_GRACE_SECONDS = float(os.getenv('SCRAPER_KILL_GRACE_SECONDS', 5))
+# How often a dispatcher checks its running job's deadlines for a cancellation
+CANCEL_POLL_SECONDS = 0.2
+
+
+class ScraperJobTimeout(FuturesTimeoutError):
+    """A scraper job ran past its hard time limit and its worker process was killed"""
+
+
+class ScraperWorkerDied(RuntimeError):
+    """A scraper worker process exited while running a job"""
+
+
+def job_deadlines(args, kwargs):
+    """The Deadlines passed to a job as arguments"""
+    return [value for value in list(args) + list(kwargs.values()) if isinstance(value, Deadline)]
+
+
+def job_timeout(args, kwargs):
+    """Hard time limit of a job: JOB_TIMEOUT_SECONDS, capped by the first Deadline among its arguments"""
+    for deadline in job_deadlines(args, kwargs):
+        return min(JOB_TIMEOUT_SECONDS, deadline.remaining() + KILL_GRACE_SECONDS)
+    return JOB_TIMEOUT_SECONDS
+
+
+def _watch_cancels(cancel_event, cancel_job, current):
+    """Worker thread: cancel the running job's Deadlines when the dispatcher asks for it"""
+    while True:
+        cancel_event.wait()
+        cancel_event.clear()
+        job_id, deadlines = current['job']
+        # A request for a job that has already finished is ignored
+        if cancel_job.value == job_id:
+            for deadline in deadlines:
+                deadline.cancel()
+
+
+def _worker_main(conn, name, cancel_event, cancel_job):
+    """Worker process: run jobs from the pipe on this process's browser until told to stop"""
+    if hasattr(os, 'setsid'):
+        # Own process group, so a kill also takes the Playwright driver and Chromium with it
+        os.setsid()
+    start_outcome_log()
+    governor = BrowserGovernor(name)
+    current = {'job': (None, [])}
+    threading.Thread(target=_watch_cancels, args=(cancel_event, cancel_job, current),
+                     name=f"{name}-cancels", daemon=True).start()
+    try:
+        while True:
+            job = conn.recv()
+            if job is None:
+                break
+            job_id, fn, args, kwargs = job
+            current['job'] = (job_id, job_deadlines(args, kwargs))
+            try:
+                reply = ('ok', fn(governor.browser_for_job(), *args, **kwargs))
+            except BaseException as e:
+                reply = ('error', e)
+            try:
+                governor.after_job()
+            except Exception as e:
+                print(f"Browser governor error: {str(e)[:200]}")
+            reply += (drain_outcome_log(), governor.snapshot())
+            try:
+                conn.send(reply)
+            except (pickle.PicklingError, TypeError, AttributeError) as e:
+                # The result or the exception doesn't pickle; report it as text
+                conn.send(('error', RuntimeError(f"{reply[1]!r} (unpicklable: {e})")) + reply[2:])
+    except (EOFError, KeyboardInterrupt):
+        pass
+    finally:
+        governor.close()
+
+
+class _WorkerSlot:
+    """One worker process and the pipe to it, replaced whenever it dies or is killed"""
+
+    def __init__(self, context, name):
+        self._context = context
+        self.name = name
+        self.process = None
+        self.conn = None
+        self.jobs_run = 0
+        self.restarts = 0
+        self.cancelled_jobs = 0
+        # Shared with the worker: set cancel_event to cancel the job numbered cancel_job
+        self.cancel_event = context.Event()
+        self.cancel_job = context.Value('q', -1, lock=False)
+        # Latest BrowserGovernor snapshot sent by the worker
+        self.browser_metrics = None
+        # Held while a job runs, so warm-up and the dispatcher don't share the pipe
+        self.lock = threading.Lock()
+
+    def _start(self):
+        parent_conn, child_conn = self._context.Pipe()
+        process = self._context.Process(target=_worker_main,
+                                        args=(child_conn, self.name, self.cancel_event, self.cancel_job),
+                                        name=self.name, daemon=True)
+        try:
+            process.start()
+        except BaseException:
+            parent_conn.close()
+            raise
+        finally:
+            child_conn.close()
+        self.process, self.conn = process, parent_conn
+        print(f"Started scraper worker {self.name} (pid {self.process.pid})")
+
+    def kill(self):
+        if self.process is not None:
+            if self.process.is_alive():
+                try:
+                    os.killpg(self.process.pid, signal.SIGKILL)
+                except (AttributeError, OSError):
+                    # No process groups here, or the worker hasn't made its own yet
+                    self.process.kill()
+            self.process.join(timeout=5)
+        if self.conn is not None:
+            self.conn.close()
+        self.process = self.conn = None
+
+    def run(self, fn, args, kwargs):
+        """Run one job on this worker and return its result; raises what the job raised"""
+        if self.process is None or not self.process.is_alive():
+            self.kill()
+            self._start()
+
+        timeout = max(0.001, job_timeout(args, kwargs))
+        deadlines = job_deadlines(args, kwargs)
+        job_id = self.jobs_run
+        self.conn.send((job_id, fn, args, kwargs))
+        self.jobs_run += 1
+        give_up_at = time.monotonic() + timeout
+        cancel_sent = False
+        try:
+            while True:
+                if self.conn.poll(max(0.0, min(CANCEL_POLL_SECONDS, give_up_at - time.monotonic()))):
+                    reply = self.conn.recv()
+                    break
+                if not cancel_sent and any(deadline.cancelled for deadline in deadlines):
+                    # The worker only has a copy of the Deadline; pass the cancellation on
+                    self.cancel_job.value = job_id
+                    self.cancel_event.set()
+                    self.cancelled_jobs += 1
+                    cancel_sent = True
+                    give_up_at = min(give_up_at, time.monotonic() + KILL_GRACE_SECONDS)
+                if time.monotonic() >= give_up_at:
+                    reply = None
+                    break
+        except (EOFError, OSError):
+            process = self.process
+            self.restarts += 1
+            self.kill()
+            exit_code = process.exitcode
+            raise ScraperWorkerDied(f"Scraper worker {self.name} exited while running a job (exit code {exit_code})")
+        if reply is None:
+            if cancel_sent:
+                print(f"Cancelled scraper job {getattr(fn, '__name__', fn)} on {self.name} didn't stop, "
+                      f"killing the worker")
+            else:
+                print(f"Scraper job {getattr(fn, '__name__', fn)} on {self.name} ran past {timeout:.0f}s, "
+                      f"killing the worker")
+            self.restarts += 1
+            self.kill()
+            raise ScraperJobTimeout("Cancelled scraper job killed" if cancel_sent
+                                    else f"Scraper job killed after {timeout:.0f}s")
+        status, value, outcomes, self.browser_metrics = reply
+
+        apply_outcomes(outcomes)
+        if status == 'error':
+            raise value
+        return value
+
+    def stop(self):
+        if self.process is not None and self.process.is_alive():
+            try:
+                self.conn.send(None)
+                self.process.join(timeout=10)
+            except (OSError, ValueError):
+                pass
+        self.kill()
+
+
+class ProcessBrowserPool:
+    """Fixed set of scraper worker processes, each owning one headless Chromium"""
+
+    def __init__(self, size=None):
+        self.size = size or int(os.getenv('BROWSER_POOL_SIZE', 3))
+        # spawn: a forked copy of a threaded web process could inherit held locks
+        self._context = multiprocessing.get_context('spawn')
+        self._tasks = queue.Queue()
+        self.max_queue = max_queue_for(self.size)
+        self.rejected = 0
+        self._slots = []
+        self._dispatchers = []
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def submit(self, fn, *args, **kwargs):
+        """
+        Run fn(browser, *args, **kwargs) in a worker process and return a Future.
+
+        Raises:
+            PoolSaturated: when max_queue jobs are already waiting for a worker
+        """
+        future = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Browser pool has been shut down")
+            if not self._slots:
+                self._start_dispatchers()
+            if self.max_queue and self._tasks.qsize() >= self.max_queue:
+                self.rejected += 1
+                raise PoolSaturated(f"{self._tasks.qsize()} scraper jobs are already waiting")
+            self._tasks.put((future, fn, args, kwargs))
+        return future
+
+    def queued(self):
+        """Jobs waiting for a worker process"""
+        return self._tasks.qsize()
+
+    def _start_dispatchers(self):
+        print(f"Starting {self.size} scraper worker processes")
+        for i in range(self.size):
+            slot = _WorkerSlot(self._context, f"scraper-worker-{i}")
+            dispatcher = threading.Thread(target=self._dispatch, args=(slot,), name=f"{slot.name}-dispatch",
+                                          daemon=True)
+            self._slots.append(slot)
+            self._dispatchers.append(dispatcher)
+            dispatcher.start()
+
+    def _dispatch(self, slot):
+        while True:
+            task = self._tasks.get()
+            if task is None:
+                break
+            future, fn, args, kwargs = task
+            # Skip jobs that were cancelled while they waited in the queue
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                with slot.lock:
+                    result = slot.run(fn, args, kwargs)
+            except BaseException as e:
+                future.set_exception(e)
+            else:
+                future.set_result(result)
+        slot.stop()
+
+    def warm(self, timeout=60):
+        """Start every worker process and launch its browser; returns the number that launched"""
+        with self._lock:
+            if not self._slots:
+                self._start_dispatchers()
+            slots = list(self._slots)
+
+        def warm_slot(slot):
+            with slot.lock:
+                return slot.run(_browser_connected, (), {})
+
+        executor = ThreadPoolExecutor(max_workers=len(slots), thread_name_prefix='scraper-warm')
+        try:
+            done, _ = wait([executor.submit(warm_slot, slot) for slot in slots], timeout=timeout)
+        finally:
+            executor.shutdown(wait=False)
+        ready = 0
+        for future in done:
+            try:
+                ready += bool(future.result())
+            except Exception as e:
+                print(f"Browser warm-up failed: {str(e)[:200]}")
+        return ready
+
+    def metrics(self):
+        """Per worker process: pid, jobs sent, restarts and the browser's latest governor snapshot"""
+        with self._lock:
+            slots = list(self._slots)
+        return [{'worker': slot.name,
+                 'pid': slot.process.pid if slot.process is not None else None,
+                 'alive': slot.process is not None and slot.process.is_alive(),
+                 'jobs_sent': slot.jobs_run,
+                 'restarts': slot.restarts,
+                 'cancelled_jobs': slot.cancelled_jobs,
+                 'browser': slot.browser_metrics} for slot in slots]
+
+    def shutdown(self, wait=True):
+        """Stop the dispatchers and their worker processes"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            dispatchers = list(self._dispatchers)
+        for _ in dispatchers:
+            self._tasks.put(None)
+        if wait:
+            for dispatcher in dispatchers:
+                dispatcher.join(timeout=15)
+
+
+def _browser_connected(browser):
+    return browser.is_connected()
@@ -0,0 +1,173 @@
+"""
+Precompiled parsers for the prices, times, durations and distances in scraped text
+
+Every scraper reads the same kinds of strings ("₹4,523", "6:05 AM – 8:20 AM",
+"2h 15m", "15 hr 5 min", "1,339 km"). The patterns are compiled once here and
+each parser makes a single pass over its input and returns plain numbers, so
+callers do their own formatting:
+
+    parse_price("₹4,523")                 -> 4523
+    parse_time_range("6:05 AM – 8:20 AM") -> ('6:05 AM', '8:20 AM')
+    parse_clock("6:05 PM")                -> 1085 (minutes after midnight)
+    parse_duration("15 hr 5 min")         -> 905 (minutes)
+    parse_distances_km("1,339 km or 1,402 km") -> [1339.0, 1402.0]
+
+benchmarks/bench_text_parse.py times these over a corpus of captured strings.
+"""
+import re
+
+PRICE_PATTERN = re.compile(r'(?:₹|Rs\.?)\s?([0-9][0-9,]*)')
+AMOUNT_PATTERN = re.compile(r'([0-9][0-9,]*(?:\.[0-9]+)?)')
+TIME_PATTERN = re.compile(r'\d{1,2}:\d{2}(?:\s*[AP]M)?', re.IGNORECASE)
+CLOCK_PATTERN = re.compile(r'\s*(\d{1,2}):(\d{2})\s*([AP]M)?', re.IGNORECASE)
+TIME_RANGE_PATTERNS = [
+    re.compile(r'(\d{1,2}:\d{2}\s*(?:AM|PM))\s*[-–—~]\s*(\d{1,2}:\d{2}\s*(?:AM|PM))'),  # 9:30 AM – 12:30 PM
+    re.compile(r'(\d{1,2}:\d{2})\s*[-–—~]\s*(\d{1,2}:\d{2})'),                          # 9:30 – 12:30
+    re.compile(r'Depart: (\d{1,2}:\d{2}(?:\s*[AP]M)?).+?Arrive: (\d{1,2}:\d{2}(?:\s*[AP]M)?)', re.DOTALL)
+]
+DEPARTURE_LABEL_PATTERN = re.compile(r'(?:Depart|Dep)[\.:]?\s*(\d{1,2}:\d{2}(?:\s*[AP]M)?)', re.IGNORECASE)
+ARRIVAL_LABEL_PATTERN = re.compile(r'(?:Arrive|Arr)[\.:]?\s*(\d{1,2}:\d{2}(?:\s*[AP]M)?)', re.IGNORECASE)
+DURATION_PATTERNS = [
+    re.compile(r'(\d+h\s*\d*m)', re.IGNORECASE),
+    re.compile(r'(\d+\s*hr\s*\d*\s*min)', re.IGNORECASE),
+    re.compile(r'Duration[:.]\s*(\d+\s*h(?:r|our)?s?\s*(?:\d+\s*m(?:in)?)?)', re.IGNORECASE)
+]
+# Durations anywhere in a page ("2h 15m", "15 hr 5 min")
+DURATION_TEXT_PATTERN = re.compile(r'\d+h\s*\d+m|\d+\s*hr\s*\d+\s*min', re.IGNORECASE)
+# "1 day 3 hr", "2h 15m", "15 hr 5 min", "45 min": up to three "<number> <unit>" parts in one match
+DURATION_PARTS_PATTERN = re.compile(
+    r'(\d+) ?([dhm])[a-z]*(?![a-z])(?:\s*(\d+) ?([hm])[a-z]*(?![a-z]))?(?:\s*(\d+) ?(m)[a-z]*(?![a-z]))?', re.IGNORECASE)
+DISTANCE_PATTERN = re.compile(r'(\d[\d,]*(?:\.\d+)?)\s*(km|kilometers|kilometres|mi|miles)\b', re.IGNORECASE)
+VIA_PATTERN = re.compile(r'via\s+([^\.]+)')
+RATING_PATTERN = re.compile(r'(\d+\.\d|\d+)')
+
+KM_PER_MILE = 1.60934
+_MINUTES_PER_UNIT = {'d': 24 * 60, 'h': 60, 'm': 1}
+
+
+def _to_number(digits):
+    """int for '4,523', float for '12.5'; None for an empty string"""
+    digits = digits.replace(',', '')
+    if not digits:
+        return None
+    return float(digits) if '.' in digits else int(digits)
+
+
+def parse_price(text):
+    """First rupee amount ("₹4,523", "Rs. 4523") in text as an int, or None"""
+    match = PRICE_PATTERN.search(text or '')
+    return _to_number(match.group(1)) if match else None
+
+
+def parse_prices(text):
+    """Every rupee amount in text, as ints, in order"""
+    return [_to_number(digits) for digits in PRICE_PATTERN.findall(text or '')]
+
+
+def parse_amount(text):
+    """First number in a price field whether or not it has a currency sign ("₹ 1,640/night" -> 1640)"""
+    match = AMOUNT_PATTERN.search(text or '')
+    return _to_number(match.group(1)) if match else None
+
+
+def parse_clock(text):
+    """Minutes after midnight for '6:05 AM' or '18:05', or None"""
+    match = CLOCK_PATTERN.match(text or '')
+    if not match:
+        return None
+    hours, minutes = int(match.group(1)), int(match.group(2))
+    suffix = (match.group(3) or '').upper()
+    if suffix == 'PM' and hours != 12:
+        hours += 12
+    elif suffix == 'AM' and hours == 12:
+        hours = 0
+    return hours * 60 + minutes
+
+
+def format_clock(minutes):
+    """'6:05 AM' for minutes after midnight (wraps past midnight)"""
+    hours, minutes = divmod(int(minutes) % (24 * 60), 60)
+    suffix = "PM" if hours >= 12 else "AM"
+    return f"{hours % 12 or 12}:{minutes:02d} {suffix}"
+
+
+def parse_time_range(text):
+    """(departure, arrival) time strings from a card's text, or None"""
+    text = text or ''
+    for pattern in TIME_RANGE_PATTERNS:
+        match = pattern.search(text)
+        if match:
+            return match.group(1).strip(), match.group(2).strip()
+    dep_match = DEPARTURE_LABEL_PATTERN.search(text)
+    arr_match = ARRIVAL_LABEL_PATTERN.search(text)
+    if dep_match and arr_match:
+        return dep_match.group(1).strip(), arr_match.group(1).strip()
+    times = TIME_PATTERN.findall(text)
+    if len(times) >= 2:
+        return times[0].strip(), times[1].strip()
+    return None
+
+
+def find_duration_text(text):
+    """The duration as written in a card ('2h 15m', '15 hr 5 min'), or None"""
+    for pattern in DURATION_PATTERNS:
+        match = pattern.search(text or '')
+        if match:
+            return match.group(1)
+    return None
+
+
+def parse_duration(text):
+    """Minutes in '2h 15m', '15 hr 5 min', '45 min' or '1 day 3 hr', or None"""
+    match = DURATION_PARTS_PATTERN.search(text or '')
+    if not match:
+        return None
+    groups = match.groups()
+    total = 0
+    for i in range(0, 6, 2):
+        if groups[i]:
+            total += int(groups[i]) * _MINUTES_PER_UNIT[groups[i + 1].lower()]
+    return total
+
+
+def format_duration(minutes):
+    """'15 hr 5 min' or '45 min' for a number of minutes"""
+    hours, minutes = divmod(int(minutes), 60)
+    return f"{hours} hr {minutes} min" if hours else f"{minutes} min"
+
+
+def parse_distance_km(text):
+    """First distance in text in kilometres ('1,339 km' -> 1339.0, '10 mi' -> 16.1), or None"""
+    match = DISTANCE_PATTERN.search(text or '')
+    if not match:
+        return None
+    return _distance_km(match)
+
+
+def parse_distances_km(text, minimum=0):
+    """Every distance in text in kilometres, in order, skipping those not above minimum"""
+    distances = []
+    for match in DISTANCE_PATTERN.finditer(text or ''):
+        km = _distance_km(match)
+        if km > minimum:
+            distances.append(km)
+    return distances
+
+
+def _distance_km(match):
+    value = float(match.group(1).replace(',', ''))
+    if match.group(2).lower().startswith('mi'):
+        value = round(value * KM_PER_MILE, 1)
+    return value
+
+
+def parse_via(text):
+    """'Via NH44 and NH30' from route text containing 'via NH44 and NH30.', or None"""
+    match = VIA_PATTERN.search(text or '')
+    return f"Via {match.group(1).strip()}" if match else None
+
+
+def parse_rating(text):
+    """First rating-like number ('4.5', '4') in text as a string, or None"""
+    match = RATING_PATTERN.search(text or '')
+    return match.group(1) if match else None
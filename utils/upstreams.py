@@ -0,0 +1,22 @@
+"""
+Upstream endpoints used by the scrapers and API clients
+
+Every base URL can be overridden from the environment so the whole plan pipeline
+can be pointed at local stand-in servers (see benchmarks/stub_upstreams.py).
+The Groq client picks up GROQ_BASE_URL on its own.
+"""
+import os
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+GOOGLE_BASE_URL = os.getenv('GOOGLE_BASE_URL', 'https://www.google.com').rstrip('/')
+GOIBIBO_BASE_URL = os.getenv('GOIBIBO_BASE_URL', 'https://www.goibibo.com').rstrip('/')
+MAKEMYTRIP_BASE_URL = os.getenv('MAKEMYTRIP_BASE_URL', 'https://www.makemytrip.com').rstrip('/')
+EASEMYTRIP_BASE_URL = os.getenv('EASEMYTRIP_BASE_URL', 'https://flight.easemytrip.com').rstrip('/')
+IXIGO_BASE_URL = os.getenv('IXIGO_BASE_URL', 'https://www.ixigo.com').rstrip('/')
+
+# RapidAPI proxy for the Google Places "searchText" endpoint
+PLACES_API_HOST = 'google-map-places-new-v2.p.rapidapi.com'
+PLACES_API_URL = os.getenv('PLACES_API_URL', f'https://{PLACES_API_HOST}/v1/places:searchText')